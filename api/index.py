@@ -1,20 +1,208 @@
-from flask import Flask, jsonify
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from pathlib import Path
+
+from flask import Flask, jsonify, request
+
+# Extraction workers and how many uploads may wait for one before we answer 429
+MAX_WORKERS = int(os.environ.get("EXTRACT_WORKERS", os.cpu_count() or 1))
+MAX_QUEUE = int(os.environ.get("EXTRACT_MAX_QUEUE", MAX_WORKERS * 4))
+# Seconds a request waits for its extraction before answering 504
+REQUEST_TIMEOUT = float(os.environ.get("EXTRACT_TIMEOUT", "120"))
+MAX_UPLOAD_BYTES = int(os.environ.get("EXTRACT_MAX_UPLOAD_MB", "50")) * 1024 * 1024
+# Error of uploads with a PDF header that PyMuPDF cannot open (answered with 422)
+UNREADABLE_PDF = "could not open PDF"
+
+# One warm tesseract engine per extraction thread (when tesserocr is installed)
+os.environ.setdefault("OCR_ENGINE_POOL_SIZE", str(MAX_WORKERS))
+
+# The extraction modules live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from field_extractor import extract_insurance_fields, select_fields  # noqa: E402
+from instrumentation import service_profile  # noqa: E402
+from job_store import JOB_DONE, JOB_FAILED, JOB_RUNNING, open_job_store  # noqa: E402
+import ocr_pdf_extract  # noqa: E402
+from ocr_pdf_extract import ocr_pdf  # noqa: E402
 
 app = Flask(__name__)
+app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES
+
+# "memory" (default) or the path of a SQLite database shared by all server processes.
+# The in-memory store forgets finished jobs after JOB_TTL seconds, or once
+# more than JOB_MAX_FINISHED of them are kept.
+jobs = open_job_store(
+    os.environ.get("JOB_STORE", "memory"),
+    max_finished=int(os.environ.get("JOB_MAX_FINISHED", "1000")),
+    ttl=float(os.environ.get("JOB_TTL", "3600")),
+)
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="extract")
+# Uploads running or waiting for a worker; released when the extraction finishes
+_slots = threading.BoundedSemaphore(MAX_WORKERS + MAX_QUEUE)
+
+
+def _save_upload() -> Path:
+    """
+    Stream the uploaded PDF (multipart field "file" or a raw application/pdf
+    body) into a temporary file and return its path.
+    """
+    upload = request.files.get("file")
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_file:
+        if upload is not None:
+            upload.save(tmp_file)
+        else:
+            while True:
+                chunk = request.stream.read(1024 * 1024)
+                if not chunk:
+                    break
+                tmp_file.write(chunk)
+    return Path(tmp_file.name)
+
+
+def _requested_fields():
+    """
+    The schema keys asked for with the "fields" query parameter (or form
+    field), comma-separated, as (fields, None); fields is None when all
+    keys are wanted. Unknown keys give (None, error response).
+    """
+    value = request.args.get("fields")
+    if value is None and request.mimetype == "multipart/form-data":
+        value = request.form.get("fields")
+    if not value:
+        return None, None
+    try:
+        return sorted(select_fields(value.split(","))), None
+    except ValueError as e:
+        return None, (jsonify({"error": str(e)}), 400)
+
+
+def _extract_upload(pdf_path: Path, fields=None) -> dict:
+    try:
+        profile = service_profile()
+        return extract_insurance_fields(ocr_pdf(pdf_path, workers=1, profile=profile), profile=profile,
+                                        fields=fields)
+    finally:
+        pdf_path.unlink(missing_ok=True)
+        _slots.release()
+
+
+def _run_job(job_id: str, pdf_path: Path, fields=None) -> None:
+    def report_progress(pages_done: int, pages_total: int) -> None:
+        jobs.update(job_id, pages_done=pages_done, pages_total=pages_total)
+
+    try:
+        jobs.update(job_id, status=JOB_RUNNING)
+        profile = service_profile()
+        text = ocr_pdf(pdf_path, workers=1, progress=report_progress, profile=profile)
+        jobs.update(job_id, status=JOB_DONE,
+                    result=extract_insurance_fields(text, profile=profile, fields=fields))
+    except ocr_pdf_extract.fitz.FileDataError:
+        # Its message names the server's temp file
+        jobs.update(job_id, status=JOB_FAILED, error=UNREADABLE_PDF)
+    except Exception as e:
+        jobs.update(job_id, status=JOB_FAILED, error=str(e) or type(e).__name__)
+    finally:
+        pdf_path.unlink(missing_ok=True)
+        _slots.release()
+
+
+def _accept_upload():
+    """
+    Validate the request, take a queue slot and save the PDF. Returns
+    (pdf_path, fields, None), or (None, None, error response) with no
+    slot held.
+    """
+    # Resolved (and PyMuPDF imported) on the first upload, not at cold start
+    if not ocr_pdf_extract.PYMUPDF_AVAILABLE:
+        return None, None, (jsonify({
+            "error": "OCR not supported on Vercel serverless",
+            "solution": "Run OCR locally or on VM backend"
+        }), 501)
+
+    if "file" not in request.files and request.mimetype != "application/pdf":
+        return None, None, (jsonify({"error": "Upload a PDF as the 'file' form field or an application/pdf body"}), 400)
+
+    fields, error_response = _requested_fields()
+    if error_response is not None:
+        return None, None, error_response
+
+    if not _slots.acquire(blocking=False):
+        response = jsonify({"error": "Too many extractions in progress, retry later"})
+        response.headers["Retry-After"] = "5"
+        return None, None, (response, 429)
+
+    try:
+        pdf_path = _save_upload()
+        with pdf_path.open("rb") as pdf_file:
+            is_pdf = pdf_file.read(5) == b"%PDF-"
+    except BaseException:
+        _slots.release()
+        raise
+    if not is_pdf:
+        pdf_path.unlink(missing_ok=True)
+        _slots.release()
+        return None, None, (jsonify({"error": "Uploaded file is not a PDF"}), 415)
+    return pdf_path, fields, None
+
 
 @app.route("/api", methods=["GET"])
 def home():
     return jsonify({
         "status": "ok",
-        "message": "UI is running. OCR is disabled on Vercel."
+        "message": "Extraction service is running. POST a PDF to /api/extract, "
+                   "or to /api/jobs and poll /api/jobs/<id>.",
+        "workers": MAX_WORKERS,
+        "max_queue": MAX_QUEUE,
+        "timeout_seconds": REQUEST_TIMEOUT,
     })
 
 @app.route("/api/extract", methods=["POST"])
 def extract():
-    return jsonify({
-        "error": "OCR not supported on Vercel serverless",
-        "solution": "Run OCR locally or on VM backend"
-    }), 501
+    pdf_path, fields, error_response = _accept_upload()
+    if error_response is not None:
+        return error_response
+    try:
+        future = _executor.submit(_extract_upload, pdf_path, fields)
+    except BaseException:
+        _slots.release()
+        raise
+
+    # On timeout the extraction keeps its slot until it finishes, so a
+    # backlog of slow documents still turns new uploads away with 429.
+    try:
+        fields = future.result(timeout=REQUEST_TIMEOUT)
+    except FutureTimeoutError:
+        return jsonify({"error": f"Extraction timed out after {REQUEST_TIMEOUT:g} seconds"}), 504
+    except ocr_pdf_extract.fitz.FileDataError:
+        # Corrupt despite the %PDF- header; its message names the server's temp file
+        return jsonify({"error": UNREADABLE_PDF}), 422
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 500
+    return jsonify(fields)
+
+@app.route("/api/jobs", methods=["POST"])
+def create_job():
+    pdf_path, fields, error_response = _accept_upload()
+    if error_response is not None:
+        return error_response
+    try:
+        job_id = jobs.create()
+        _executor.submit(_run_job, job_id, pdf_path, fields)
+    except BaseException:
+        pdf_path.unlink(missing_ok=True)
+        _slots.release()
+        raise
+    return jsonify({"job_id": job_id, "status_url": f"/api/jobs/{job_id}"}), 202
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown job: {job_id}"}), 404
+    return jsonify(job)
 
 def handler(request, context):
     return app(request.environ, lambda status, headers: None)
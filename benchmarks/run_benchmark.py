@@ -0,0 +1,236 @@
+"""
+Benchmark OCR and field extraction on the synthetic policy corpus.
+
+Builds the corpus (see synthetic_corpus.py) if the directory has no
+ground truth yet, runs every document through ocr_pdf_extract and
+extract_insurance_fields, and writes a JSON report with:
+
+- pages/sec and documents/sec over the whole run
+- per-document latency percentiles, overall and for text vs scanned PDFs
+- peak RSS of this process and of OCR worker processes
+- extraction accuracy against the ground truth, overall and per field
+
+Compare two runs with --baseline, e.g. before and after a change:
+
+    python benchmarks/run_benchmark.py corpus/ --results before.json
+    python benchmarks/run_benchmark.py corpus/ --results after.json --baseline before.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# The extraction modules live at the repository root
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from field_extractor import extract_insurance_fields  # noqa: E402
+from ocr_pdf_extract import OCRCache, format_page, iter_pdf_pages  # noqa: E402
+from synthetic_corpus import GROUND_TRUTH_FILE, build_corpus  # noqa: E402
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is reported as null there
+    resource = None
+
+# Metrics shown by --baseline, and whether higher is better
+_COMPARED_METRICS = {
+    "pages_per_second": True,
+    "latency_p50": False,
+    "latency_p95": False,
+    "peak_rss_mb": False,
+    "accuracy": True,
+}
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Linear-interpolated percentile of values (fraction in 0-1), None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def latency_summary(latencies: List[float]) -> dict:
+    return {
+        "count": len(latencies),
+        "mean": sum(latencies) / len(latencies) if latencies else None,
+        "p50": percentile(latencies, 0.50),
+        "p90": percentile(latencies, 0.90),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "max": max(latencies) if latencies else None,
+    }
+
+
+def peak_rss_mb() -> Dict[str, Optional[float]]:
+    """
+    Peak resident set size of this process and of its (finished) child
+    processes, in MB.
+    """
+    if resource is None:
+        return {"self": None, "children": None}
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(corpus_dir: Path, workers: int = 1, dpi: int = 200,
+                  cache: Optional[OCRCache] = None, low_dpi: Optional[int] = None) -> dict:
+    """
+    Extract every document of the corpus and return the report dict.
+    """
+    truth = json.loads((corpus_dir / GROUND_TRUTH_FILE).read_text(encoding="utf-8"))
+    documents = []
+    field_hits: Dict[str, int] = {}
+    total_pages = 0
+    started = time.perf_counter()
+
+    for name, expected in truth["documents"].items():
+        doc_started = time.perf_counter()
+        record = {"name": name, "scanned": expected["scanned"], "layout": expected["layout"]}
+        try:
+            pages = list(iter_pdf_pages(corpus_dir / name, dpi=dpi, workers=workers,
+                                        cache=cache, low_dpi=low_dpi))
+            fields = extract_insurance_fields("".join(format_page(page) for page in pages))
+        except Exception as e:
+            record["error"] = str(e) or type(e).__name__
+            pages, fields = [], {}
+        record["seconds"] = time.perf_counter() - doc_started
+        record["pages"] = expected["pages"]
+        total_pages += expected["pages"]
+
+        misses = {}
+        for field, value in expected["fields"].items():
+            if fields.get(field, "") == value:
+                field_hits[field] = field_hits.get(field, 0) + 1
+            else:
+                field_hits.setdefault(field, 0)
+                misses[field] = {"expected": value, "got": fields.get(field, "")}
+        record["correct"] = len(expected["fields"]) - len(misses)
+        record["misses"] = misses
+        documents.append(record)
+
+    elapsed = time.perf_counter() - started
+    field_count = sum(len(expected["fields"]) for expected in truth["documents"].values())
+    latencies = [record["seconds"] for record in documents]
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"corpus": str(corpus_dir), "seed": truth["seed"], "workers": workers,
+                     "dpi": dpi, "cache": cache is not None, "adaptive_low_dpi": low_dpi},
+        "documents_total": len(documents),
+        "pages_total": total_pages,
+        "errors": sum("error" in record for record in documents),
+        "seconds": elapsed,
+        "pages_per_second": total_pages / elapsed if elapsed else None,
+        "documents_per_second": len(documents) / elapsed if elapsed else None,
+        "latency": {
+            "all": latency_summary(latencies),
+            "text": latency_summary([r["seconds"] for r in documents if not r["scanned"]]),
+            "scanned": latency_summary([r["seconds"] for r in documents if r["scanned"]]),
+        },
+        "peak_rss_mb": peak_rss_mb(),
+        "accuracy": {
+            "fields": sum(record["correct"] for record in documents) / field_count if field_count else None,
+            "per_field": {
+                field: hits / len(documents) for field, hits in sorted(field_hits.items())
+            },
+        },
+        "documents": documents,
+    }
+
+
+def headline_metrics(report: dict) -> Dict[str, Optional[float]]:
+    return {
+        "pages_per_second": report["pages_per_second"],
+        "latency_p50": report["latency"]["all"]["p50"],
+        "latency_p95": report["latency"]["all"]["p95"],
+        "peak_rss_mb": report["peak_rss_mb"]["self"],
+        "accuracy": report["accuracy"]["fields"],
+    }
+
+
+def format_comparison(report: dict, baseline: dict) -> str:
+    lines = [f"{'metric':<18} {'baseline':>12} {'current':>12} {'change':>9}"]
+    current, previous = headline_metrics(report), headline_metrics(baseline)
+    for metric, higher_is_better in _COMPARED_METRICS.items():
+        new, old = current[metric], previous[metric]
+        if new is None or old is None:
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        better = (change > 0) == higher_is_better
+        verdict = "" if abs(change) < 1 else (" better" if better else " worse")
+        lines.append(f"{metric:<18} {old:>12.4f} {new:>12.4f} {change:>+8.1f}%{verdict}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark extraction on the synthetic policy corpus.")
+    parser.add_argument("corpus_dir", type=str, help="Corpus directory; built there if it has no ground truth.")
+    parser.add_argument("--results", type=str, default="benchmark_results.json",
+                        help="JSON file to write the report to. Default: benchmark_results.json.")
+    parser.add_argument("--baseline", type=str, default="",
+                        help="Earlier report to compare the headline metrics against.")
+    parser.add_argument("--count", type=int, default=50, help="Documents when building the corpus. Default: 50.")
+    parser.add_argument("--seed", type=int, default=1, help="Seed when building the corpus. Default: 1.")
+    parser.add_argument("--scanned-ratio", type=float, default=0.3,
+                        help="Share of scanned documents when building the corpus. Default: 0.3.")
+    parser.add_argument("--workers", type=int, default=1, help="OCR processes per document. Default: 1.")
+    parser.add_argument("--dpi", type=int, default=200, help="OCR rendering DPI. Default: 200.")
+    parser.add_argument("--adaptive-dpi", type=int, default=0, metavar="LOW_DPI",
+                        help="Use adaptive DPI starting at LOW_DPI. Default: off.")
+    parser.add_argument("--cache-dir", type=str, default="",
+                        help="Use an OCR cache in this directory. Default: no cache, so runs are comparable.")
+    args = parser.parse_args(argv)
+
+    corpus_dir = Path(args.corpus_dir)
+    if not (corpus_dir / GROUND_TRUTH_FILE).is_file():
+        print(f"Building corpus of {args.count} documents in {corpus_dir}", file=sys.stderr)
+        build_corpus(corpus_dir, args.count, args.seed, args.scanned_ratio)
+
+    cache = OCRCache(Path(args.cache_dir)) if args.cache_dir else None
+    report = run_benchmark(corpus_dir, workers=args.workers, dpi=args.dpi, cache=cache,
+                           low_dpi=args.adaptive_dpi or None)
+    Path(args.results).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    latency = report["latency"]["all"]
+    print(
+        f"{report['documents_total']} documents, {report['pages_total']} pages in {report['seconds']:.2f}s: "
+        f"{report['pages_per_second']:.2f} pages/s, p50 {latency['p50']:.3f}s, p95 {latency['p95']:.3f}s, "
+        f"accuracy {report['accuracy']['fields']:.1%}, {report['errors']} errors"
+    )
+    print(f"Report written to: {args.results}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        print(format_comparison(report, baseline))
+
+
+if __name__ == "__main__":
+    main()
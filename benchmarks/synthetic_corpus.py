@@ -0,0 +1,247 @@
+"""
+Synthetic motor-policy PDFs with known field values, for benchmarking.
+
+Every document fills all schema keys with random but realistic values,
+picks a label for each field from field_extractor.FIELD_KEYWORDS and
+lays them out in one of several styles ("Label: value" lines, dash or
+equals separators, or a two-column table). A share of the documents is
+rasterized, leaving no text layer, so they go through OCR.
+
+The corpus directory holds the PDFs and ground_truth.json, which maps
+each file name to its layout, whether it was rasterized, and the values
+extract_insurance_fields should return (dates as YYYY-MM-DD, amounts as
+plain digits). The same seed always produces the same corpus.
+
+Usage:
+    python benchmarks/synthetic_corpus.py OUT_DIR [--count 50] [--seed 1] [--scanned-ratio 0.3]
+"""
+
+import argparse
+import json
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# The extraction modules live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from field_extractor import FIELD_KEYWORDS  # noqa: E402
+from ocr_pdf_extract import PYMUPDF_AVAILABLE  # noqa: E402
+
+if PYMUPDF_AVAILABLE:
+    import fitz
+
+GROUND_TRUTH_FILE = "ground_truth.json"
+LAYOUTS = ("colon", "dash", "equals", "two_column")
+# Resolution the rasterized documents are scanned at
+SCAN_DPI = 150
+
+_COMPANIES = [
+    "ACME GENERAL INSURANCE CO LTD", "BHARAT MOTOR INSURANCE LTD",
+    "NATIONAL SHIELD GENERAL INSURANCE", "SURAKSHA ALLIANZ GENERAL INSURANCE",
+]
+_FIRST_NAMES = ["RAHUL", "PRIYA", "AMIT", "SNEHA", "VIKRAM", "ANJALI", "ARJUN", "MEERA"]
+_LAST_NAMES = ["SHARMA", "PATEL", "IYER", "REDDY", "SINGH", "KULKARNI", "NAIR", "GUPTA"]
+_VEHICLES = [
+    ("MARUTI SUZUKI", "SWIFT", "VXI"), ("HYUNDAI", "CRETA", "SX"),
+    ("TATA", "NEXON", "XZ PLUS"), ("MAHINDRA", "BOLERO PICKUP", "FB"),
+    ("HONDA", "CITY", "ZX"), ("ASHOK LEYLAND", "DOST", "LS"),
+]
+_CITIES = [
+    ("PUNE", "MAHARASHTRA", "411"), ("BENGALURU", "KARNATAKA", "560"),
+    ("CHENNAI", "TAMIL NADU", "600"), ("JAIPUR", "RAJASTHAN", "302"),
+]
+_STATE_CODES = {"MAHARASHTRA": "MH", "KARNATAKA": "KA", "TAMIL NADU": "TN", "RAJASTHAN": "RJ"}
+_FUELS = ["Petrol", "Diesel", "CNG", "Electric"]
+_SUB_TYPES = ["PRIVATE CAR", "GOODS CARRYING", "TAXI"]
+_CV_TYPES = ["LIGHT GOODS VEHICLE", "PASSENGER CARRYING", "NOT APPLICABLE"]
+_COVERS = ["COMPREHENSIVE", "THIRD PARTY ONLY", "STANDALONE OWN DAMAGE"]
+_RELATIONSHIPS = ["SPOUSE", "FATHER", "MOTHER", "SON", "DAUGHTER"]
+_FINANCIERS = ["HDFC BANK LTD", "ICICI BANK LTD", "NONE"]
+_BROKERS = ["SECUREPOLICY BROKERS PVT LTD", "DIRECT"]
+# strftime formats the dates are printed in; the expected value is always ISO
+_DATE_FORMATS = ["%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d", "%d %B %Y"]
+
+# Fields printed in the document, in order (PINCODE and YEAR_OF_MANUFACTURE
+# use labels the extractor looks for with its own patterns)
+_EXTRA_LABELS = {
+    "PINCODE": ["Pincode", "Pin Code", "PIN"],
+    "YEAR_OF_MANUFACTURE": ["Year", "Manufacturing Year", "YOM"],
+}
+_DATE_FIELDS = ("REGISTRATION_DATE", "POLICY_ISSUE_DATE", "RISK_START_DATE",
+                "RISK_END_DATE", "OD_EXPIRE_DATE")
+_AMOUNT_FIELDS = ("IDV_SUM_INSURED", "NET_PREMIUM", "OD_PREMIUM", "TP_ONLY_PREMIUM",
+                  "TOTAL_PREMIUM", "GST", "CGST", "SGST", "IGST")
+
+
+def _amount(value: int) -> str:
+    return f"Rs. {value:,}"
+
+
+def random_policy(rng: random.Random) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Return (expected, printed): the field values extract_insurance_fields
+    should return, and how each one is written in the document.
+    """
+    make, model, variant = rng.choice(_VEHICLES)
+    city, state, pin_prefix = rng.choice(_CITIES)
+    first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+    year = rng.randint(2012, 2023)
+    registered = date(year, rng.randint(1, 12), rng.randint(1, 28))
+    issued = date(2024, rng.randint(1, 12), rng.randint(1, 28))
+    starts = issued + timedelta(days=1)
+    ends = starts + timedelta(days=364)
+
+    od_premium = rng.randint(2000, 30000)
+    tp_premium = rng.randint(2000, 9000)
+    net_premium = od_premium + tp_premium
+    gst = round(net_premium * 0.18)
+    intra_state = rng.random() < 0.5
+    cgst = sgst = gst // 2 if intra_state else 0
+    igst = 0 if intra_state else gst
+
+    expected = {
+        "POLICY_NO": f"{rng.choice(['P', 'MOT', 'OG'])}/{issued.year}/{rng.randint(100000, 999999)}",
+        "INSURANCE_COMPANY_NAME": rng.choice(_COMPANIES),
+        "CUSTOMER_NAME": f"{first} {last}",
+        "CUSTOMER_EMAIL": f"{first.lower()}.{last.lower()}{rng.randint(1, 99)}@example.com",
+        "MOB_NO": f"{rng.choice('6789')}{rng.randint(0, 999999999):09d}",
+        "REGISTRATION_NUMBER": f"{_STATE_CODES[state]}{rng.randint(1, 50):02d}"
+                               f"{rng.choice(['AB', 'CD', 'EF', 'GH'])}{rng.randint(1000, 9999)}",
+        "CHASIS_NUMBER": f"MA3{rng.choice(['EWD', 'FJB', 'ZCT'])}{rng.randint(10**10, 10**11 - 1)}",
+        "ENGINE_NUMBER": f"K{rng.randint(10, 15)}{rng.choice(['MN', 'BP', 'CR'])}{rng.randint(10**6, 10**7 - 1)}",
+        "VEHICLE_MAKE": make,
+        "VEHICLE_MODEL": model,
+        "VEHICLE_VARIANT": variant,
+        "VEHICLE_SUB_TYPE": rng.choice(_SUB_TYPES),
+        "YEAR_OF_MANUFACTURE": str(year),
+        "REGISTRATION_DATE": registered.isoformat(),
+        "POLICY_ISSUE_DATE": issued.isoformat(),
+        "RISK_START_DATE": starts.isoformat(),
+        "RISK_END_DATE": ends.isoformat(),
+        "OD_EXPIRE_DATE": ends.isoformat(),
+        "COMPLETE_LOCATION_ADDRESS": f"{rng.randint(1, 400)} {rng.choice(['MG ROAD', 'STATION ROAD', 'LINK ROAD'])} {city}",
+        "CITY_NAME": city,
+        "STATE_NAME": state,
+        "PINCODE": f"{pin_prefix}{rng.randint(0, 999):03d}",
+        "FUEL_TYPE": rng.choice(_FUELS),
+        "CV_TYPE": rng.choice(_CV_TYPES),
+        "COVER": rng.choice(_COVERS),
+        "IDV_SUM_INSURED": str(rng.randint(200, 2000) * 1000),
+        "NCB": str(rng.choice([0, 20, 25, 35, 45, 50])),
+        "NET_PREMIUM": str(net_premium),
+        "OD_PREMIUM": str(od_premium),
+        "TP_ONLY_PREMIUM": str(tp_premium),
+        "TOTAL_PREMIUM": str(net_premium + gst),
+        "GST": str(gst),
+        "CGST": str(cgst),
+        "SGST": str(sgst),
+        "IGST": str(igst),
+        "CC": str(rng.choice([998, 1197, 1497, 2179, 2523])),
+        "GVW": str(rng.choice([1200, 1850, 2510, 3490])),
+        "PRODUCT_CODE": str(rng.choice([2311, 2312, 2319])),
+        "BROKER_NAME": rng.choice(_BROKERS),
+        "FINANCIER_NAME": rng.choice(_FINANCIERS),
+        "NOMINEE_NAME": f"{rng.choice(_FIRST_NAMES)} {last}",
+        "NOMINEE_RELATIONSHIP": rng.choice(_RELATIONSHIPS),
+    }
+
+    printed = dict(expected)
+    for field in _DATE_FIELDS:
+        printed[field] = date.fromisoformat(expected[field]).strftime(rng.choice(_DATE_FORMATS))
+    for field in _AMOUNT_FIELDS:
+        printed[field] = _amount(int(expected[field]))
+    printed["NCB"] = f"{expected['NCB']}%"
+    return expected, printed
+
+
+def _label_lines(rng: random.Random, printed: Dict[str, str], layout: str) -> List[Tuple[str, str]]:
+    separator = {"colon": ": ", "dash": " - ", "equals": " = ", "two_column": ": "}[layout]
+    lines = []
+    for field, value in printed.items():
+        labels = _EXTRA_LABELS.get(field) or FIELD_KEYWORDS[field]
+        label = rng.choice(labels).rstrip(":")
+        lines.append((f"{label}{separator}", value))
+    return lines
+
+
+def write_policy_pdf(path: Path, lines: List[Tuple[str, str]], layout: str, rasterize: bool) -> int:
+    """
+    Write label/value lines to a PDF, 40 lines per A4 page (two columns for
+    the two_column layout). Returns the number of pages.
+    """
+    doc = fitz.open()
+    rows_per_page = 40
+    columns = 2 if layout == "two_column" else 1
+    per_page = rows_per_page * columns
+    for start in range(0, len(lines), per_page):
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((36, 40), "MOTOR INSURANCE POLICY SCHEDULE", fontsize=13, fontname="hebo")
+        for offset, (label, value) in enumerate(lines[start:start + per_page]):
+            column, row = divmod(offset, rows_per_page)
+            x = 36 + column * 280
+            y = 70 + row * 18
+            page.insert_text((x, y), label + value, fontsize=9, fontname="helv")
+
+    if rasterize:
+        scanned = fitz.open()
+        for page in doc:
+            pix = page.get_pixmap(dpi=SCAN_DPI, colorspace=fitz.csGRAY)
+            scanned_page = scanned.new_page(width=page.rect.width, height=page.rect.height)
+            scanned_page.insert_image(scanned_page.rect, pixmap=pix)
+        doc.close()
+        doc = scanned
+
+    page_count = len(doc)
+    doc.save(str(path), garbage=3, deflate=True)
+    doc.close()
+    return page_count
+
+
+def build_corpus(out_dir: Path, count: int = 50, seed: int = 1, scanned_ratio: float = 0.3) -> dict:
+    """
+    Write count synthetic policies and their ground truth to out_dir and
+    return the ground truth.
+    """
+    if not PYMUPDF_AVAILABLE:
+        raise RuntimeError("PyMuPDF (fitz) is not available. Please install it: pip install PyMuPDF")
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    documents = {}
+    for index in range(count):
+        expected, printed = random_policy(rng)
+        layout = LAYOUTS[index % len(LAYOUTS)]
+        rasterize = rng.random() < scanned_ratio
+        name = f"policy_{index:04d}.pdf"
+        lines = _label_lines(rng, printed, layout)
+        pages = write_policy_pdf(out_dir / name, lines, layout, rasterize)
+        documents[name] = {"layout": layout, "scanned": rasterize, "pages": pages, "fields": expected}
+
+    truth = {"seed": seed, "count": count, "scanned_ratio": scanned_ratio, "documents": documents}
+    (out_dir / GROUND_TRUTH_FILE).write_text(json.dumps(truth, indent=2), encoding="utf-8")
+    return truth
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a synthetic motor-policy PDF corpus.")
+    parser.add_argument("out_dir", type=str, help="Directory to write the PDFs and ground truth to.")
+    parser.add_argument("--count", type=int, default=50, help="Number of documents. Default: 50.")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed. Default: 1.")
+    parser.add_argument(
+        "--scanned-ratio",
+        type=float,
+        default=0.3,
+        help="Share of documents rasterized without a text layer. Default: 0.3.",
+    )
+    args = parser.parse_args(argv)
+
+    truth = build_corpus(Path(args.out_dir), args.count, args.seed, args.scanned_ratio)
+    scanned = sum(document["scanned"] for document in truth["documents"].values())
+    print(f"Wrote {truth['count']} documents ({scanned} scanned) to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Index of boilerplate pages (policy wording) shared across documents.
+
+Every policy of an insurer carries the same pages of terms and
+conditions. Scans of them never hash to the same pixels, so they miss
+the OCR cache, but they do look the same at low resolution. A page's
+fingerprint is a difference hash (dHash) of a small grayscale render:
+the content is moved to the top-left corner (scans of one page are
+placed slightly differently), the render is averaged down to a
+FINGERPRINT_SIZE x (FINGERPRINT_SIZE + 1) grid, and every bit says
+whether a cell is clearly brighter than its left neighbour. Pages whose
+fingerprints differ in at most max_distance bits are taken to be the
+same page, and the canonical text stored for it is used instead of OCR.
+
+An index file is JSON of the form:
+
+    {
+      "fingerprint_size": 32,
+      "max_distance": 64,
+      "pages": [
+        {"fingerprint": "<hex>", "text": "...", "documents": 12, "sample": "a.pdf#4"}
+      ]
+    }
+
+It is built from a sample corpus with `ocr_pdf_extract.py boilerplate`
+(see ocr_pdf_extract.build_boilerplate_index), which only keeps pages
+that recur in several documents with the same text.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from lazy_import import LazyModule
+
+np = LazyModule("numpy")
+
+# Fingerprints have FINGERPRINT_SIZE ** 2 bits
+FINGERPRINT_SIZE = 32
+# Neighbouring cells must differ by more than this many gray levels to set
+# a bit, so that scanner noise on white margins does not flip bits
+FINGERPRINT_TOLERANCE = 2.0
+# Fingerprints at most this many bits apart (about 6%) are the same page
+DEFAULT_MAX_DISTANCE = 64
+# Content starts at the first row and column with this share of ink
+# pixels (this many gray levels darker than the background), so specks of
+# dirt in the margin do not move it
+ALIGN_MIN_INK = 0.02
+ALIGN_INK_CONTRAST = 64
+
+
+def _align_to_content(pixels):
+    """Shift a render so that its content starts at the top-left corner."""
+    background = float(np.median(pixels))
+    ink = pixels < background - ALIGN_INK_CONTRAST
+    rows = np.flatnonzero(ink.mean(axis=1) > ALIGN_MIN_INK)
+    columns = np.flatnonzero(ink.mean(axis=0) > ALIGN_MIN_INK)
+    if not len(rows) or not len(columns):
+        return pixels
+    top, left = rows[0], columns[0]
+    height, width = pixels.shape
+    aligned = np.full_like(pixels, int(background))
+    aligned[:height - top, :width - left] = pixels[top:, left:]
+    return aligned
+
+
+def fingerprint_pixels(pixels) -> bytes:
+    """
+    dHash of a grayscale page render (2-D uint8 array), as
+    FINGERPRINT_SIZE ** 2 / 8 bytes.
+    """
+    height, width = pixels.shape
+    if height < FINGERPRINT_SIZE or width < FINGERPRINT_SIZE + 1:
+        raise ValueError(f"render of {width}x{height} is too small to fingerprint")
+    pixels = _align_to_content(pixels)
+    rows = np.linspace(0, height, FINGERPRINT_SIZE + 1).astype(np.intp)
+    columns = np.linspace(0, width, FINGERPRINT_SIZE + 2).astype(np.intp)
+    sums = np.add.reduceat(np.add.reduceat(pixels.astype(np.float32), rows[:-1], axis=0),
+                           columns[:-1], axis=1)
+    cells = sums / np.outer(np.diff(rows), np.diff(columns))
+    bits = cells[:, 1:] > cells[:, :-1] + FINGERPRINT_TOLERANCE
+    return np.packbits(bits).tobytes()
+
+
+class BoilerplatePage(NamedTuple):
+    """A known boilerplate page: its fingerprint and canonical text."""
+    fingerprint: bytes
+    text: str
+    documents: int = 0
+    sample: str = ""
+
+
+class BoilerplateIndex:
+    """
+    Fingerprints of known boilerplate pages, matched by Hamming distance.
+    """
+
+    def __init__(self, pages: List[BoilerplatePage], max_distance: int = DEFAULT_MAX_DISTANCE):
+        self.pages = list(pages)
+        self.max_distance = max_distance
+        self._matrix = None
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def distances(self, fingerprint: bytes):
+        """Hamming distance of fingerprint to every indexed page (NumPy array)."""
+        if self._matrix is None:
+            self._matrix = np.frombuffer(b"".join(page.fingerprint for page in self.pages),
+                                         dtype=np.uint8).reshape(len(self.pages), -1)
+        query = np.frombuffer(fingerprint, dtype=np.uint8)
+        return np.unpackbits(self._matrix ^ query, axis=1).sum(axis=1)
+
+    def match(self, fingerprint: bytes) -> Optional[BoilerplatePage]:
+        """The closest indexed page within max_distance bits, or None."""
+        if not self.pages:
+            return None
+        distances = self.distances(fingerprint)
+        closest = int(np.argmin(distances))
+        return self.pages[closest] if distances[closest] <= self.max_distance else None
+
+    def to_dict(self) -> dict:
+        return {
+            "fingerprint_size": FINGERPRINT_SIZE,
+            "max_distance": self.max_distance,
+            "pages": [
+                {"fingerprint": page.fingerprint.hex(), "text": page.text,
+                 "documents": page.documents, "sample": page.sample}
+                for page in self.pages
+            ],
+        }
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        # Write then rename so a running extraction never reads a partial index
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def __repr__(self) -> str:
+        return f"BoilerplateIndex({len(self.pages)} pages, max_distance={self.max_distance})"
+
+
+def load_boilerplate_index(path: Path) -> BoilerplateIndex:
+    """
+    Load a boilerplate index from a JSON file (see the module docstring).
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("fingerprint_size", FINGERPRINT_SIZE) != FINGERPRINT_SIZE:
+        raise ValueError(f"{path}: fingerprints of size {data['fingerprint_size']}, "
+                         f"expected {FINGERPRINT_SIZE}; rebuild the index")
+    pages = [
+        BoilerplatePage(bytes.fromhex(entry["fingerprint"]), entry["text"],
+                        int(entry.get("documents", 0)), entry.get("sample", ""))
+        for entry in data.get("pages", [])
+    ]
+    return BoilerplateIndex(pages, int(data.get("max_distance", DEFAULT_MAX_DISTANCE)))
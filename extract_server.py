@@ -0,0 +1,294 @@
+"""
+Resident extraction worker, started with `ocr_pdf_extract.py serve`.
+
+Running ocr_pdf_extract.py once per document pays for Python startup,
+the PyMuPDF and pytesseract imports and argument parsing every time. The
+server pays for them once and then answers requests over stdin/stdout
+(the default) or a Unix domain socket (--socket PATH).
+
+Every message in either direction is a frame: a 4-byte big-endian length
+followed by that many bytes. A request frame holds one of:
+
+- the bytes of a PDF (starting with %PDF-), opened from memory
+- the UTF-8 path of a PDF file
+- a JSON object {"path": ..., "id": ..., "fields": [...]}, where id is
+  echoed back and fields selects schema keys as in extract_insurance_fields
+
+Every response frame is a JSON object:
+
+    {"request": 0, "id": ..., "fields": {...}, "pages": 3,
+     "seconds": {"queued": 0.0, "pages": 0.41, "fields": 0.002, "total": 0.412}}
+
+or {"request": 0, "error": "..."}. request numbers the requests of a
+connection (stdin is one connection) from 0. Up to concurrency requests
+run at once over all connections, so responses can come back out of
+order; a connection is not read further while all slots are busy. End
+of input ends the connection once its responses are written.
+"""
+
+import errno
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple, Union
+
+import ocr_pdf_extract
+from field_extractor import select_fields
+from instrumentation import service_profile
+from ocr_pdf_extract import fields_of_pages, iter_pdf_pages
+
+_FRAME_LENGTH = struct.Struct(">I")
+# Larger request frames are refused and end the connection
+MAX_REQUEST_BYTES = 256 * 1024 * 1024
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> Optional[bytes]:
+    """size bytes from stream, or None at end of input before the first byte."""
+    chunks: List[bytes] = []
+    remaining = size
+    while remaining:
+        chunk = stream.read(remaining)
+        if not chunk:
+            if remaining == size:
+                return None
+            raise EOFError(f"input ended {remaining} bytes short of a {size}-byte read")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_frame(stream: BinaryIO) -> Optional[bytes]:
+    """The payload of the next frame, or None at end of input."""
+    header = _read_exactly(stream, _FRAME_LENGTH.size)
+    if header is None:
+        return None
+    (length,) = _FRAME_LENGTH.unpack(header)
+    if length > MAX_REQUEST_BYTES:
+        raise ValueError(f"frame of {length} bytes is larger than {MAX_REQUEST_BYTES}")
+    payload = _read_exactly(stream, length) if length else b""
+    if payload is None:
+        raise EOFError("input ended after a frame header")
+    return payload
+
+
+def write_frame(stream: BinaryIO, payload: bytes) -> None:
+    stream.write(_FRAME_LENGTH.pack(len(payload)) + payload)
+    stream.flush()
+
+
+def parse_request(payload: bytes) -> Tuple[Union[Path, bytes], Optional[object], Optional[List[str]]]:
+    """
+    (PDF path or bytes, request id, fields) of a request frame; see the
+    module docstring. Raises ValueError for a malformed request.
+    """
+    if payload.startswith(b"%PDF-"):
+        return payload, None, None
+    if payload.lstrip().startswith(b"{"):
+        request = json.loads(payload)
+        if not isinstance(request, dict) or not isinstance(request.get("path"), str):
+            raise ValueError('a JSON request needs a "path" string')
+        fields = request.get("fields")
+        if fields is not None and (not isinstance(fields, list)
+                                   or not all(isinstance(field, str) for field in fields)):
+            raise ValueError('"fields" must be a list of schema keys')
+        return Path(request["path"]), request.get("id"), fields
+    path = payload.decode("utf-8").strip()
+    if not path:
+        raise ValueError("empty request")
+    return Path(path), None, None
+
+
+class ExtractionServer:
+    """
+    Runs requests on a thread pool of concurrency threads, shared by all
+    connections. ocr_options are passed to iter_pdf_pages; fields is the
+    default field selection of requests that name none.
+    """
+
+    def __init__(self, concurrency: int, ocr_options: Optional[dict] = None,
+                 fields: Optional[List[str]] = None):
+        self.concurrency = concurrency
+        self.ocr_options = dict(ocr_options or {})
+        self.fields = fields
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="serve")
+        self._slots = threading.BoundedSemaphore(concurrency)
+
+    def extract(self, payload: bytes, received: float) -> dict:
+        """The response to one request frame (without its request number)."""
+        started = time.perf_counter()
+        response: dict = {}
+        try:
+            source, request_id, fields = parse_request(payload)
+            if request_id is not None:
+                response["id"] = request_id
+            fields = self.fields if fields is None else sorted(select_fields(fields))
+            profile = service_profile()
+            pages = list(iter_pdf_pages(source, profile=profile, **self.ocr_options))
+            read = time.perf_counter()
+            response["fields"] = fields_of_pages(pages, fields, profile)
+            response["pages"] = len(pages)
+            finished = time.perf_counter()
+            response["seconds"] = {
+                "queued": round(started - received, 4),
+                "pages": round(read - started, 4),
+                "fields": round(finished - read, 4),
+                "total": round(finished - received, 4),
+            }
+        except Exception as e:
+            response["error"] = str(e) or type(e).__name__
+        return response
+
+    def serve_connection(self, reader: BinaryIO, writer: BinaryIO) -> None:
+        """
+        Answer the request frames read from reader on writer until end of
+        input, then wait for this connection's pending responses.
+        """
+        write_lock = threading.Lock()
+        pending: List[Future] = []
+
+        def respond(request_number: int, response: dict) -> None:
+            payload = json.dumps({"request": request_number, **response}, ensure_ascii=False)
+            with write_lock:
+                try:
+                    write_frame(writer, payload.encode("utf-8"))
+                except OSError:
+                    # The client went away; its other responses are dropped too
+                    pass
+
+        def run(request_number: int, payload: bytes, received: float) -> None:
+            try:
+                respond(request_number, self.extract(payload, received))
+            finally:
+                self._slots.release()
+
+        request_number = 0
+        while True:
+            try:
+                payload = read_frame(reader)
+            except (ValueError, EOFError, OSError) as e:
+                respond(request_number, {"error": str(e)})
+                break
+            if payload is None:
+                break
+            received = time.perf_counter()
+            # Stop reading while every slot is busy, so clients feel the backpressure
+            self._slots.acquire()
+            try:
+                pending.append(self._executor.submit(run, request_number, payload, received))
+            except BaseException:
+                self._slots.release()
+                raise
+            pending = [future for future in pending if not future.done()]
+            request_number += 1
+        wait(pending)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+class _ConnectionHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        self.server.extraction.serve_connection(self.rfile, self.wfile)
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve_stdio(server: ExtractionServer) -> None:
+    """Answer requests from stdin on stdout until stdin is closed."""
+    output = sys.stdout.buffer
+    # Anything else printed (e.g. library warnings) must not land between frames
+    sys.stdout = sys.stderr
+    server.serve_connection(sys.stdin.buffer, output)
+
+
+def _remove_stale_socket(socket_path: Path) -> None:
+    """
+    Remove a socket left at socket_path by a server that is gone. Raises
+    SystemExit when something else is there, or a server still listens.
+    """
+    try:
+        mode = socket_path.lstat().st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise SystemExit(f"Refusing to replace {socket_path}: it exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+    except OSError as e:
+        if e.errno not in (errno.ECONNREFUSED, errno.ENOENT):
+            raise SystemExit(f"Refusing to replace {socket_path}: {e}")
+    else:
+        raise SystemExit(f"Refusing to replace {socket_path}: another server is listening on it")
+    finally:
+        probe.close()
+    socket_path.unlink(missing_ok=True)
+
+
+def _interrupt(signum, frame) -> None:
+    raise KeyboardInterrupt
+
+
+def serve_unix_socket(server: ExtractionServer, socket_path: Path) -> None:
+    """
+    Accept connections on a Unix domain socket until interrupted (Ctrl-C
+    or SIGTERM), then remove the socket. A socket left at socket_path by
+    a killed server is replaced; anything else there is refused.
+    """
+    _remove_stale_socket(socket_path)
+    unix_server = _UnixServer(str(socket_path), _ConnectionHandler)
+    unix_server.extraction = server
+    # A service manager stops the server with SIGTERM; clean up as for Ctrl-C
+    in_main_thread = threading.current_thread() is threading.main_thread()
+    if in_main_thread:
+        previous_handler = signal.signal(signal.SIGTERM, _interrupt)
+    print(f"Serving on {socket_path} with {server.concurrency} concurrent requests", file=sys.stderr)
+    try:
+        unix_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if in_main_thread:
+            signal.signal(signal.SIGTERM, previous_handler)
+        unix_server.server_close()
+        socket_path.unlink(missing_ok=True)
+
+
+def serve(concurrency: int, ocr_options: Optional[dict] = None, fields: Optional[List[str]] = None,
+          socket_path: Optional[Path] = None) -> None:
+    """
+    Import the OCR dependencies, then serve requests over a Unix domain
+    socket when socket_path is given, else over stdin/stdout.
+    """
+    # Every request thread may hold a warm tesseract engine (with tesserocr)
+    if "OCR_ENGINE_POOL_SIZE" not in os.environ:
+        ocr_pdf_extract.ENGINE_POOL_SIZE = concurrency
+    # Pay for the imports now rather than on the first request; the PyMuPDF
+    # import prints a deprecation notice, which must not reach stdout
+    stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        ocr_pdf_extract.fitz.load()
+        ocr_pdf_extract.pytesseract.load()
+    finally:
+        sys.stdout = stdout
+
+    server = ExtractionServer(concurrency, ocr_options, fields)
+    try:
+        if socket_path is not None:
+            serve_unix_socket(server, socket_path)
+        else:
+            serve_stdio(server)
+    finally:
+        server.close()
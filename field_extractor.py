@@ -4,8 +4,23 @@ Simple and reliable field extraction.
 """
 
 import re
+from functools import lru_cache
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Match, Optional, Pattern, Sequence, Tuple
+
+from instrumentation import NULL_PROFILE
+
+# Common date patterns in Indian insurance documents, with their strptime formats
+_DATE_PATTERNS = [
+    (re.compile(r"(\d{1,2})[/-](\d{1,2})[/-](\d{4})", re.IGNORECASE), "%d/%m/%Y"),  # DD/MM/YYYY or DD-MM-YYYY
+    (re.compile(r"(\d{1,2})[/-](\d{1,2})[/-](\d{2})", re.IGNORECASE), "%d/%m/%y"),  # DD/MM/YY
+    (re.compile(r"(\d{4})[/-](\d{1,2})[/-](\d{1,2})", re.IGNORECASE), "%Y/%m/%d"),  # YYYY/MM/DD
+    (re.compile(r"(\d{1,2})\s+(\w+)\s+(\d{4})", re.IGNORECASE), "%d %B %Y"),  # DD Month YYYY
+    (re.compile(r"(\d{1,2})\s+(\w+)\s+(\d{2})", re.IGNORECASE), "%d %B %y"),  # DD Month YY
+]
+# Currency symbols and separators stripped before reading a number
+_NUMBER_NOISE = re.compile(r"[₹Rs\.\s,]", re.IGNORECASE)
+_NUMBER = re.compile(r"\d+\.?\d*")
 
 
 def normalize_date(date_str: str) -> str:
@@ -18,17 +33,8 @@ def normalize_date(date_str: str) -> str:
     
     date_str = date_str.strip()
     
-    # Common date patterns in Indian insurance documents
-    patterns = [
-        (r"(\d{1,2})[/-](\d{1,2})[/-](\d{4})", "%d/%m/%Y"),  # DD/MM/YYYY or DD-MM-YYYY
-        (r"(\d{1,2})[/-](\d{1,2})[/-](\d{2})", "%d/%m/%y"),  # DD/MM/YY
-        (r"(\d{4})[/-](\d{1,2})[/-](\d{1,2})", "%Y/%m/%d"),  # YYYY/MM/DD
-        (r"(\d{1,2})\s+(\w+)\s+(\d{4})", "%d %B %Y"),  # DD Month YYYY
-        (r"(\d{1,2})\s+(\w+)\s+(\d{2})", "%d %B %y"),  # DD Month YY
-    ]
-    
-    for pattern, fmt in patterns:
-        match = re.search(pattern, date_str, re.IGNORECASE)
+    for pattern, fmt in _DATE_PATTERNS:
+        match = pattern.search(date_str)
         if match:
             try:
                 date_obj = datetime.strptime(match.group(0), fmt)
@@ -48,18 +54,395 @@ def extract_number(text: str) -> str:
         return ""
     
     # Remove currency symbols and common text
-    text = re.sub(r"[₹Rs\.\s,]", "", str(text), flags=re.IGNORECASE)
+    text = _NUMBER_NOISE.sub("", str(text))
     
     # Extract numbers (including decimals)
-    match = re.search(r"\d+\.?\d*", text)
+    match = _NUMBER.search(text)
     if match:
         return match.group(0)
     
     return ""
 
 
+def _map_distinct(function: Callable[[str], str], values: Iterable,
+                  column: Optional[Callable[[List[str]], List[str]]] = None) -> List[str]:
+    """
+    function applied to every value, computing each distinct string only
+    once (with column, if given, which maps a list of distinct strings to
+    their results in one pass). Other values (None, numbers) go through
+    function one by one, since e.g. 1 and True would share a memo entry.
+    """
+    values = list(values)
+    distinct = list(set(value for value in values if type(value) is str))
+    results = column(distinct) if column is not None else [function(value) for value in distinct]
+    memo = dict(zip(distinct, results))
+    return [memo[value] if type(value) is str else function(value) for value in values]
+
+
+def normalize_dates(date_strs: Iterable[Optional[str]]) -> List[str]:
+    """
+    normalize_date over a column of values, e.g. one date field across a
+    batch of extracted records. Dates repeat heavily within a batch, so
+    each distinct string is parsed only once; the output is identical to
+    [normalize_date(value) for value in date_strs].
+    """
+    return _map_distinct(normalize_date, date_strs)
+
+
+# One match per NUL-terminated value: the first number of the value, as
+# _NUMBER.search would find it, or an empty group
+_NUMBER_COLUMN = re.compile(r"[^\d\x00]*(\d+\.?\d*)?[^\x00]*\x00")
+
+
+def _extract_number_column(texts: List[str]) -> List[str]:
+    """
+    extract_number for many strings at once: they are joined with NULs so
+    that the noise removal and the number search each run once over the
+    whole column instead of once per value.
+    """
+    if not texts or any("\x00" in text for text in texts):
+        return [extract_number(text) for text in texts]
+    return _NUMBER_COLUMN.findall(_NUMBER_NOISE.sub("", "\x00".join(texts) + "\x00"))
+
+
+def extract_numbers(texts: Iterable[Optional[str]]) -> List[str]:
+    """
+    extract_number over a column of values, e.g. one amount field across
+    a batch of extracted records. The output is identical to
+    [extract_number(text) for text in texts].
+    """
+    return _map_distinct(extract_number, texts, column=_extract_number_column)
+
+
+# Keys of the extracted record, in output order
+SCHEMA_FIELDS = (
+    "BROKER_NAME",
+    "CC",
+    "CGST",
+    "CHASIS_NUMBER",
+    "CITY_NAME",
+    "COVER",
+    "CUSTOMER_EMAIL",
+    "CUSTOMER_NAME",
+    "CV_TYPE",
+    "ENGINE_NUMBER",
+    "FINANCIER_NAME",
+    "FUEL_TYPE",
+    "GST",
+    "GVW",
+    "IDV_SUM_INSURED",
+    "IGST",
+    "INSURANCE_COMPANY_NAME",
+    "COMPLETE_LOCATION_ADDRESS",
+    "MOB_NO",
+    "NCB",
+    "NET_PREMIUM",
+    "NOMINEE_NAME",
+    "NOMINEE_RELATIONSHIP",
+    "OD_EXPIRE_DATE",
+    "OD_PREMIUM",
+    "PINCODE",
+    "POLICY_ISSUE_DATE",
+    "POLICY_NO",
+    "PRODUCT_CODE",
+    "REGISTRATION_DATE",
+    "REGISTRATION_NUMBER",
+    "RISK_END_DATE",
+    "RISK_START_DATE",
+    "SGST",
+    "STATE_NAME",
+    "TOTAL_PREMIUM",
+    "TP_ONLY_PREMIUM",
+    "VEHICLE_MAKE",
+    "VEHICLE_MODEL",
+    "VEHICLE_SUB_TYPE",
+    "VEHICLE_VARIANT",
+    "YEAR_OF_MANUFACTURE",
+)
+
+# Label keywords for every field looked up by find_field_by_keywords,
+# in the order they are tried.
+FIELD_KEYWORDS: Dict[str, List[str]] = {
+    "POLICY_NO": [
+        "Policy No", "Policy Number", "Policy No.", "Policy #", "Policy Number:",
+    ],
+    "INSURANCE_COMPANY_NAME": [
+        "Insurance Company", "Company Name", "Insurer", "Insurance Co", "Company:",
+    ],
+    "CUSTOMER_NAME": [
+        "Customer Name", "Insured Name", "Name of Insured", "Policy Holder", "Insured",
+        "Name", "Customer:", "Insured Name:",
+    ],
+    "CUSTOMER_EMAIL": ["Email", "E-mail", "Email ID", "Email Address"],
+    "MOB_NO": ["Mobile", "Phone", "Contact", "Mobile No", "Phone No", "Mob No"],
+    "REGISTRATION_NUMBER": [
+        "Registration No", "Reg No", "Vehicle No", "Registration Number", "Reg. No",
+        "Vehicle Number", "RC No",
+    ],
+    "CHASIS_NUMBER": [
+        "Chassis No", "Chassis Number", "Chassis", "Chassis No.", "CH No",
+    ],
+    "ENGINE_NUMBER": ["Engine No", "Engine Number", "Engine", "Engine No.", "EN No"],
+    "VEHICLE_MAKE": [
+        "Make", "Vehicle Make", "Manufacturer", "Brand", "Make of Vehicle",
+    ],
+    "VEHICLE_MODEL": ["Model", "Vehicle Model", "Model Name", "Model of Vehicle"],
+    "VEHICLE_VARIANT": ["Variant", "Vehicle Variant", "Variant Name"],
+    "VEHICLE_SUB_TYPE": ["Sub Type", "Vehicle Sub Type", "Sub-Type", "Type"],
+    "REGISTRATION_DATE": [
+        "Registration Date", "Reg Date", "Date of Registration", "Registration",
+    ],
+    "POLICY_ISSUE_DATE": [
+        "Policy Issue Date", "Issue Date", "Date of Issue", "Policy Date", "Issued On",
+        "Policy Issued On",
+    ],
+    "RISK_START_DATE": [
+        "Risk Start Date", "Coverage Start", "Start Date", "From Date", "Period From",
+        "Coverage From",
+    ],
+    "RISK_END_DATE": [
+        "Risk End Date", "Coverage End", "End Date", "To Date", "Period To",
+        "Coverage To", "Expiry Date",
+    ],
+    "OD_EXPIRE_DATE": ["OD Expire", "OD Expiry", "Own Damage Expiry", "OD Expiry Date"],
+    "COMPLETE_LOCATION_ADDRESS": [
+        "Address", "Complete Address", "Location", "Residential Address",
+        "Permanent Address", "Correspondence Address",
+    ],
+    "CITY_NAME": ["City", "City Name", "City:"],
+    "STATE_NAME": ["State", "State Name", "State:"],
+    "FUEL_TYPE": ["Fuel Type", "Fuel", "Fuel:"],
+    "CV_TYPE": [
+        "CV Type", "Vehicle Type", "Type of Vehicle", "Commercial Vehicle Type",
+    ],
+    "COVER": ["Cover", "Coverage", "Cover Type", "Type of Cover"],
+    "IDV_SUM_INSURED": [
+        "IDV", "Sum Insured", "Insured Value", "IDV Amount", "Sum Assured",
+    ],
+    "NCB": ["NCB", "No Claim Bonus", "NCB %", "No Claim Bonus %"],
+    "NET_PREMIUM": ["Net Premium", "Premium", "Net Premium Amount"],
+    "OD_PREMIUM": ["OD Premium", "Own Damage Premium", "OD Premium Amount"],
+    "TP_ONLY_PREMIUM": [
+        "TP Premium", "Third Party Premium", "TP Only Premium", "TP Premium Amount",
+    ],
+    "TOTAL_PREMIUM": ["Total Premium", "Premium Total", "Total Amount", "Grand Total"],
+    "GST": ["GST", "GST Amount", "Goods and Services Tax"],
+    "CGST": ["CGST", "CGST Amount", "Central GST"],
+    "SGST": ["SGST", "SGST Amount", "State GST"],
+    "IGST": ["IGST", "IGST Amount", "Integrated GST"],
+    "CC": ["CC", "Cubic Capacity", "Engine CC", "CC:"],
+    "GVW": ["GVW", "Gross Vehicle Weight", "GVW:", "Vehicle Weight"],
+    "PRODUCT_CODE": ["Product Code", "Product", "Product ID", "Code"],
+    "BROKER_NAME": ["Broker", "Broker Name", "Agent", "Agent Name", "Intermediary"],
+    "FINANCIER_NAME": [
+        "Financier", "Financier Name", "Finance Company", "Loan Provider",
+    ],
+    "NOMINEE_NAME": ["Nominee", "Nominee Name", "Nominee:", "Name of Nominee"],
+    "NOMINEE_RELATIONSHIP": [
+        "Nominee Relationship", "Relationship", "Relation",
+        "Relationship with Nominee",
+    ],
+}
+
+
+def _label_trie_pattern(labels: List[str]) -> str:
+    """
+    Build a regex alternation for the given labels, factored as a prefix trie
+    so that one pass over the text walks all labels at once. At each position
+    the longest matching label wins.
+    """
+    trie: dict = {}
+    for label in labels:
+        node = trie
+        for char in label:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def to_pattern(node: dict) -> str:
+        branches = [re.escape(char) + to_pattern(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            pattern = "(?:" + pattern + ")?"
+        return pattern
+
+    return to_pattern(trie)
+
+
+# Every known label, upper-cased
+_LABELS = sorted({keyword.upper() for keywords in FIELD_KEYWORDS.values() for keyword in keywords})
+_LABEL_SET = frozenset(_LABELS)
+# The only non-ASCII characters that re.IGNORECASE matches to a label
+# character (I, K, S); dotless i and long s are gone after upper(), but
+# the dotted capital I and the Kelvin sign are not
+_CASE_LOOKALIKES = re.compile("[\u0130\u0131\u017f\u212a]")
+
+
+# Only texts with such look-alikes are scanned with a regex, and clients of
+# serve and the API choose the label sets, so keep the recent ones only
+@lru_cache(maxsize=64)
+def _folding_matcher(label_set: frozenset) -> Tuple[List[str], Pattern, Dict[str, List[str]]]:
+    """
+    (labels, case-insensitive trie matcher, prefixes) for a set of labels,
+    where prefixes maps every label to the labels that are prefixes of it.
+    Two labels can only match at the same position when one is a prefix of
+    the other, so the longest match at a position tells us all labels found there.
+    """
+    labels = sorted(label_set)
+    prefixes = {
+        label: [label[:end] for end in range(1, len(label) + 1) if label[:end] in label_set]
+        for label in labels
+    }
+    return labels, re.compile(f"(?=({_label_trie_pattern(labels)}))", re.IGNORECASE), prefixes
+
+_VALUE_AFTER_SEPARATOR = re.compile(r"\s*[:=\-]\s*(.+?)(?:\n|$)", re.MULTILINE | re.IGNORECASE)
+_VALUE_AFTER_SPACE = re.compile(r"\s+(.+?)(?:\n|$)", re.MULTILINE | re.IGNORECASE)
+_NEW_FIELD_LINE = re.compile(r"^[A-Z\s]+[:=\-]")
+
+# Patterns of the fields that are recognised by their format
+_EMAIL = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", re.IGNORECASE)
+_MOBILE = re.compile(r"(\+91[\s\-]?)?[6-9]\d{9}")
+_MOBILE_SEPARATORS = re.compile(r"[\s\-]")
+_REGISTRATION_NUMBER = re.compile(r"[A-Z]{2}\s?[0-9]{1,2}\s?[A-Z]{1,2}\s?[0-9]{4}", re.IGNORECASE)
+_LABELLED_YEAR = re.compile(r"(?:Year|Manufacturing Year|YOM|YOM:)\s*[:=\-]?\s*(\d{4})", re.IGNORECASE)
+_YEAR = re.compile(r"\b(19|20)\d{2}\b")
+_LABELLED_PINCODE = re.compile(r"(?:Pincode|Pin Code|PIN|Pin)\s*[:=\-]?\s*(\d{6})", re.IGNORECASE)
+_PINCODE = re.compile(r"\b\d{6}\b")
+_FUEL_TYPES = [
+    (fuel, re.compile(rf"\b{fuel}\b", re.IGNORECASE))
+    for fuel in ["Petrol", "Diesel", "CNG", "LPG", "Electric", "Hybrid"]
+]
+# Compiled on first use: single labels (only needed for look-alike
+# characters, see LabelIndex) and value_pattern arguments
+_LABEL_PATTERNS: Dict[str, Pattern] = {}
+_VALUE_PATTERNS: Dict[str, Pattern] = {}
+
+
+def _label_pattern(label: str) -> Pattern:
+    pattern = _LABEL_PATTERNS.get(label)
+    if pattern is None:
+        pattern = _LABEL_PATTERNS[label] = re.compile(re.escape(label), re.IGNORECASE)
+    return pattern
+
+
+def _value_pattern(value_pattern: str) -> Pattern:
+    pattern = _VALUE_PATTERNS.get(value_pattern)
+    if pattern is None:
+        pattern = _VALUE_PATTERNS[value_pattern] = re.compile(value_pattern, re.IGNORECASE)
+    return pattern
+
+
+class LabelIndex:
+    """
+    Start offsets of the known labels in one document, found on first use.
+    The text is upper-cased once; each label is then searched for with
+    str.find only as far as its lookups need, and its occurrences are
+    shared by all of them. A text with case look-alike characters is
+    instead scanned once up front (for labels, when given) with a
+    case-insensitive matcher. page_words, the PageWords of the document's
+    pages (see page_words), let find_field_by_keywords look values up by
+    layout first.
+    """
+
+    def __init__(self, text: str, labels: Optional[Iterable[str]] = None,
+                 page_words: Optional[Sequence] = None):
+        self.text_upper = text.upper()
+        self.page_words = list(page_words) if page_words else None
+        self._positions: Dict[str, List[int]] = {}
+        # Offset the search for more occurrences of a label resumes from;
+        # a label is absent here once all of its occurrences are known
+        self._resume: Dict[str, int] = {}
+        self._folding = (not self.text_upper.isascii()
+                         and _CASE_LOOKALIKES.search(self.text_upper) is not None)
+        if not self._folding:
+            return
+
+        label_set = _LABEL_SET if labels is None else frozenset(labels)
+        indexed, matcher, prefixes = _folding_matcher(label_set)
+        for label in indexed:
+            self._positions[label] = []
+        for match in matcher.finditer(self.text_upper):
+            start = match.start()
+            found = prefixes.get(match.group(1))
+            if found is None:
+                # Matched through a case-insensitive look-alike character
+                # (e.g. the Kelvin sign), so check the labels one by one.
+                found = [label for label in indexed
+                         if _label_pattern(label).match(self.text_upper, start)]
+            for label in found:
+                self._positions[label].append(start)
+
+    def _occurrences(self, label: str) -> Iterator[int]:
+        """Yield the start offsets of an upper-cased label in order, searching as needed."""
+        found = self._positions.get(label)
+        if found is None:
+            found = self._positions[label] = []
+            if self._folding:
+                pattern = re.compile(f"(?={re.escape(label)})", re.IGNORECASE)
+                found.extend(m.start() for m in pattern.finditer(self.text_upper))
+            else:
+                self._resume[label] = 0
+        index = 0
+        while True:
+            if index < len(found):
+                yield found[index]
+                index += 1
+                continue
+            resume = self._resume.get(label)
+            if resume is None:
+                return
+            start = self.text_upper.find(label, resume)
+            if start < 0:
+                del self._resume[label]
+                return
+            found.append(start)
+            self._resume[label] = start + 1
+
+    def may_contain(self, label: str) -> bool:
+        """False only when an upper-cased label certainly does not occur in the text."""
+        return self._folding or label in self.text_upper
+
+    def positions(self, label: str) -> List[int]:
+        """Return the sorted start offsets of an upper-cased label."""
+        for _ in self._occurrences(label):
+            pass
+        return self._positions[label]
+
+    def lines_after(self, offset: int) -> Iterator[str]:
+        """
+        Yield the lines following a match that ends at offset (from the
+        first newline at or after offset), without splitting the text.
+        """
+        text = self.text_upper
+        newline = text.find("\n", offset)
+        while newline >= 0:
+            end = text.find("\n", newline + 1)
+            if end < 0:
+                yield text[newline + 1:]
+                return
+            yield text[newline + 1:end]
+            newline = end
+
+    def matches(self, label: str, tail: Pattern) -> Iterator[Match]:
+        """
+        Yield the same matches as re.finditer(label + tail) over the text,
+        trying the tail only where the label occurs.
+        """
+        resume = 0
+        for start in self._occurrences(label):
+            if start < resume:
+                continue
+            match = tail.match(self.text_upper, start + len(label))
+            if match:
+                resume = match.end()
+                yield match
+
+
 def find_field_by_keywords(text: str, keywords: list, multiline: bool = False, 
-                          value_pattern: Optional[str] = None) -> str:
+                          value_pattern: Optional[str] = None,
+                          labels: Optional[LabelIndex] = None) -> str:
     """
     Find a field value by searching for keywords in the text.
     
@@ -68,39 +451,41 @@ def find_field_by_keywords(text: str, keywords: list, multiline: bool = False,
         keywords: List of possible keywords/labels for this field
         multiline: If True, capture multi-line values (like addresses)
         value_pattern: Optional regex pattern to match the value format
+        labels: Optional LabelIndex of the same text, shared between lookups
+            (and carrying the page words, when there are any)
     """
     if not text:
         return ""
     
-    text_upper = text.upper()
+    if labels is None:
+        labels = LabelIndex(text)
+
+    # With word boxes, a single-line value right of or below its label is
+    # found by layout, cased like the text lookups below
+    if labels.page_words and not multiline:
+        value = find_field_by_layout(labels.page_words, keywords, value_pattern)
+        if value:
+            return value.upper()
     
     for keyword in keywords:
         keyword_upper = keyword.upper()
         
         # Try different patterns: "Keyword:", "Keyword -", "Keyword=", etc.
-        patterns = [
-            rf"{re.escape(keyword_upper)}\s*[:=\-]\s*(.+?)(?:\n|$)",
-            rf"{re.escape(keyword_upper)}\s+(.+?)(?:\n|$)",
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, text_upper, re.MULTILINE | re.IGNORECASE)
-            for match in matches:
+        for tail in (_VALUE_AFTER_SEPARATOR, _VALUE_AFTER_SPACE):
+            for match in labels.matches(keyword_upper, tail):
                 value = match.group(1).strip()
                 
                 # If multiline, try to capture more lines
                 if multiline:
                     # Look ahead for continuation lines (non-empty, not starting with common keywords)
-                    lines = text_upper.split('\n')
-                    match_line_idx = text_upper[:match.end()].count('\n')
                     collected = [value]
                     
-                    for i in range(match_line_idx + 1, len(lines)):
-                        next_line = lines[i].strip()
+                    for next_line in labels.lines_after(match.end()):
+                        next_line = next_line.strip()
                         if not next_line:
                             break
                         # Stop if next line looks like a new field
-                        if re.match(r'^[A-Z\s]+[:=\-]', next_line):
+                        if _NEW_FIELD_LINE.match(next_line):
                             break
                         collected.append(next_line)
                     
@@ -108,7 +493,7 @@ def find_field_by_keywords(text: str, keywords: list, multiline: bool = False,
                 
                 # Apply value pattern if provided
                 if value_pattern:
-                    pattern_match = re.search(value_pattern, value, re.IGNORECASE)
+                    pattern_match = _value_pattern(value_pattern).search(value)
                     if pattern_match:
                         value = pattern_match.group(0)
                 
@@ -118,372 +503,503 @@ def find_field_by_keywords(text: str, keywords: list, multiline: bool = False,
     return ""
 
 
-def extract_insurance_fields(text: str) -> Dict[str, str]:
+def find_field_by_layout(pages: list, keywords: list, value_pattern: Optional[str] = None) -> str:
+    """
+    Find a field value from word positions instead of text lines.
+
+    Args:
+        pages: PageWords of the document's pages (see page_words), in order
+        keywords: List of possible keywords/labels for this field, tried in order
+        value_pattern: Optional regex pattern the value must match
+
+    The value is the words right of the label on its line, up to a column
+    gap. Only when no occurrence of a keyword has one are the words under
+    the label on the next line below used.
+    """
+    for keyword in keywords:
+        occurrences = [(words, match) for words in pages for match in words.find_phrase(keyword)]
+        candidates = [words.value_right_of(last) for words, (first, last) in occurrences]
+        candidates += [words.value_below(first, last) for words, (first, last) in occurrences]
+        for value in candidates:
+            if value and value_pattern:
+                pattern_match = _value_pattern(value_pattern).search(value)
+                value = pattern_match.group(0) if pattern_match else ""
+            if value:
+                return value.strip()
+    return ""
+
+
+def select_fields(fields: Optional[Iterable[str]] = None) -> frozenset:
+    """
+    The set of schema keys to extract: all of them when fields is None.
+    Raises ValueError for names that are not schema keys.
+    """
+    if fields is None:
+        return frozenset(SCHEMA_FIELDS)
+    wanted = frozenset(field.strip().upper() for field in fields if field.strip())
+    unknown = sorted(wanted.difference(SCHEMA_FIELDS))
+    if unknown:
+        raise ValueError(f"unknown field(s): {', '.join(unknown)}")
+    return wanted
+
+
+def extract_insurance_fields(text: str, profile=None,
+                             fields: Optional[Iterable[str]] = None,
+                             page_words: Optional[Sequence] = None) -> Dict[str, str]:
     """
     Extract all required fields from insurance PDF text.
     Returns a dictionary with all schema keys, using empty strings for missing values.
+    With an instrumentation Profile, the label scan and each field lookup are timed.
+    With fields, only those keys are looked up (and only their labels
+    indexed); the others are left empty. No field reads another one, so
+    a requested key never pulls in further keys. With page_words (the
+    PageWords of the pages, see iter_pdf_pages' words option), single-line
+    values are looked up right of or below their label first
+    (find_field_by_layout), then in the text.
     """
-    result = {
-        "BROKER_NAME": "",
-        "CC": "",
-        "CGST": "",
-        "CHASIS_NUMBER": "",
-        "CITY_NAME": "",
-        "COVER": "",
-        "CUSTOMER_EMAIL": "",
-        "CUSTOMER_NAME": "",
-        "CV_TYPE": "",
-        "ENGINE_NUMBER": "",
-        "FINANCIER_NAME": "",
-        "FUEL_TYPE": "",
-        "GST": "",
-        "GVW": "",
-        "IDV_SUM_INSURED": "",
-        "IGST": "",
-        "INSURANCE_COMPANY_NAME": "",
-        "COMPLETE_LOCATION_ADDRESS": "",
-        "MOB_NO": "",
-        "NCB": "",
-        "NET_PREMIUM": "",
-        "NOMINEE_NAME": "",
-        "NOMINEE_RELATIONSHIP": "",
-        "OD_EXPIRE_DATE": "",
-        "OD_PREMIUM": "",
-        "PINCODE": "",
-        "POLICY_ISSUE_DATE": "",
-        "POLICY_NO": "",
-        "PRODUCT_CODE": "",
-        "REGISTRATION_DATE": "",
-        "REGISTRATION_NUMBER": "",
-        "RISK_END_DATE": "",
-        "RISK_START_DATE": "",
-        "SGST": "",
-        "STATE_NAME": "",
-        "TOTAL_PREMIUM": "",
-        "TP_ONLY_PREMIUM": "",
-        "VEHICLE_MAKE": "",
-        "VEHICLE_MODEL": "",
-        "VEHICLE_SUB_TYPE": "",
-        "VEHICLE_VARIANT": "",
-        "YEAR_OF_MANUFACTURE": "",
-    }
+    profile = profile or NULL_PROFILE
+    wanted = select_fields(fields)
+    result = dict.fromkeys(SCHEMA_FIELDS, "")
+    
+    # Label occurrences are found once, on first use, and shared by all keyword lookups below
+    with profile.stage("label_scan") as stage:
+        if fields is None:
+            labels = LabelIndex(text, page_words=page_words)
+        else:
+            labels = LabelIndex(text, (keyword.upper() for field in wanted
+                                       for keyword in FIELD_KEYWORDS.get(field, ())), page_words)
+        stage.add_bytes(len(text))
+    laps = profile.laps("field")
     
     # Policy Number
-    result["POLICY_NO"] = find_field_by_keywords(
-        text, 
-        ["Policy No", "Policy Number", "Policy No.", "Policy #", "Policy Number:"],
-        value_pattern=r"[A-Z0-9/\-]+"
-    )
+    if "POLICY_NO" in wanted:
+        result["POLICY_NO"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["POLICY_NO"],
+            value_pattern=r"[A-Z0-9/\-]+",
+            labels=labels
+        )
+        laps.lap("POLICY_NO")
     
     # Insurance Company Name
-    result["INSURANCE_COMPANY_NAME"] = find_field_by_keywords(
-        text,
-        ["Insurance Company", "Company Name", "Insurer", "Insurance Co", "Company:"]
-    )
+    if "INSURANCE_COMPANY_NAME" in wanted:
+        result["INSURANCE_COMPANY_NAME"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["INSURANCE_COMPANY_NAME"],
+            labels=labels
+        )
+        laps.lap("INSURANCE_COMPANY_NAME")
     
     # Customer Name
-    result["CUSTOMER_NAME"] = find_field_by_keywords(
-        text,
-        ["Customer Name", "Insured Name", "Name of Insured", "Policy Holder", 
-         "Insured", "Name", "Customer:", "Insured Name:"]
-    )
-    
-    # Customer Email
-    email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-    email_match = re.search(email_pattern, text, re.IGNORECASE)
-    if email_match:
-        result["CUSTOMER_EMAIL"] = email_match.group(0)
-    else:
-        result["CUSTOMER_EMAIL"] = find_field_by_keywords(
+    if "CUSTOMER_NAME" in wanted:
+        result["CUSTOMER_NAME"] = find_field_by_keywords(
             text,
-            ["Email", "E-mail", "Email ID", "Email Address"]
+            FIELD_KEYWORDS["CUSTOMER_NAME"],
+            labels=labels
         )
+        laps.lap("CUSTOMER_NAME")
+    
+    # Customer Email
+    if "CUSTOMER_EMAIL" in wanted:
+        email_match = _EMAIL.search(text)
+        if email_match:
+            result["CUSTOMER_EMAIL"] = email_match.group(0)
+        else:
+            result["CUSTOMER_EMAIL"] = find_field_by_keywords(
+                text,
+                FIELD_KEYWORDS["CUSTOMER_EMAIL"],
+                labels=labels
+            )
+        laps.lap("CUSTOMER_EMAIL")
     
     # Mobile Number
-    mobile_pattern = r"(\+91[\s\-]?)?[6-9]\d{9}"
-    mobile_match = re.search(mobile_pattern, text)
-    if mobile_match:
-        result["MOB_NO"] = re.sub(r"[\s\-]", "", mobile_match.group(0))
-    else:
-        result["MOB_NO"] = find_field_by_keywords(
-            text,
-            ["Mobile", "Phone", "Contact", "Mobile No", "Phone No", "Mob No"],
-            value_pattern=r"[\d\s\+\-]+"
-        )
+    if "MOB_NO" in wanted:
+        mobile_match = _MOBILE.search(text)
+        if mobile_match:
+            result["MOB_NO"] = _MOBILE_SEPARATORS.sub("", mobile_match.group(0))
+        else:
+            result["MOB_NO"] = find_field_by_keywords(
+                text,
+                FIELD_KEYWORDS["MOB_NO"],
+                value_pattern=r"[\d\s\+\-]+",
+                labels=labels
+            )
+        laps.lap("MOB_NO")
     
     # Registration Number
-    reg_pattern = r"[A-Z]{2}\s?[0-9]{1,2}\s?[A-Z]{1,2}\s?[0-9]{4}"
-    reg_match = re.search(reg_pattern, text, re.IGNORECASE)
-    if reg_match:
-        result["REGISTRATION_NUMBER"] = reg_match.group(0).strip()
-    else:
-        result["REGISTRATION_NUMBER"] = find_field_by_keywords(
-            text,
-            ["Registration No", "Reg No", "Vehicle No", "Registration Number", 
-             "Reg. No", "Vehicle Number", "RC No"],
-            value_pattern=r"[A-Z0-9\s]+"
-        )
+    if "REGISTRATION_NUMBER" in wanted:
+        reg_match = _REGISTRATION_NUMBER.search(text)
+        if reg_match:
+            result["REGISTRATION_NUMBER"] = reg_match.group(0).strip()
+        else:
+            result["REGISTRATION_NUMBER"] = find_field_by_keywords(
+                text,
+                FIELD_KEYWORDS["REGISTRATION_NUMBER"],
+                value_pattern=r"[A-Z0-9\s]+",
+                labels=labels
+            )
+        laps.lap("REGISTRATION_NUMBER")
     
     # Chassis Number
-    result["CHASIS_NUMBER"] = find_field_by_keywords(
-        text,
-        ["Chassis No", "Chassis Number", "Chassis", "Chassis No.", "CH No"],
-        value_pattern=r"[A-Z0-9]+"
-    )
+    if "CHASIS_NUMBER" in wanted:
+        result["CHASIS_NUMBER"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["CHASIS_NUMBER"],
+            value_pattern=r"[A-Z0-9]+",
+            labels=labels
+        )
+        laps.lap("CHASIS_NUMBER")
     
     # Engine Number
-    result["ENGINE_NUMBER"] = find_field_by_keywords(
-        text,
-        ["Engine No", "Engine Number", "Engine", "Engine No.", "EN No"],
-        value_pattern=r"[A-Z0-9]+"
-    )
+    if "ENGINE_NUMBER" in wanted:
+        result["ENGINE_NUMBER"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["ENGINE_NUMBER"],
+            value_pattern=r"[A-Z0-9]+",
+            labels=labels
+        )
+        laps.lap("ENGINE_NUMBER")
     
     # Vehicle Make
-    result["VEHICLE_MAKE"] = find_field_by_keywords(
-        text,
-        ["Make", "Vehicle Make", "Manufacturer", "Brand", "Make of Vehicle"]
-    )
+    if "VEHICLE_MAKE" in wanted:
+        result["VEHICLE_MAKE"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["VEHICLE_MAKE"],
+            labels=labels
+        )
+        laps.lap("VEHICLE_MAKE")
     
     # Vehicle Model
-    result["VEHICLE_MODEL"] = find_field_by_keywords(
-        text,
-        ["Model", "Vehicle Model", "Model Name", "Model of Vehicle"]
-    )
+    if "VEHICLE_MODEL" in wanted:
+        result["VEHICLE_MODEL"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["VEHICLE_MODEL"],
+            labels=labels
+        )
+        laps.lap("VEHICLE_MODEL")
     
     # Vehicle Variant
-    result["VEHICLE_VARIANT"] = find_field_by_keywords(
-        text,
-        ["Variant", "Vehicle Variant", "Variant Name"]
-    )
+    if "VEHICLE_VARIANT" in wanted:
+        result["VEHICLE_VARIANT"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["VEHICLE_VARIANT"],
+            labels=labels
+        )
+        laps.lap("VEHICLE_VARIANT")
     
     # Vehicle Sub Type
-    result["VEHICLE_SUB_TYPE"] = find_field_by_keywords(
-        text,
-        ["Sub Type", "Vehicle Sub Type", "Sub-Type", "Type"]
-    )
+    if "VEHICLE_SUB_TYPE" in wanted:
+        result["VEHICLE_SUB_TYPE"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["VEHICLE_SUB_TYPE"],
+            labels=labels
+        )
+        laps.lap("VEHICLE_SUB_TYPE")
     
     # Year of Manufacture
-    year_match = re.search(r"(?:Year|Manufacturing Year|YOM|YOM:)\s*[:=\-]?\s*(\d{4})", text, re.IGNORECASE)
-    if year_match:
-        result["YEAR_OF_MANUFACTURE"] = year_match.group(1)
-    else:
-        # Look for 4-digit years in context
-        year_pattern = r"\b(19|20)\d{2}\b"
-        years = re.findall(year_pattern, text)
-        if years:
-            # Use the most recent reasonable year
-            valid_years = [y for y in years if 1990 <= int(y) <= 2030]
-            if valid_years:
-                result["YEAR_OF_MANUFACTURE"] = max(valid_years)
+    if "YEAR_OF_MANUFACTURE" in wanted:
+        year_match = _LABELLED_YEAR.search(text)
+        if year_match:
+            result["YEAR_OF_MANUFACTURE"] = year_match.group(1)
+        else:
+            # Look for 4-digit years in context
+            years = _YEAR.findall(text)
+            if years:
+                # Use the most recent reasonable year
+                valid_years = [y for y in years if 1990 <= int(y) <= 2030]
+                if valid_years:
+                    result["YEAR_OF_MANUFACTURE"] = max(valid_years)
+        laps.lap("YEAR_OF_MANUFACTURE")
     
     # Registration Date
-    reg_date = find_field_by_keywords(
-        text,
-        ["Registration Date", "Reg Date", "Date of Registration", "Registration"]
-    )
-    result["REGISTRATION_DATE"] = normalize_date(reg_date)
+    if "REGISTRATION_DATE" in wanted:
+        reg_date = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["REGISTRATION_DATE"],
+            labels=labels
+        )
+        result["REGISTRATION_DATE"] = normalize_date(reg_date)
+        laps.lap("REGISTRATION_DATE")
     
     # Policy Issue Date
-    issue_date = find_field_by_keywords(
-        text,
-        ["Policy Issue Date", "Issue Date", "Date of Issue", "Policy Date", 
-         "Issued On", "Policy Issued On"]
-    )
-    result["POLICY_ISSUE_DATE"] = normalize_date(issue_date)
+    if "POLICY_ISSUE_DATE" in wanted:
+        issue_date = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["POLICY_ISSUE_DATE"],
+            labels=labels
+        )
+        result["POLICY_ISSUE_DATE"] = normalize_date(issue_date)
+        laps.lap("POLICY_ISSUE_DATE")
     
     # Risk Start Date
-    risk_start = find_field_by_keywords(
-        text,
-        ["Risk Start Date", "Coverage Start", "Start Date", "From Date", 
-         "Period From", "Coverage From"]
-    )
-    result["RISK_START_DATE"] = normalize_date(risk_start)
+    if "RISK_START_DATE" in wanted:
+        risk_start = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["RISK_START_DATE"],
+            labels=labels
+        )
+        result["RISK_START_DATE"] = normalize_date(risk_start)
+        laps.lap("RISK_START_DATE")
     
     # Risk End Date
-    risk_end = find_field_by_keywords(
-        text,
-        ["Risk End Date", "Coverage End", "End Date", "To Date", 
-         "Period To", "Coverage To", "Expiry Date"]
-    )
-    result["RISK_END_DATE"] = normalize_date(risk_end)
+    if "RISK_END_DATE" in wanted:
+        risk_end = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["RISK_END_DATE"],
+            labels=labels
+        )
+        result["RISK_END_DATE"] = normalize_date(risk_end)
+        laps.lap("RISK_END_DATE")
     
     # OD Expire Date
-    od_expire = find_field_by_keywords(
-        text,
-        ["OD Expire", "OD Expiry", "Own Damage Expiry", "OD Expiry Date"]
-    )
-    result["OD_EXPIRE_DATE"] = normalize_date(od_expire)
+    if "OD_EXPIRE_DATE" in wanted:
+        od_expire = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["OD_EXPIRE_DATE"],
+            labels=labels
+        )
+        result["OD_EXPIRE_DATE"] = normalize_date(od_expire)
+        laps.lap("OD_EXPIRE_DATE")
     
     # Complete Location Address
-    result["COMPLETE_LOCATION_ADDRESS"] = find_field_by_keywords(
-        text,
-        ["Address", "Complete Address", "Location", "Residential Address", 
-         "Permanent Address", "Correspondence Address"],
-        multiline=True
-    )
+    if "COMPLETE_LOCATION_ADDRESS" in wanted:
+        result["COMPLETE_LOCATION_ADDRESS"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["COMPLETE_LOCATION_ADDRESS"],
+            multiline=True,
+            labels=labels
+        )
+        laps.lap("COMPLETE_LOCATION_ADDRESS")
     
     # City Name
-    result["CITY_NAME"] = find_field_by_keywords(
-        text,
-        ["City", "City Name", "City:"]
-    )
+    if "CITY_NAME" in wanted:
+        result["CITY_NAME"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["CITY_NAME"],
+            labels=labels
+        )
+        laps.lap("CITY_NAME")
     
     # State Name
-    result["STATE_NAME"] = find_field_by_keywords(
-        text,
-        ["State", "State Name", "State:"]
-    )
+    if "STATE_NAME" in wanted:
+        result["STATE_NAME"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["STATE_NAME"],
+            labels=labels
+        )
+        laps.lap("STATE_NAME")
     
     # Pincode
-    pincode_match = re.search(r"(?:Pincode|Pin Code|PIN|Pin)\s*[:=\-]?\s*(\d{6})", text, re.IGNORECASE)
-    if pincode_match:
-        result["PINCODE"] = pincode_match.group(1)
-    else:
-        # Look for 6-digit numbers that could be pincodes
-        pincode_pattern = r"\b\d{6}\b"
-        pincodes = re.findall(pincode_pattern, text)
-        if pincodes:
-            # Use the first 6-digit number found (could be refined)
-            result["PINCODE"] = pincodes[0]
+    if "PINCODE" in wanted:
+        pincode_match = _LABELLED_PINCODE.search(text)
+        if pincode_match:
+            result["PINCODE"] = pincode_match.group(1)
+        else:
+            # Look for 6-digit numbers that could be pincodes
+            pincodes = _PINCODE.findall(text)
+            if pincodes:
+                # Use the first 6-digit number found (could be refined)
+                result["PINCODE"] = pincodes[0]
+        laps.lap("PINCODE")
     
     # Fuel Type
-    fuel_types = ["Petrol", "Diesel", "CNG", "LPG", "Electric", "Hybrid"]
-    for fuel in fuel_types:
-        if re.search(rf"\b{fuel}\b", text, re.IGNORECASE):
-            result["FUEL_TYPE"] = fuel
-            break
+    if "FUEL_TYPE" in wanted:
+        for fuel, fuel_pattern in _FUEL_TYPES:
+            # The substring test rules most fuels out before the regex runs
+            if labels.may_contain(fuel.upper()) and fuel_pattern.search(text):
+                result["FUEL_TYPE"] = fuel
+                break
+    
+        if not result["FUEL_TYPE"]:
+            result["FUEL_TYPE"] = find_field_by_keywords(
+                text,
+                FIELD_KEYWORDS["FUEL_TYPE"],
+                labels=labels
+            )
+        laps.lap("FUEL_TYPE")
     
-    if not result["FUEL_TYPE"]:
-        result["FUEL_TYPE"] = find_field_by_keywords(
+    # CV Type (Commercial Vehicle Type)
+    if "CV_TYPE" in wanted:
+        result["CV_TYPE"] = find_field_by_keywords(
             text,
-            ["Fuel Type", "Fuel", "Fuel:"]
+            FIELD_KEYWORDS["CV_TYPE"],
+            labels=labels
         )
-    
-    # CV Type (Commercial Vehicle Type)
-    result["CV_TYPE"] = find_field_by_keywords(
-        text,
-        ["CV Type", "Vehicle Type", "Type of Vehicle", "Commercial Vehicle Type"]
-    )
+        laps.lap("CV_TYPE")
     
     # Cover
-    result["COVER"] = find_field_by_keywords(
-        text,
-        ["Cover", "Coverage", "Cover Type", "Type of Cover"]
-    )
+    if "COVER" in wanted:
+        result["COVER"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["COVER"],
+            labels=labels
+        )
+        laps.lap("COVER")
     
     # IDV / Sum Insured
-    idv_text = find_field_by_keywords(
-        text,
-        ["IDV", "Sum Insured", "Insured Value", "IDV Amount", "Sum Assured"]
-    )
-    result["IDV_SUM_INSURED"] = extract_number(idv_text)
+    if "IDV_SUM_INSURED" in wanted:
+        idv_text = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["IDV_SUM_INSURED"],
+            labels=labels
+        )
+        result["IDV_SUM_INSURED"] = extract_number(idv_text)
+        laps.lap("IDV_SUM_INSURED")
     
     # NCB (No Claim Bonus)
-    ncb_text = find_field_by_keywords(
-        text,
-        ["NCB", "No Claim Bonus", "NCB %", "No Claim Bonus %"]
-    )
-    result["NCB"] = extract_number(ncb_text)
+    if "NCB" in wanted:
+        ncb_text = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["NCB"],
+            labels=labels
+        )
+        result["NCB"] = extract_number(ncb_text)
+        laps.lap("NCB")
     
     # Net Premium
-    net_prem_text = find_field_by_keywords(
-        text,
-        ["Net Premium", "Premium", "Net Premium Amount"]
-    )
-    result["NET_PREMIUM"] = extract_number(net_prem_text)
+    if "NET_PREMIUM" in wanted:
+        net_prem_text = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["NET_PREMIUM"],
+            labels=labels
+        )
+        result["NET_PREMIUM"] = extract_number(net_prem_text)
+        laps.lap("NET_PREMIUM")
     
     # OD Premium (Own Damage Premium)
-    od_prem_text = find_field_by_keywords(
-        text,
-        ["OD Premium", "Own Damage Premium", "OD Premium Amount"]
-    )
-    result["OD_PREMIUM"] = extract_number(od_prem_text)
+    if "OD_PREMIUM" in wanted:
+        od_prem_text = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["OD_PREMIUM"],
+            labels=labels
+        )
+        result["OD_PREMIUM"] = extract_number(od_prem_text)
+        laps.lap("OD_PREMIUM")
     
     # TP Only Premium (Third Party Premium)
-    tp_prem_text = find_field_by_keywords(
-        text,
-        ["TP Premium", "Third Party Premium", "TP Only Premium", "TP Premium Amount"]
-    )
-    result["TP_ONLY_PREMIUM"] = extract_number(tp_prem_text)
+    if "TP_ONLY_PREMIUM" in wanted:
+        tp_prem_text = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["TP_ONLY_PREMIUM"],
+            labels=labels
+        )
+        result["TP_ONLY_PREMIUM"] = extract_number(tp_prem_text)
+        laps.lap("TP_ONLY_PREMIUM")
     
     # Total Premium
-    total_prem_text = find_field_by_keywords(
-        text,
-        ["Total Premium", "Premium Total", "Total Amount", "Grand Total"]
-    )
-    result["TOTAL_PREMIUM"] = extract_number(total_prem_text)
+    if "TOTAL_PREMIUM" in wanted:
+        total_prem_text = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["TOTAL_PREMIUM"],
+            labels=labels
+        )
+        result["TOTAL_PREMIUM"] = extract_number(total_prem_text)
+        laps.lap("TOTAL_PREMIUM")
     
     # GST
-    gst_text = find_field_by_keywords(
-        text,
-        ["GST", "GST Amount", "Goods and Services Tax"]
-    )
-    result["GST"] = extract_number(gst_text)
+    if "GST" in wanted:
+        gst_text = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["GST"],
+            labels=labels
+        )
+        result["GST"] = extract_number(gst_text)
+        laps.lap("GST")
     
     # CGST
-    cgst_text = find_field_by_keywords(
-        text,
-        ["CGST", "CGST Amount", "Central GST"]
-    )
-    result["CGST"] = extract_number(cgst_text)
+    if "CGST" in wanted:
+        cgst_text = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["CGST"],
+            labels=labels
+        )
+        result["CGST"] = extract_number(cgst_text)
+        laps.lap("CGST")
     
     # SGST
-    sgst_text = find_field_by_keywords(
-        text,
-        ["SGST", "SGST Amount", "State GST"]
-    )
-    result["SGST"] = extract_number(sgst_text)
+    if "SGST" in wanted:
+        sgst_text = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["SGST"],
+            labels=labels
+        )
+        result["SGST"] = extract_number(sgst_text)
+        laps.lap("SGST")
     
     # IGST
-    igst_text = find_field_by_keywords(
-        text,
-        ["IGST", "IGST Amount", "Integrated GST"]
-    )
-    result["IGST"] = extract_number(igst_text)
+    if "IGST" in wanted:
+        igst_text = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["IGST"],
+            labels=labels
+        )
+        result["IGST"] = extract_number(igst_text)
+        laps.lap("IGST")
     
     # CC (Cubic Capacity)
-    cc_text = find_field_by_keywords(
-        text,
-        ["CC", "Cubic Capacity", "Engine CC", "CC:"]
-    )
-    result["CC"] = extract_number(cc_text)
+    if "CC" in wanted:
+        cc_text = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["CC"],
+            labels=labels
+        )
+        result["CC"] = extract_number(cc_text)
+        laps.lap("CC")
     
     # GVW (Gross Vehicle Weight)
-    gvw_text = find_field_by_keywords(
-        text,
-        ["GVW", "Gross Vehicle Weight", "GVW:", "Vehicle Weight"]
-    )
-    result["GVW"] = extract_number(gvw_text)
+    if "GVW" in wanted:
+        gvw_text = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["GVW"],
+            labels=labels
+        )
+        result["GVW"] = extract_number(gvw_text)
+        laps.lap("GVW")
     
     # Product Code
-    result["PRODUCT_CODE"] = find_field_by_keywords(
-        text,
-        ["Product Code", "Product", "Product ID", "Code"]
-    )
+    if "PRODUCT_CODE" in wanted:
+        result["PRODUCT_CODE"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["PRODUCT_CODE"],
+            labels=labels
+        )
+        laps.lap("PRODUCT_CODE")
     
     # Broker Name
-    result["BROKER_NAME"] = find_field_by_keywords(
-        text,
-        ["Broker", "Broker Name", "Agent", "Agent Name", "Intermediary"]
-    )
+    if "BROKER_NAME" in wanted:
+        result["BROKER_NAME"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["BROKER_NAME"],
+            labels=labels
+        )
+        laps.lap("BROKER_NAME")
     
     # Financier Name
-    result["FINANCIER_NAME"] = find_field_by_keywords(
-        text,
-        ["Financier", "Financier Name", "Finance Company", "Loan Provider"]
-    )
+    if "FINANCIER_NAME" in wanted:
+        result["FINANCIER_NAME"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["FINANCIER_NAME"],
+            labels=labels
+        )
+        laps.lap("FINANCIER_NAME")
     
     # Nominee Name
-    result["NOMINEE_NAME"] = find_field_by_keywords(
-        text,
-        ["Nominee", "Nominee Name", "Nominee:", "Name of Nominee"],
-        multiline=True
-    )
+    if "NOMINEE_NAME" in wanted:
+        result["NOMINEE_NAME"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["NOMINEE_NAME"],
+            multiline=True,
+            labels=labels
+        )
+        laps.lap("NOMINEE_NAME")
     
     # Nominee Relationship
-    result["NOMINEE_RELATIONSHIP"] = find_field_by_keywords(
-        text,
-        ["Nominee Relationship", "Relationship", "Relation", "Relationship with Nominee"]
-    )
+    if "NOMINEE_RELATIONSHIP" in wanted:
+        result["NOMINEE_RELATIONSHIP"] = find_field_by_keywords(
+            text,
+            FIELD_KEYWORDS["NOMINEE_RELATIONSHIP"],
+            labels=labels
+        )
+        laps.lap("NOMINEE_RELATIONSHIP")
     
     return result
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""
+Per-stage timing and counters for the OCR and extraction pipeline.
+
+Create a Profile and pass it as profile= to ocr_pdf / iter_pdf_pages and
+extract_insurance_fields. Each stage (fitz.open, page.get_text,
+get_pixmap, tesseract, the label scan, every field lookup, ...) records
+wall time, CPU time of the calling thread, call count and bytes, in
+total and per page. Without a profile the pipeline uses NULL_PROFILE,
+whose methods do nothing.
+
+Every enabled profile also adds to process-wide totals, which a metrics
+exporter (e.g. Prometheus) can poll with stage_totals(). The batch, serve
+and API entry points take no profile; they give each document a
+lightweight one (stage counters only) when stage totals are switched on
+with OCR_STAGE_TOTALS=1 or enable_stage_totals().
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+_totals: Dict[str, Dict[str, float]] = {}
+_totals_lock = threading.Lock()
+_stage_totals_enabled = os.environ.get("OCR_STAGE_TOTALS", "").lower() not in ("", "0", "false", "no")
+
+
+def _new_counters() -> Dict[str, float]:
+    return {"calls": 0, "wall": 0.0, "cpu": 0.0, "bytes": 0}
+
+
+def _add(counters: Dict[str, float], wall: float, cpu: float, nbytes: int, calls: int = 1) -> None:
+    counters["calls"] += calls
+    counters["wall"] += wall
+    counters["cpu"] += cpu
+    counters["bytes"] += nbytes
+
+
+def stage_totals() -> Dict[str, Dict[str, float]]:
+    """
+    Return a snapshot of the counters of every stage recorded by any
+    profile in this process since start-up: {stage: {calls, wall, cpu, bytes}}.
+    """
+    with _totals_lock:
+        return {name: dict(counters) for name, counters in _totals.items()}
+
+
+def add_stage_totals(stages: Dict[str, Dict[str, float]]) -> None:
+    """Add the "stages" of a profile's to_dict(), e.g. from a worker process, to the totals."""
+    with _totals_lock:
+        for name, counters in stages.items():
+            _add(_totals.setdefault(name, _new_counters()), counters["wall"], counters["cpu"],
+                 counters["bytes"], counters["calls"])
+
+
+def enable_stage_totals(enabled: bool = True) -> None:
+    """Switch the per-document profiles of the batch, serve and API entry points on or off."""
+    global _stage_totals_enabled
+    _stage_totals_enabled = enabled
+
+
+def stage_totals_enabled() -> bool:
+    return _stage_totals_enabled
+
+
+def service_profile() -> Optional["Profile"]:
+    """
+    A Profile without the per-page breakdown for one document of an entry
+    point, when stage totals are enabled; None otherwise.
+    """
+    return Profile(per_page=False) if _stage_totals_enabled else None
+
+
+class _Stage:
+    """Context manager timing one stage; add_bytes() counts data handled in it."""
+
+    __slots__ = ("profile", "name", "page", "nbytes", "_wall", "_cpu")
+
+    def __init__(self, profile: "Profile", name: str, page: Optional[int]):
+        self.profile = profile
+        self.name = name
+        self.page = page
+        self.nbytes = 0
+
+    def add_bytes(self, nbytes: int) -> None:
+        self.nbytes += nbytes
+
+    def __enter__(self) -> "_Stage":
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.profile.record(self.name, time.perf_counter() - self._wall,
+                            time.thread_time() - self._cpu, self.nbytes, self.page)
+
+
+class _Laps:
+    """Times consecutive sections: each lap(name) records the time since the previous one."""
+
+    __slots__ = ("profile", "prefix", "_wall", "_cpu")
+
+    def __init__(self, profile: "Profile", prefix: str):
+        self.profile = profile
+        self.prefix = prefix
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+
+    def lap(self, name: str) -> None:
+        wall, cpu = time.perf_counter(), time.thread_time()
+        self.profile.record(f"{self.prefix}.{name}", wall - self._wall, cpu - self._cpu)
+        self._wall, self._cpu = wall, cpu
+
+
+class Profile:
+    """
+    Collects counters per stage and, with per_page, per page for one run
+    of the pipeline. Safe to share between threads.
+    """
+
+    enabled = True
+
+    def __init__(self, per_page: bool = True):
+        self.per_page = per_page
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.pages: Dict[int, Dict[str, Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, page: Optional[int] = None) -> _Stage:
+        return _Stage(self, name, page)
+
+    def laps(self, prefix: str) -> _Laps:
+        return _Laps(self, prefix)
+
+    def record(self, name: str, wall: float, cpu: float = 0.0, nbytes: int = 0,
+               page: Optional[int] = None, calls: int = 1) -> None:
+        with self._lock:
+            _add(self.stages.setdefault(name, _new_counters()), wall, cpu, nbytes, calls)
+            if page is not None and self.per_page:
+                page_stages = self.pages.setdefault(page, {})
+                _add(page_stages.setdefault(name, _new_counters()), wall, cpu, nbytes, calls)
+        with _totals_lock:
+            _add(_totals.setdefault(name, _new_counters()), wall, cpu, nbytes, calls)
+
+    def merge(self, data: Optional[dict]) -> None:
+        """
+        Add the to_dict() output of another profile, e.g. one recorded in
+        an OCR pool worker process.
+        """
+        if not data:
+            return
+        for name, counters in data.get("stages", {}).items():
+            self.record(name, counters["wall"], counters["cpu"], counters["bytes"],
+                        calls=counters["calls"])
+        if not self.per_page:
+            return
+        with self._lock:
+            for page, page_stages in data.get("pages", {}).items():
+                target = self.pages.setdefault(int(page), {})
+                for name, counters in page_stages.items():
+                    _add(target.setdefault(name, _new_counters()), counters["wall"],
+                         counters["cpu"], counters["bytes"], counters["calls"])
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "stages": {name: dict(counters) for name, counters in self.stages.items()},
+                "pages": {
+                    page: {name: dict(counters) for name, counters in page_stages.items()}
+                    for page, page_stages in sorted(self.pages.items())
+                },
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def format_report(self) -> str:
+        """Human-readable breakdown of the stages, slowest first."""
+        stages = self.to_dict()["stages"]
+        total_wall = sum(counters["wall"] for counters in stages.values())
+        lines = [f"{'stage':<36} {'calls':>7} {'wall s':>9} {'cpu s':>9} {'%wall':>6} {'MB':>9}"]
+        for name, counters in sorted(stages.items(), key=lambda item: -item[1]["wall"]):
+            share = 100 * counters["wall"] / total_wall if total_wall else 0.0
+            lines.append(
+                f"{name:<36} {counters['calls']:>7} {counters['wall']:>9.3f} {counters['cpu']:>9.3f} "
+                f"{share:>6.1f} {counters['bytes'] / 1e6:>9.2f}"
+            )
+        return "\n".join(lines)
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def add_bytes(self, nbytes: int) -> None:
+        pass
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+class _NullLaps:
+    __slots__ = ()
+
+    def lap(self, name: str) -> None:
+        pass
+
+
+class NullProfile:
+    """Profile stand-in used when instrumentation is off; records nothing."""
+
+    enabled = False
+    _stage = _NullStage()
+    _laps = _NullLaps()
+
+    def stage(self, name: str, page: Optional[int] = None) -> _NullStage:
+        return self._stage
+
+    def laps(self, prefix: str) -> _NullLaps:
+        return self._laps
+
+    def record(self, *args, **kwargs) -> None:
+        pass
+
+    def merge(self, data: Optional[dict]) -> None:
+        pass
+
+
+NULL_PROFILE = NullProfile()
@@ -0,0 +1,177 @@
+"""
+Job storage for the asynchronous extraction API.
+A job moves from "queued" to "running" to "done" or "failed", records
+per-page progress while it runs, and keeps the extracted fields (or the
+error) once it is finished.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+_FINISHED = (JOB_DONE, JOB_FAILED)
+
+# Finished jobs the in-memory store keeps, and for how long (seconds)
+DEFAULT_MAX_FINISHED_JOBS = 1000
+DEFAULT_JOB_TTL = 3600.0
+
+
+def _new_job(job_id: str) -> dict:
+    now = time.time()
+    return {
+        "job_id": job_id,
+        "status": JOB_QUEUED,
+        "pages_done": 0,
+        "pages_total": 0,
+        "result": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+class JobStore(ABC):
+    """
+    Interface of a job store. Implementations must be safe to use from
+    the request threads and the extraction threads at the same time.
+    """
+
+    @abstractmethod
+    def create(self) -> str:
+        """Create a queued job and return its id."""
+
+    @abstractmethod
+    def update(self, job_id: str, **fields) -> None:
+        """Set status, pages_done, pages_total, result and/or error of a job."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return the job as a dict, or None if it does not exist."""
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Jobs kept in a dict; they are lost when the process exits. Finished
+    jobs are dropped ttl seconds after they finish, and the oldest ones
+    once more than max_finished are kept, so that a long-running server
+    does not grow without limit.
+    """
+
+    def __init__(self, max_finished: int = DEFAULT_MAX_FINISHED_JOBS, ttl: float = DEFAULT_JOB_TTL):
+        self.max_finished = max_finished
+        self.ttl = ttl
+        self._jobs: Dict[str, dict] = {}
+        # Ids of finished jobs, oldest first, with the time they finished
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            if len(self._finished) <= self.max_finished and now - finished_at <= self.ttl:
+                break
+            del self._finished[job_id]
+            self._jobs.pop(job_id, None)
+
+    def create(self) -> str:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._expire(time.time())
+            self._jobs[job_id] = _new_job(job_id)
+        return job_id
+
+    def update(self, job_id: str, **fields) -> None:
+        now = time.time()
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields, updated_at=now)
+                if job["status"] in _FINISHED and job_id not in self._finished:
+                    self._finished[job_id] = now
+                    self._expire(now)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            self._expire(time.time())
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Jobs kept in a SQLite database, so results survive restarts and can be
+    read by every process of the web server.
+    """
+
+    _COLUMNS = ("job_id", "status", "pages_done", "pages_total", "result", "error",
+                "created_at", "updated_at")
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+                "pages_done INTEGER NOT NULL, pages_total INTEGER NOT NULL, "
+                "result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def create(self) -> str:
+        job = _new_job(uuid.uuid4().hex)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO jobs ({', '.join(self._COLUMNS)}) VALUES ({', '.join('?' * len(self._COLUMNS))})",
+                [job[column] for column in self._COLUMNS],
+            )
+        return job["job_id"]
+
+    def update(self, job_id: str, **fields) -> None:
+        if "result" in fields and fields["result"] is not None:
+            fields["result"] = json.dumps(fields["result"], ensure_ascii=False)
+        fields["updated_at"] = time.time()
+        unknown = set(fields) - set(self._COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE job_id = ?",
+                [*fields.values(), job_id],
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(self._COLUMNS, row))
+        if job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+
+def open_job_store(setting: str, max_finished: int = DEFAULT_MAX_FINISHED_JOBS,
+                   ttl: float = DEFAULT_JOB_TTL) -> JobStore:
+    """
+    Build a job store from a setting string: "" or "memory" for the
+    in-memory store (keeping at most max_finished finished jobs, for ttl
+    seconds), anything else is the path of a SQLite database.
+    """
+    if not setting or setting == "memory":
+        return InMemoryJobStore(max_finished, ttl)
+    return SQLiteJobStore(Path(setting))
@@ -0,0 +1,98 @@
+"""
+Insurer layout templates for region-restricted OCR.
+
+A template file is JSON of the form:
+
+    {
+      "templates": [
+        {
+          "name": "acme-motor",
+          "match": ["ACME GENERAL INSURANCE"],
+          "zones": {
+            "1": [[36, 90, 560, 420], [36, 600, 560, 780]],
+            "2": [[36, 40, 560, 300]]
+          },
+          "skip_other_pages": false
+        }
+      ]
+    }
+
+"match" strings are looked for (case-insensitively) in the text of the
+first page; the first template with a hit is used. "zones" maps 1-based
+page numbers to the label/value blocks to OCR, as [x0, y0, x1, y1]
+rectangles in PDF points (1/72 inch, origin top-left). Pages without
+zones are OCR'd in full, or skipped when "skip_other_pages" is true.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from field_extractor import FIELD_KEYWORDS, find_field_by_keywords
+
+Zone = Tuple[float, float, float, float]
+
+
+class LayoutTemplate:
+    """Zones to OCR for one insurer's policy layout."""
+
+    def __init__(self, name: str, match: List[str], zones: Dict[int, List[Zone]],
+                 skip_other_pages: bool = False):
+        self.name = name
+        self.match = [text.upper() for text in match]
+        self.zones = zones
+        self.skip_other_pages = skip_other_pages
+
+    def zones_for(self, page_number: int) -> Optional[List[Zone]]:
+        """
+        Return the zones of a page, [] when the page should be skipped, or
+        None when it should be OCR'd in full.
+        """
+        if page_number in self.zones:
+            return self.zones[page_number]
+        return [] if self.skip_other_pages else None
+
+    def __repr__(self) -> str:
+        return f"LayoutTemplate({self.name!r})"
+
+
+def load_templates(path: Path) -> List[LayoutTemplate]:
+    """
+    Load layout templates from a JSON file (see the module docstring).
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    templates = []
+    for entry in data.get("templates", []):
+        zones = {
+            int(page_number): [tuple(float(value) for value in rect) for rect in rects]
+            for page_number, rects in entry.get("zones", {}).items()
+        }
+        for rects in zones.values():
+            for rect in rects:
+                if len(rect) != 4:
+                    raise ValueError(f"Template {entry.get('name')!r}: zones must be [x0, y0, x1, y1]")
+        templates.append(LayoutTemplate(
+            name=entry["name"],
+            match=entry.get("match", []),
+            zones=zones,
+            skip_other_pages=bool(entry.get("skip_other_pages", False)),
+        ))
+    return templates
+
+
+def match_template(first_page_text: str, templates: List[LayoutTemplate]) -> Optional[LayoutTemplate]:
+    """
+    Pick the template for a document from the text of its first page.
+    The INSURANCE_COMPANY_NAME value is checked first, then the whole page.
+    """
+    if not first_page_text or not templates:
+        return None
+    company = find_field_by_keywords(first_page_text, FIELD_KEYWORDS["INSURANCE_COMPANY_NAME"]).upper()
+    page_upper = first_page_text.upper()
+    for haystack in (company, page_upper):
+        if not haystack:
+            continue
+        for template in templates:
+            if any(text in haystack for text in template.match):
+                return template
+    return None
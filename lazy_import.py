@@ -0,0 +1,60 @@
+"""
+Deferred imports of optional, slow-to-import dependencies.
+
+PyMuPDF, NumPy and pytesseract (which pulls in PIL) take a few hundred
+milliseconds to import, which short CLI runs and serverless cold starts
+pay even when they never touch a PDF. A LazyModule stands in for such a
+module: it is imported on first attribute access, and its availability
+is only probed when asked for.
+"""
+
+import importlib
+import threading
+from types import ModuleType
+from typing import Callable, Optional
+
+
+class LazyModule:
+    """
+    Stand-in for an optional module, imported on first use. on_load, if
+    given, is called with the module once it has been imported.
+    """
+
+    def __init__(self, name: str, on_load: Optional[Callable[[ModuleType], None]] = None):
+        self._name = name
+        self._on_load = on_load
+        self._module: Optional[ModuleType] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self) -> Optional[ModuleType]:
+        """Import the module (once) and return it, or None if it is not installed."""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    try:
+                        module = importlib.import_module(self._name)
+                    except ImportError:
+                        module = None
+                    if module is not None and self._on_load is not None:
+                        self._on_load(module)
+                    self._module = module
+                    self._loaded = True
+        return self._module
+
+    @property
+    def available(self) -> bool:
+        return self.load() is not None
+
+    def __getattr__(self, attribute: str):
+        # Private names are our own attributes (e.g. while unpickling), never the module's
+        if attribute.startswith("_"):
+            raise AttributeError(attribute)
+        module = self.load()
+        if module is None:
+            raise ImportError(f"{self._name} is not installed")
+        return getattr(module, attribute)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._loaded else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
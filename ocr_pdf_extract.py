@@ -1,55 +1,217 @@
+import sys
+
+__version__ = "0.1.0"
+
+# Answer `ocr_pdf_extract.py --version` before importing anything else
+if __name__ == "__main__" and sys.argv[1:] in (["--version"], ["-V"]):
+    print(f"ocr_pdf_extract {__version__}")
+    sys.exit(0)
+
 import argparse                     
+import concurrent.futures
+import difflib
+import glob
+import hashlib
+import json
+import os
+import queue
 import re
+import shlex
+import sqlite3
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
 from pathlib import Path
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from boilerplate_index import (DEFAULT_MAX_DISTANCE, BoilerplateIndex, BoilerplatePage, fingerprint_pixels,
+                               load_boilerplate_index)
+from field_extractor import extract_insurance_fields, select_fields
+from instrumentation import NULL_PROFILE, Profile, add_stage_totals, stage_totals_enabled
+from layout_templates import LayoutTemplate, load_templates, match_template
+from lazy_import import LazyModule
+from page_words import PageWords
+from text_store import TextStore, document_hash
 
-# Import dependencies with error handling
-try:
-    import pytesseract
+
+def _configure_pytesseract(module) -> None:
     # Set Tesseract path based on environment (Windows vs Linux/Vercel)
     if os.name == "nt":  # Windows
-        pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+        module.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
     # On Linux/Vercel, Tesseract should be in PATH, so we don't set it explicitly
     # If Tesseract is not found, pytesseract will raise TesseractNotFoundError
-    PYTESSERACT_AVAILABLE = True
-except ImportError:
-    PYTESSERACT_AVAILABLE = False
-    pytesseract = None  # type: ignore
 
-try:
-    import fitz  # PyMuPDF
-    PYMUPDF_AVAILABLE = True
-except ImportError:
-    PYMUPDF_AVAILABLE = False
-    fitz = None  # type: ignore
 
-try:
-    from PIL import Image
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-    Image = None  # type: ignore
+# Optional dependencies, imported on first use so that starting the CLI or
+# the API does not pay for them
+pytesseract = LazyModule("pytesseract", on_load=_configure_pytesseract)
+fitz = LazyModule("fitz")  # PyMuPDF
+tesserocr = LazyModule("tesserocr")  # in-process tesseract C-API binding, optional
+np = LazyModule("numpy")  # only for blank pages, boilerplate fingerprints and word boxes
+
+# Module attributes resolved on first access: PYTESSERACT_AVAILABLE etc.
+_AVAILABILITY_FLAGS = {
+    "PYTESSERACT_AVAILABLE": pytesseract,
+    "PYMUPDF_AVAILABLE": fitz,
+    "TESSEROCR_AVAILABLE": tesserocr,
+}
+
 
+def __getattr__(name: str):
+    if name in _AVAILABILITY_FLAGS:
+        return _AVAILABILITY_FLAGS[name].available
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def ocr_page(page, dpi: int = 200) -> str:
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "ocr_pdf_extract"
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+class OCRCache:
     """
-    Render a single PDF page to an image and run OCR on it.
+    On-disk cache of page OCR text, keyed by a hash of the rendered page
+    pixels plus the DPI and tesseract language/config.
+    Entries are small text files; once the cache grows past max_bytes the
+    least recently used entries (oldest mtime, refreshed on every hit) are
+    evicted.
     """
-    if not PYMUPDF_AVAILABLE:
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def key(pixels: bytes, dpi: int, lang: str, config: str) -> str:
+        digest = hashlib.sha256(f"{dpi}\0{lang}\0{config}\0".encode("utf-8"))
+        digest.update(pixels)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.txt"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+            os.utime(path)  # mark as recently used
+        except OSError:
+            return None
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        path = self._path(key)
+        data = text.encode("utf-8")
+        # An entry that is replaced no longer counts towards the size
+        try:
+            replaced_size = path.stat().st_size
+        except OSError:
+            replaced_size = 0
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial entry
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += len(data) - replaced_size
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _entries(self):
+        for path in self.cache_dir.glob("*/*.txt"):
+            try:
+                yield path, path.stat()
+            except OSError:
+                continue
+
+    def _scan_size(self) -> int:
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def _evict(self) -> None:
+        # Drop least recently used entries until the cache is back under 90% of its cap
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        size = sum(stat.st_size for _, stat in entries)
+        target = self.max_bytes * 0.9
+        for path, stat in entries:
+            if size <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            size -= stat.st_size
+        self._size = size
+
+
+DEFAULT_MIN_CONFIDENCE = 80.0
+
+
+def _open_pdf(source: Union[Path, bytes]):
+    """Open a PDF from its path, or from its bytes in memory (no temporary file)."""
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+def _check_ocr_dependencies() -> None:
+    if not fitz.available:
         raise RuntimeError("PyMuPDF (fitz) is not available. Please install it: pip install PyMuPDF")
-    if not PIL_AVAILABLE:
-        raise RuntimeError("Pillow (PIL) is not available. Please install it: pip install Pillow")
-    if not PYTESSERACT_AVAILABLE:
+    if not pytesseract.available:
         raise RuntimeError("pytesseract is not available. Please install it: pip install pytesseract")
-    
-    # PyMuPDF uses a matrix to control resolution; 72 dpi is 1.0
+
+
+def _render_page(page, dpi: int, clip=None):
+    # PyMuPDF uses a matrix to control resolution; 72 dpi is 1.0.
+    # Render straight to 8-bit grayscale: tesseract binarizes a gray image
+    # anyway, and it is a third of the size of RGB.
     zoom = dpi / 72.0
     mat = fitz.Matrix(zoom, zoom)
-    pix = page.get_pixmap(matrix=mat, alpha=False)
+    return page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False, clip=clip)
+
+
+# Rough multiple of a page's rendered pixmap held while it is OCR'd: the
+# pixmap, its PGM copy for tesseract and tesseract's own image
+PAGE_MEMORY_FACTOR = 3
+
+
+def _page_memory(page, dpi: int) -> int:
+    """Estimated peak bytes of OCRing page at dpi, for --max-memory."""
+    zoom = dpi / 72.0
+    return int(page.rect.width * zoom * page.rect.height * zoom) * PAGE_MEMORY_FACTOR
+
 
-    image = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+def _release_page_memory() -> None:
+    # MuPDF keeps decoded images and fonts in its resource store (up to
+    # 256 MB), which grows with every page of a long scanned document
+    fitz.TOOLS.store_shrink(100)
+
+
+def _pixmap_buffer(pix):
+    # samples_mv is a view on the pixmap memory; older PyMuPDF only has the bytes copy
+    samples = getattr(pix, "samples_mv", None)
+    return samples if samples is not None else pix.samples
+
+
+def _run_tesseract(image_bytes: bytes, lang: str, config: str, output_format: str = "") -> str:
+    """
+    Feed an encoded image (here a PGM) to the tesseract CLI over stdin and
+    return its stdout, skipping pytesseract's temporary PNG round trip.
+    Failures are raised as RuntimeErrors.
+    """
+    command = [pytesseract.pytesseract.tesseract_cmd, "stdin", "stdout", "-l", lang]
+    command += shlex.split(config)
+    if output_format:
+        command.append(output_format)
     try:
-        text = pytesseract.image_to_string(image)
-    except pytesseract.TesseractNotFoundError:  # type: ignore
+        result = subprocess.run(command, input=image_bytes, capture_output=True)
+    except FileNotFoundError:
         raise RuntimeError(
             "Tesseract OCR is not installed or not found in PATH. "
             "Please install Tesseract OCR on your system. "
@@ -57,90 +219,1614 @@ def ocr_page(page, dpi: int = 200) -> str:
         )
     except Exception as e:
         raise RuntimeError(f"OCR failed: {e}")
+    if result.returncode != 0:
+        error = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"OCR failed: {error}")
+    return result.stdout.decode("utf-8", errors="replace")
+
+
+TSV_HEADER = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext"
+
+# Number of warm engines kept per language/config in each process
+ENGINE_POOL_SIZE = int(os.environ.get("OCR_ENGINE_POOL_SIZE", "1"))
+
+
+def _engine_settings(config: str) -> Tuple[Optional[int], Dict[str, str]]:
+    """
+    Translate a tesseract CLI config string into a page segmentation mode
+    and -c variables for the C API. Raises ValueError for other options.
+    """
+    tokens = shlex.split(config)
+    psm = None
+    variables: Dict[str, str] = {}
+    while tokens:
+        token = tokens.pop(0)
+        if token == "--psm" and tokens:
+            psm = int(tokens.pop(0))
+        elif token == "-c" and tokens and "=" in tokens[0]:
+            name, value = tokens.pop(0).split("=", 1)
+            variables[name] = value
+        else:
+            raise ValueError(f"unsupported option for the tesseract engine pool: {token}")
+    return psm, variables
+
+
+class TesseractEnginePool:
+    """
+    Long-lived tesseract instances (tesserocr PyTessBaseAPI) that keep the
+    language model loaded between pages, instead of starting a tesseract
+    process per page. Up to size engines are created on demand; a thread
+    borrows one for a single page, and tesserocr releases the GIL while
+    it recognizes.
+    """
+
+    def __init__(self, lang: str = "eng", config: str = "", size: Optional[int] = None):
+        self.lang = lang
+        self.psm, self.variables = _engine_settings(config)
+        self.size = max(1, ENGINE_POOL_SIZE if size is None else size)
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _new_engine(self):
+        engine = tesserocr.PyTessBaseAPI(lang=self.lang)
+        if self.psm is not None:
+            engine.SetPageSegMode(self.psm)
+        for name, value in self.variables.items():
+            engine.SetVariable(name, value)
+        return engine
+
+    def _borrow(self):
+        with self._lock:
+            if self._idle.empty() and self._created < self.size:
+                self._created += 1
+                try:
+                    return self._new_engine()
+                except Exception:
+                    self._created -= 1
+                    raise
+        return self._idle.get()
+
+    def recognize(self, pix, output_format: str = "") -> str:
+        """
+        OCR a grayscale pixmap and return plain text, or TSV (with header)
+        when output_format is "tsv".
+        """
+        engine = self._borrow()
+        try:
+            engine.SetImageBytes(pix.samples, pix.width, pix.height, pix.n, pix.stride)
+            if output_format == "tsv":
+                return TSV_HEADER + "\n" + engine.GetTSVText(0)
+            return engine.GetUTF8Text()
+        finally:
+            # Drop the page image but keep the loaded model
+            engine.Clear()
+            self._idle.put(engine)
+
+
+_engine_pools: Dict[Tuple[str, str], Optional[TesseractEnginePool]] = {}
+_engine_pools_lock = threading.Lock()
+
+
+def get_engine_pool(lang: str = "eng", config: str = "") -> Optional[TesseractEnginePool]:
+    """
+    Return this process's engine pool for lang/config, or None when
+    tesserocr is not installed or the config needs the tesseract CLI.
+    """
+    if not tesserocr.available:
+        return None
+    key = (lang, config)
+    with _engine_pools_lock:
+        if key not in _engine_pools:
+            try:
+                _engine_pools[key] = TesseractEnginePool(lang, config)
+            except ValueError:
+                _engine_pools[key] = None
+        return _engine_pools[key]
+
+
+def _recognize(pix, lang: str, config: str, output_format: str = "") -> str:
+    """
+    OCR a rendered pixmap on a warm engine when possible, otherwise with
+    a tesseract process. Failures are raised as RuntimeErrors.
+    """
+    engine_pool = get_engine_pool(lang, config)
+    if engine_pool is None:
+        return _run_tesseract(pix.tobytes("pgm"), lang, config, output_format)
+    try:
+        return engine_pool.recognize(pix, output_format)
+    except Exception as e:
+        raise RuntimeError(f"OCR failed: {e}")
+
+
+def _render_page_profiled(page, dpi: int, profile, clip=None):
+    with profile.stage("render", page.number + 1) as stage:
+        pix = _render_page(page, dpi, clip=clip)
+        stage.add_bytes(pix.stride * pix.height)
+    return pix
+
+
+def _recognize_profiled(pix, lang: str, config: str, profile, page_number: int,
+                        output_format: str = "") -> str:
+    with profile.stage("tesseract", page_number) as stage:
+        stage.add_bytes(pix.stride * pix.height)
+        return _recognize(pix, lang, config, output_format)
+
+
+def _ocr_pixmap(pix, dpi: int, lang: str, config: str, cache: Optional[OCRCache],
+                profile=NULL_PROFILE, page_number: Optional[int] = None,
+                output_format: str = "") -> str:
+    cache_key = None
+    if cache is not None:
+        with profile.stage("cache_get", page_number):
+            cache_config = f"{config}\0{output_format}" if output_format else config
+            cache_key = cache.key(_pixmap_buffer(pix), dpi, lang, cache_config)
+            cached_text = cache.get(cache_key)
+        if cached_text is not None:
+            return cached_text
+
+    text = _recognize_profiled(pix, lang, config, profile, page_number, output_format)
+
+    if cache is not None:
+        with profile.stage("cache_put", page_number):
+            cache.put(cache_key, text)
     return text
 
 
-def extract_text_from_pdf(input_path: Path) -> str:
+def ocr_page(page, dpi: int = 200, lang: str = "eng", config: str = "",
+             cache: Optional[OCRCache] = None, clips: Optional[list] = None,
+             profile=None) -> str:
     """
-    Extract text directly from PDF (if it has text layers).
-    This works without OCR and is much faster.
+    Render a single PDF page to an image and run OCR on it.
+    With a cache, pages whose rendered pixels were OCR'd before with the
+    same settings are answered from it without running tesseract.
+    With clips (rectangles in PDF points), only those regions are rendered
+    and OCR'd, and their texts are joined in the given order.
+    """
+    _check_ocr_dependencies()
+    return _ocr_page(page, dpi, lang, config, cache, clips, profile)
+
+
+def _ocr_page(page, dpi: int, lang: str = "eng", config: str = "",
+              cache: Optional[OCRCache] = None, clips: Optional[list] = None,
+              profile=None) -> str:
+    # ocr_page without the dependency check, for callers that did it once per document
+    profile = profile or NULL_PROFILE
+    page_number = page.number + 1
+
+    if clips:
+        return "\n".join(
+            _ocr_pixmap(_render_page_profiled(page, dpi, profile, clip=fitz.Rect(clip)),
+                        dpi, lang, config, cache, profile, page_number)
+            for clip in clips
+        )
+    return _ocr_pixmap(_render_page_profiled(page, dpi, profile), dpi, lang, config, cache,
+                       profile, page_number)
+
+
+def _parse_tesseract_tsv(tsv: str) -> dict:
+    """
+    Parse tesseract's TSV output into columns, like pytesseract's
+    image_to_data(output_type=Output.DICT).
+    """
+    rows = tsv.splitlines()
+    if not rows:
+        return {"text": [], "conf": [], "block_num": [], "par_num": [], "line_num": []}
+    header = rows[0].split("\t")
+    columns: dict = {name: [] for name in header}
+    for row in rows[1:]:
+        cells = row.split("\t")
+        if len(cells) < len(header):
+            cells += [""] * (len(header) - len(cells))
+        for name, cell in zip(header, cells):
+            columns[name].append(cell)
+    return columns
+
+
+def _text_and_confidence(data: dict) -> Tuple[str, float]:
+    """
+    Rebuild page text from tesseract TSV columns (one line per line, a
+    blank line between paragraphs) and return it with the mean word
+    confidence (0 when no words were found).
+    """
+    lines: List[str] = []
+    confidences: List[float] = []
+    current_line = None
+    current_paragraph = None
+    for index, word in enumerate(data["text"]):
+        confidence = float(data["conf"][index])
+        if confidence < 0 or not word.strip():
+            continue
+        confidences.append(confidence)
+        paragraph = (data["block_num"][index], data["par_num"][index])
+        line = paragraph + (data["line_num"][index],)
+        if line != current_line:
+            if current_paragraph is not None and paragraph != current_paragraph:
+                lines.append("")
+            lines.append(word)
+            current_line, current_paragraph = line, paragraph
+        else:
+            lines[-1] += " " + word
+    if not confidences:
+        return "", 0.0
+    return "\n".join(lines) + "\n", sum(confidences) / len(confidences)
+
+
+def ocr_page_adaptive(page, dpi: int = 200, low_dpi: int = 100,
+                      min_confidence: float = DEFAULT_MIN_CONFIDENCE, lang: str = "eng",
+                      config: str = "", cache: Optional[OCRCache] = None,
+                      profile=None) -> Tuple[str, int]:
+    """
+    OCR a page at low_dpi first and re-render it at dpi only when the mean
+    tesseract word confidence is below min_confidence (or no words were
+    found). Returns the text and the DPI it was read at.
+    """
+    _check_ocr_dependencies()
+    return _ocr_page_adaptive(page, dpi, low_dpi, min_confidence, lang, config, cache, profile)
+
+
+def _ocr_page_adaptive(page, dpi: int, low_dpi: int, min_confidence: float, lang: str = "eng",
+                       config: str = "", cache: Optional[OCRCache] = None,
+                       profile=None) -> Tuple[str, int]:
+    profile = profile or NULL_PROFILE
+    page_number = page.number + 1
+
+    pix = _render_page_profiled(page, low_dpi, profile)
+
+    # The decision is cached against the low-resolution render
+    cache_key = None
+    if cache is not None:
+        with profile.stage("cache_get", page_number):
+            cache_key = cache.key(_pixmap_buffer(pix), low_dpi, lang,
+                                  f"{config}\0adaptive:{dpi}:{min_confidence}")
+            cached = cache.get(cache_key)
+        if cached is not None:
+            entry = json.loads(cached)
+            return entry["text"], entry["dpi"]
+
+    data = _parse_tesseract_tsv(_recognize_profiled(pix, lang, config, profile, page_number, "tsv"))
+    text, confidence = _text_and_confidence(data)
+    used_dpi = low_dpi
+    if confidence < min_confidence:
+        del pix
+        text = _ocr_page(page, dpi, lang, config, cache, profile=profile)
+        used_dpi = dpi
+
+    if cache is not None:
+        with profile.stage("cache_put", page_number):
+            cache.put(cache_key, json.dumps({"text": text, "dpi": used_dpi}))
+    return text, used_dpi
+
+
+def ocr_page_words(page, dpi: int = 200, lang: str = "eng", config: str = "",
+                   cache: Optional[OCRCache] = None, clips: Optional[list] = None,
+                   profile=None) -> PageWords:
+    """
+    OCR a page (or only its clips) and return the words with their boxes
+    in PDF points, line and block ids and confidences, from tesseract's
+    TSV output.
+    """
+    _check_ocr_dependencies()
+    return _ocr_page_words(page, dpi, lang, config, cache, clips, profile)
+
+
+def _ocr_page_words(page, dpi: int, lang: str = "eng", config: str = "",
+                    cache: Optional[OCRCache] = None, clips: Optional[list] = None,
+                    profile=None) -> PageWords:
+    profile = profile or NULL_PROFILE
+    page_number = page.number + 1
+    parts = []
+    for clip in clips or [None]:
+        rect = fitz.Rect(clip) if clip is not None else None
+        pix = _render_page_profiled(page, dpi, profile, clip=rect)
+        tsv = _ocr_pixmap(pix, dpi, lang, config, cache, profile, page_number, "tsv")
+        # Free this clip's pixels before the next one is rendered
+        del pix
+        origin = (rect.x0, rect.y0) if rect is not None else (0.0, 0.0)
+        parts.append(PageWords.from_tesseract(_parse_tesseract_tsv(tsv), 72.0 / dpi, origin))
+    return PageWords.concat(parts)
+
+
+def _ocr_page_with_options(page, dpi: int, cache: Optional[OCRCache], low_dpi: Optional[int],
+                           min_confidence: float, clips: Optional[list] = None,
+                           profile=None, words: bool = False) -> Tuple[str, int, Optional[PageWords]]:
+    if words:
+        ocr_words = _ocr_page_words(page, dpi, cache=cache, clips=clips, profile=profile)
+        return ocr_words.text(), dpi, ocr_words
+    if clips:
+        # Template zones and image regions are small; read them at full resolution
+        return _ocr_page(page, dpi, cache=cache, clips=clips, profile=profile), dpi, None
+    if low_dpi and low_dpi < dpi:
+        return (*_ocr_page_adaptive(page, dpi, low_dpi, min_confidence, cache=cache, profile=profile),
+                None)
+    return _ocr_page(page, dpi, cache=cache, profile=profile), dpi, None
+
+
+# Per-process state of the OCR pool: every worker opens its own document handle
+_worker_doc = None
+_worker_ocr_options: dict = {}
+_worker_profiled = False
+_worker_release_memory = False
+
+
+def _init_ocr_worker(input_path: Union[str, bytes], ocr_options: dict, profiled: bool = False,
+                     release_memory: bool = False) -> None:
+    global _worker_doc, _worker_ocr_options, _worker_profiled, _worker_release_memory
+    # One tesseract thread per worker; the pool already provides the parallelism
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    # Engines inherited from a forked parent are not ours to share
+    _engine_pools.clear()
+    _worker_doc = _open_pdf(input_path)
+    _worker_ocr_options = ocr_options
+    _worker_profiled = profiled
+    _worker_release_memory = release_memory
+
+
+def _ocr_page_in_worker(page_index: int, clips: Optional[list] = None) -> Tuple[str, int, Optional[PageWords],
+                                                                              Optional[dict]]:
+    """
+    OCR one page in a pool worker. When the run is profiled, the worker's
+    counters for the page are returned for the parent to merge.
+    """
+    profile = Profile() if _worker_profiled else None
+    text, dpi, words = _ocr_page_with_options(_worker_doc.load_page(page_index), clips=clips,
+                                              profile=profile, **_worker_ocr_options)
+    if _worker_release_memory:
+        _release_page_memory()
+    return text, dpi, words, profile.to_dict() if profile is not None else None
+
+
+def resolve_workers(workers: int) -> int:
+    """
+    Turn a --workers value into a process count (0 means one per CPU core).
+    """
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+# Values of PageText.source; hybrid pages have a text layer plus OCR'd image regions
+PAGE_SOURCE_DIRECT = "direct"
+PAGE_SOURCE_OCR = "ocr"
+PAGE_SOURCE_HYBRID = "hybrid"
+# A scan with (almost) no ink: not OCR'd, reported with empty text
+PAGE_SOURCE_BLANK = "blank"
+# A scan of a known boilerplate page: not OCR'd, the indexed text is used
+PAGE_SOURCE_BOILERPLATE = "boilerplate"
+
+# Pages carrying images but fewer visible text characters than this (a
+# page number, a watermark) are OCR'd as scans
+MIN_TEXT_CHARS = 20
+# Images smaller than this share of the page (logos, stamps, signatures)
+# are not OCR'd on pages that have a text layer
+MIN_IMAGE_REGION_SHARE = 0.02
+# An image whose area is covered by text-layer words to at least this
+# share already has its text (e.g. a searchable scan) and is not OCR'd
+IMAGE_TEXT_COVERAGE = 0.05
+# Blank-page check: pages to be OCR'd are first rendered at this DPI, and
+# a pixel counts as ink when it is INK_CONTRAST gray levels darker than
+# the page background. Pages with less ink than BLANK_MAX_INK_SHARE of
+# their pixels and a gray-level deviation under BLANK_MAX_STD (blank
+# backs, separator sheets, a signature or stamp) are not OCR'd.
+BLANK_CHECK_DPI = 24
+INK_CONTRAST = 64
+BLANK_MAX_INK_SHARE = 0.001
+BLANK_MAX_STD = 24.0
+# Resolution of the render fingerprinted for the boilerplate index
+FINGERPRINT_DPI = 72
+
+
+class PageClass(NamedTuple):
+    """How to read a page: its source, the text layer read so far, and regions to OCR."""
+    source: str
+    text: str
+    clips: Optional[list] = None
+
+
+def _image_regions(page) -> list:
+    """Rectangles of the images drawn on a page that are big enough to OCR."""
+    # The image list comes from the page resources; only when it is not
+    # empty is the content stream parsed for where the images are drawn
+    if not page.get_images():
+        return []
+    page_rect = page.rect
+    min_area = page_rect.width * page_rect.height * MIN_IMAGE_REGION_SHARE
+    regions = []
+    for info in page.get_image_info():
+        rect = fitz.Rect(info["bbox"]) & page_rect
+        if not rect.is_empty and rect.width * rect.height >= min_area:
+            regions.append(rect)
+    return regions
+
+
+def _uncovered_regions(page, regions: list) -> list:
+    """The image regions that carry (almost) no text-layer words."""
+    words = [fitz.Rect(word[:4]) for word in page.get_text("words")]
+    uncovered = []
+    for region in regions:
+        covered = sum((word & region).get_area() for word in words if word.intersects(region))
+        if covered < region.get_area() * IMAGE_TEXT_COVERAGE:
+            uncovered.append(region)
+    return uncovered
+
+
+def _page_pixels(page, dpi: int):
+    """A grayscale render of a page as a 2-D uint8 NumPy array."""
+    pix = _render_page(page, dpi)
+    pixels = np.frombuffer(_pixmap_buffer(pix), dtype=np.uint8)
+    # Copy out of the pixmap so it can be freed
+    return pixels.reshape(pix.height, pix.stride)[:, :pix.width].copy()
+
+
+def page_ink(page) -> Tuple[float, float]:
+    """
+    Share of ink pixels and standard deviation of the gray levels of a
+    BLANK_CHECK_DPI render of a page (NumPy required).
+    """
+    pixels = _page_pixels(page, BLANK_CHECK_DPI)
+    background = float(np.median(pixels))
+    ink = np.count_nonzero(pixels < background - INK_CONTRAST) / max(pixels.size, 1)
+    return ink, float(pixels.std())
+
+
+def page_fingerprint(page) -> bytes:
+    """
+    Boilerplate fingerprint (dHash, see boilerplate_index) of a
+    FINGERPRINT_DPI render of a page (NumPy required).
+    """
+    return fingerprint_pixels(_page_pixels(page, FINGERPRINT_DPI))
+
+
+def is_blank_page(page) -> bool:
+    """
+    Whether a page without text is blank or nearly so (see
+    BLANK_MAX_INK_SHARE). Always False when NumPy is not installed.
+    """
+    if not np.available:
+        return False
+    ink, deviation = page_ink(page)
+    return ink < BLANK_MAX_INK_SHARE and deviation < BLANK_MAX_STD
+
+
+def classify_page(page, ocr: bool = True, detect_blank: bool = True) -> PageClass:
+    """
+    Decide from cheap PyMuPDF signals whether a page is read directly,
+    OCR'd, or both (hybrid):
+    - no fonts at all: a scan, OCR'd without reading the empty text layer
+    - no visible text, or under MIN_TEXT_CHARS characters over an image: OCR
+    - a text layer plus images that no text lies on: hybrid, where only
+      those image regions are OCR'd (returned as clips in PDF points)
+    - otherwise: direct
+    With detect_blank, pages without any text that is_blank_page finds
+    blank are classed blank instead of OCR (a low-DPI render, 2-5 ms).
+    With ocr=False the text layer is always read and nothing is OCR'd.
+    """
+    if ocr and not page.get_fonts():
+        blank = detect_blank and is_blank_page(page)
+        return PageClass(PAGE_SOURCE_BLANK if blank else PAGE_SOURCE_OCR, "")
+    text = page.get_text()
+    char_count = len("".join(text.split()))
+    if not ocr or char_count == 0:
+        if char_count:
+            return PageClass(PAGE_SOURCE_DIRECT, text)
+        blank = ocr and detect_blank and is_blank_page(page)
+        return PageClass(PAGE_SOURCE_BLANK if blank else PAGE_SOURCE_OCR, text)
+
+    regions = _image_regions(page)
+    if not regions:
+        return PageClass(PAGE_SOURCE_DIRECT, text)
+    if char_count < MIN_TEXT_CHARS:
+        return PageClass(PAGE_SOURCE_OCR, text)
+    uncovered = _uncovered_regions(page, regions)
+    if uncovered:
+        return PageClass(PAGE_SOURCE_HYBRID, text, [tuple(rect) for rect in uncovered])
+    return PageClass(PAGE_SOURCE_DIRECT, text)
+
+
+def _ocr_page_text(page_number: int, source: str, direct_text: str, direct_words: Optional[PageWords],
+                   text: str, dpi: int, words: Optional[PageWords]) -> "PageText":
+    # Hybrid pages put the text layer first, then the OCR'd image regions
+    if source == PAGE_SOURCE_HYBRID:
+        if direct_text and not direct_text.endswith("\n"):
+            direct_text += "\n"
+        text = direct_text + text
+        if words is not None:
+            words = PageWords.concat([direct_words, words])
+    return PageText(page_number, source, text, dpi, words)
+
+
+class PageText(NamedTuple):
+    """
+    Text of one PDF page, where it came from, the DPI it was OCR'd at, and
+    its words with their boxes when iter_pdf_pages ran with words=True.
+    """
+    page_number: int
+    source: str
+    text: str
+    dpi: Optional[int] = None
+    words: Optional[PageWords] = None
+
+
+def format_page(page: PageText) -> str:
+    """
+    Render a page with the header used in the concatenated OCR output.
+    """
+    return f"\n\n===== PAGE {page.page_number} =====\n\n" + page.text
+
+
+def _drain_ready_pages(pending: Deque, block: bool, profile=NULL_PROFILE) -> Iterator[PageText]:
+    """
+    Yield queued pages in page order, stopping at the first OCR job that
+    is still running unless block is True.
     """
-    if not PYMUPDF_AVAILABLE:
+    while pending:
+        entry = pending[0]
+        if not isinstance(entry, PageText):
+            page_number, source, direct_text, direct_words, future = entry
+            if not (block or future.done()):
+                return
+            text, dpi, words, worker_profile = future.result()
+            profile.merge(worker_profile)
+            entry = _ocr_page_text(page_number, source, direct_text, direct_words, text, dpi, words)
+        pending.popleft()
+        yield entry
+
+
+# Resolution of the first-page render used to recognise the insurer
+TEMPLATE_IDENTIFY_DPI = 100
+
+
+def identify_template(doc, templates: List[LayoutTemplate],
+                      cache: Optional[OCRCache] = None) -> Optional[LayoutTemplate]:
+    """
+    Recognise the insurer layout of an open document from its first page:
+    the text layer if it has one, otherwise a quick low-DPI OCR.
+    """
+    if not templates or len(doc) == 0:
+        return None
+    page = doc.load_page(0)
+    text = page.get_text()
+    if not text.strip() and pytesseract.available:
+        text = ocr_page(page, dpi=TEMPLATE_IDENTIFY_DPI, cache=cache)
+    return match_template(text, templates)
+
+
+def iter_pdf_pages(input_path: Union[Path, bytes], dpi: int = 200, fallback_to_direct_extraction: bool = True,
+                   workers: int = 1, ocr: bool = True, cache: Optional[OCRCache] = None,
+                   low_dpi: Optional[int] = None,
+                   min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+                   progress: Optional[Callable[[int, int], None]] = None,
+                   templates: Optional[List[LayoutTemplate]] = None,
+                   profile: Optional[Profile] = None, words: bool = False,
+                   max_memory: Optional[int] = None,
+                   page_order: Optional[Sequence[int]] = None,
+                   skip_blank: bool = True,
+                   boilerplate: Optional[BoilerplateIndex] = None) -> Iterator[PageText]:
+    """
+    Yield PageText(page_number, source, text) for each page of a PDF, as
+    soon as the page is done. Pages with a text layer are read directly,
+    scans are OCR'd, and mixed pages get their text layer plus OCR of
+    their image regions (see classify_page). Closing the generator early
+    stops rendering and OCR of the remaining pages.
+
+    Args:
+        input_path: The PDF, as a path or the file's bytes
+        dpi: Resolution pages are OCR'd at
+        fallback_to_direct_extraction: Skip pages without a text layer
+            when OCR is not available, instead of raising
+        workers: Run OCR on a process pool of this many workers when > 1
+        ocr: If False, pages without a text layer are skipped
+        cache: OCRCache that OCR results are looked up in and saved to
+        low_dpi: OCR adaptively (see ocr_page_adaptive); PageText.dpi
+            reports the DPI used
+        min_confidence: Confidence below which adaptive OCR retries at dpi
+        progress: Called with (pages_done, page_count) as pages finish
+        templates: Layout templates; a recognised insurer only has its
+            template zones OCR'd, unknown layouts get full-page OCR
+        profile: Instrumentation Profile timing every stage per page,
+            pool workers included
+        words: Attach the words with boxes (PageWords) to every page;
+            OCR then runs at dpi, without adaptive DPI
+        max_memory: Budget in bytes; MuPDF's store is emptied after every
+            page and the OCR jobs in flight are limited to what fits
+        page_order: Page numbers to read, in that order
+        skip_blank: Return scans that is_blank_page finds blank with
+            source "blank" and empty text, without OCR
+        boilerplate: BoilerplateIndex; matching scans come back with
+            source "boilerplate" and the indexed text, without OCR (not
+            used with words=True)
+    """
+    if not fitz.available:
         raise RuntimeError("PyMuPDF (fitz) is not available. Please install it: pip install PyMuPDF")
     
-    doc = fitz.open(input_path)
-    texts = []
+    if ocr and not pytesseract.available:
+        if fallback_to_direct_extraction:
+            ocr = False
+        else:
+            raise RuntimeError(
+                "OCR dependencies not available. Install pytesseract, "
+                "or use fallback_to_direct_extraction=True to extract text directly from PDF."
+            )
+    if (words or boilerplate is not None) and not np.available:
+        raise RuntimeError("NumPy is not available. Please install it: pip install numpy")
+    if words:
+        boilerplate = None
     
+    workers = resolve_workers(workers)
+    ocr_options = {"dpi": dpi, "cache": cache, "low_dpi": low_dpi, "min_confidence": min_confidence,
+                   "words": words}
+    profile = profile or NULL_PROFILE
+    with profile.stage("open") as stage:
+        doc = _open_pdf(input_path)
+        if profile.enabled:
+            in_memory = isinstance(input_path, (bytes, bytearray))
+            stage.add_bytes(len(input_path) if in_memory else os.path.getsize(input_path))
+    pool = None
+    if page_order is None:
+        order = list(range(len(doc)))
+    else:
+        order = [page_number - 1 for page_number in page_order]
+        document_pages = len(doc)
+        if any(not 0 <= page_index < document_pages for page_index in order):
+            doc.close()
+            raise ValueError(f"page_order has pages outside 1-{document_pages}")
+    # progress reports how many pages of the order are done
+    page_count = len(order)
+    positions = {page_index + 1: position for position, page_index in enumerate(order)}
+    template = identify_template(doc, templates, cache=cache) if ocr and templates else None
+    # Finished pages and running OCR jobs, in reading order
+    pending: Deque = deque()
+
+    def release_ready_pages(block: bool) -> Iterator[PageText]:
+        for ready_page in _drain_ready_pages(pending, block, profile):
+            if progress is not None:
+                progress(positions[ready_page.page_number] + 1, page_count)
+            yield ready_page
+
     try:
-        for page_index in range(len(doc)):
+        for position, page_index in enumerate(order):
+            if max_memory is not None:
+                _release_page_memory()
             page = doc.load_page(page_index)
-            # Try to extract text directly (works for PDFs with text layers)
-            page_text = page.get_text()
-            if page_text.strip():  # If we got text, use it
-                header = f"\n\n===== PAGE {page_index + 1} =====\n\n"
-                texts.append(header + page_text)
+            # Read the text layer when there is one (faster, works for text-based PDFs)
+            with profile.stage("classify", page_index + 1) as stage:
+                page_class = classify_page(page, ocr, detect_blank=skip_blank)
+                stage.add_bytes(len(page_class.text))
+            source, direct_text = page_class.source, page_class.text
+            direct_words = PageWords.from_text_layer(page) if words and source != PAGE_SOURCE_OCR else None
+            if source == PAGE_SOURCE_HYBRID:
+                # Text layer plus the images no text lies on
+                clips = page_class.clips
+            else:
+                clips = template.zones_for(page_index + 1) if template is not None else None
+            if source == PAGE_SOURCE_OCR and ocr and boilerplate:
+                with profile.stage("fingerprint", page_index + 1):
+                    known_page = boilerplate.match(page_fingerprint(page))
+                if known_page is not None:
+                    source, direct_text = PAGE_SOURCE_BOILERPLATE, known_page.text
+            if source in (PAGE_SOURCE_DIRECT, PAGE_SOURCE_BLANK, PAGE_SOURCE_BOILERPLATE):
+                # PDF has text layer, use it directly (blank pages have nothing to read)
+                pending.append(PageText(page_index + 1, source, direct_text, words=direct_words))
+                yield from release_ready_pages(block=False)
+                continue
+            if not ocr or clips == []:
+                if progress is not None and not pending:
+                    progress(position + 1, page_count)
+                continue
+            if workers > 1:
+                # OCR it on the pool
+                if pool is None:
+                    # concurrent.futures imports its process pool module on first use
+                    pool = concurrent.futures.ProcessPoolExecutor(
+                        max_workers=workers,
+                        initializer=_init_ocr_worker,
+                        initargs=(input_path if isinstance(input_path, (bytes, bytearray)) else str(input_path),
+                                  ocr_options, profile.enabled, max_memory is not None),
+                    )
+                # Keep the pool busy without queueing the whole document, so closing
+                # the generator early leaves little OCR behind. Wait for the
+                # oldest job (always first in pending) until this page fits.
+                in_flight = 2 * workers
+                if max_memory is not None:
+                    in_flight = max(1, min(in_flight, max_memory // _page_memory(page, dpi)))
+                while sum(not isinstance(entry, PageText) for entry in pending) >= in_flight:
+                    wait([pending[0][-1]])
+                    yield from release_ready_pages(block=False)
+                pending.append((page_index + 1, source, direct_text, direct_words,
+                                pool.submit(_ocr_page_in_worker, page_index, clips)))
+            else:
+                text, used_dpi, ocr_words = _ocr_page_with_options(page, clips=clips, profile=profile,
+                                                                   **ocr_options)
+                pending.append(_ocr_page_text(page_index + 1, source, direct_text, direct_words,
+                                              text, used_dpi, ocr_words))
+            yield from release_ready_pages(block=False)
+        yield from release_ready_pages(block=True)
+        if progress is not None:
+            progress(page_count, page_count)
     finally:
         doc.close()
-    
-    return "".join(texts)
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
 
 
-def ocr_pdf(input_path: Path, dpi: int = 200, fallback_to_direct_extraction: bool = True) -> str:
+def extract_text_from_pdf(input_path: Path) -> str:
+    """
+    Extract text directly from PDF (if it has text layers).
+    This works without OCR and is much faster.
+    """
+    return "".join(format_page(page) for page in iter_pdf_pages(input_path, ocr=False))
+
+
+def ocr_pdf(input_path: Union[Path, bytes], dpi: int = 200, fallback_to_direct_extraction: bool = True,
+            workers: int = 1, cache: Optional[OCRCache] = None, low_dpi: Optional[int] = None,
+            min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+            progress: Optional[Callable[[int, int], None]] = None,
+            templates: Optional[List[LayoutTemplate]] = None,
+            profile: Optional[Profile] = None, max_memory: Optional[int] = None) -> str:
     """
     Run OCR over all pages in a PDF and return the concatenated text.
     If OCR is not available and fallback_to_direct_extraction is True,
     tries to extract text directly from PDF (works for PDFs with text layers).
+    With workers > 1 (or 0 for one per CPU core), pages that need OCR are
+    sent to a process pool and their text is put back in page order.
+    Use iter_pdf_pages to consume pages as they finish (with max_memory,
+    see iter_pdf_pages).
+    """
+    return "".join(
+        format_page(page)
+        for page in iter_pdf_pages(input_path, dpi=dpi, workers=workers, cache=cache,
+                                   fallback_to_direct_extraction=fallback_to_direct_extraction,
+                                   low_dpi=low_dpi, min_confidence=min_confidence,
+                                   progress=progress, templates=templates, profile=profile,
+                                   max_memory=max_memory)
+    )
+
+
+# Scanned pages in a row that may add no field before extract_fields_early stops
+EARLY_EXIT_PATIENCE = 3
+
+
+def _schedule_page_order(input_path: Union[Path, bytes], ocr: bool = True) -> Tuple[List[int], int]:
     """
-    if not PYMUPDF_AVAILABLE:
+    Page numbers of a PDF in the order extract_fields_early reads them,
+    and how many come first because classify_page reads them directly
+    (without OCR). A scan with a text stamp (page number, watermark,
+    Bates label) has fonts but is still OCR'd, so it is not among them.
+    The other pages follow front to back, since the policy schedule
+    comes before the terms and conditions.
+    """
+    with _open_pdf(input_path) as doc:
+        direct = [classify_page(page, ocr=ocr, detect_blank=False).source == PAGE_SOURCE_DIRECT
+                  for page in doc]
+    direct_pages = [index + 1 for index, is_direct in enumerate(direct) if is_direct]
+    other_pages = [index + 1 for index, is_direct in enumerate(direct) if not is_direct]
+    return direct_pages + other_pages, len(direct_pages)
+
+
+def fields_of_pages(pages: List[PageText], fields: Optional[Iterable[str]] = None,
+                    profile: Optional[Profile] = None) -> Dict[str, str]:
+    """
+    Extract the insurance fields of pages read by iter_pdf_pages (sorted
+    into page order in place). Pages read with words=True are also
+    searched by layout (see extract_insurance_fields).
+    """
+    pages.sort(key=lambda page: page.page_number)
+    page_words = [page.words for page in pages if page.words is not None]
+    return extract_insurance_fields("".join(format_page(page) for page in pages), profile=profile,
+                                    fields=fields, page_words=page_words)
+
+
+def extract_fields_early(input_path: Union[Path, bytes], page_budget: Optional[int] = None,
+                         patience: Optional[int] = EARLY_EXIT_PATIENCE,
+                         fields: Optional[Iterable[str]] = None,
+                         **page_options) -> Tuple[Dict[str, str], List[PageText], int]:
+    """
+    Extract the insurance fields of a PDF while OCRing as few pages as
+    possible. Pages read from their text layer come first, then the
+    others front to back, and the fields are extracted again from the
+    pages read so far (joined in page order, so every value is the one a
+    full run over those pages finds). After every OCR'd page and after
+    the text-layer pages, reading stops as soon as every field has a
+    value, page_budget pages have been OCR'd, or patience OCR'd pages in
+    a row added no field; the remaining pages are never rendered. With
+    fields, only those keys are extracted and waited for. page_options
+    are passed to iter_pdf_pages.
+    Returns the fields, the pages read (in page order) and the page count
+    of the document.
+    """
+    if not fitz.available:
         raise RuntimeError("PyMuPDF (fitz) is not available. Please install it: pip install PyMuPDF")
-    
-    # If OCR dependencies are not available, try direct text extraction
-    if not (PYTESSERACT_AVAILABLE and PIL_AVAILABLE):
-        if fallback_to_direct_extraction:
-            return extract_text_from_pdf(input_path)
+    wanted = select_fields(fields)
+    order, text_pages = _schedule_page_order(input_path, page_options.get("ocr", True))
+    pages: List[PageText] = []
+    found: Optional[Dict[str, str]] = None
+    resolved = ocr_pages = idle_pages = 0
+    page_iter = iter_pdf_pages(input_path, page_order=order, **page_options)
+    try:
+        for page in page_iter:
+            pages.append(page)
+            ocr_done = page.source in (PAGE_SOURCE_OCR, PAGE_SOURCE_HYBRID)
+            ocr_pages += ocr_done
+            if len(pages) < text_pages and not ocr_done:
+                continue
+            found = fields_of_pages(pages, wanted, page_options.get("profile"))
+            now_resolved = sum(1 for value in found.values() if value)
+            # Only a new field resets the patience; pages that were not OCR'd
+            # (text layer, blank, boilerplate) neither count nor reset it
+            if now_resolved > resolved:
+                idle_pages = 0
+            elif ocr_done:
+                idle_pages += 1
+            resolved = now_resolved
+            if (resolved == len(wanted)
+                    or (page_budget is not None and ocr_pages >= page_budget)
+                    or (patience and idle_pages >= patience)):
+                break
+    finally:
+        page_iter.close()
+    if found is None:
+        found = fields_of_pages(pages, wanted, page_options.get("profile"))
+    return found, pages, len(order)
+
+
+def collect_batch_inputs(source: str) -> List[Path]:
+    """
+    Resolve a batch source to a sorted list of PDFs. The source can be a
+    directory (searched recursively), a glob pattern, or a manifest file
+    listing one PDF path per line (relative paths are resolved against the
+    manifest's directory; blank lines and # comments are ignored).
+    """
+    source_path = Path(source)
+    if source_path.is_dir():
+        return sorted(path for path in source_path.rglob("*") if path.suffix.lower() == ".pdf")
+    if source_path.is_file() and source_path.suffix.lower() != ".pdf":
+        paths = []
+        for line in source_path.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                path = Path(line)
+                paths.append(path if path.is_absolute() else source_path.parent / path)
+        return paths
+    if source_path.is_file():
+        return [source_path]
+    return sorted(Path(path) for path in glob.glob(source, recursive=True))
+
+
+def _read_finished_paths(results_path: Path) -> set:
+    """
+    Return the documents already recorded in a batch results file, so an
+    interrupted run can resume. A truncated last line is ignored.
+    """
+    finished = set()
+    if not results_path.is_file():
+        return finished
+    with results_path.open("r", encoding="utf-8") as results_file:
+        for line in results_file:
+            try:
+                finished.add(json.loads(line)["path"])
+            except (ValueError, KeyError, TypeError):
+                continue
+    return finished
+
+
+# Text stores opened by this process, by database path (batch workers open their own)
+_text_stores: Dict[str, TextStore] = {}
+
+
+def _open_text_store(db_path: str) -> TextStore:
+    store = _text_stores.get(db_path)
+    if store is None:
+        store = _text_stores[db_path] = TextStore(Path(db_path))
+    return store
+
+
+def process_document(pdf_path: str, ocr_options: Optional[dict] = None, early_exit: bool = False,
+                     page_budget: Optional[int] = None, fields: Optional[List[str]] = None,
+                     text_store: Optional[str] = None, stage_totals: bool = False) -> dict:
+    """
+    OCR one PDF and extract its insurance fields into a batch result record,
+    with the source and DPI of every page. ocr_options are passed to
+    iter_pdf_pages. With early_exit, only the pages extract_fields_early
+    needs are read (at most page_budget of them OCR'd) and the record
+    counts the skipped ones. With fields, only those keys are extracted
+    (the others are empty). With text_store (a database path), the page
+    texts are also kept there for reextract. With stage_totals, the
+    record carries the stage counters of the document under "stages"
+    (run_batch adds them to its process's stage_totals()). Failures are
+    reported in the record instead of raised.
+    """
+    started = time.perf_counter()
+    record = {"path": pdf_path}
+    profile = Profile(per_page=False) if stage_totals else None
+    ocr_options = dict(ocr_options or {}, profile=profile)
+    try:
+        if early_exit:
+            record["fields"], pages, page_count = extract_fields_early(
+                Path(pdf_path), page_budget=page_budget, fields=fields, **ocr_options)
+            record["pages_skipped"] = page_count - len(pages)
         else:
-            raise RuntimeError(
-                "OCR dependencies not available. Install pytesseract and Pillow, "
-                "or use fallback_to_direct_extraction=True to extract text directly from PDF."
-            )
-    
-    doc = fitz.open(input_path)
-    texts = []
+            pages = list(iter_pdf_pages(Path(pdf_path), **ocr_options))
+            page_count = len(pages)
+            record["fields"] = fields_of_pages(pages, fields, profile)
+        if text_store:
+            _open_text_store(text_store).put(document_hash(Path(pdf_path)), pdf_path, page_count, pages)
+        record["pages"] = [
+            {"page": page.page_number, "source": page.source, "dpi": page.dpi} for page in pages
+        ]
+    except Exception as e:
+        record["error"] = str(e) or type(e).__name__
+    record["seconds"] = round(time.perf_counter() - started, 3)
+    if profile is not None:
+        record["stages"] = profile.to_dict()["stages"]
+    return record
+
+
+def _process_document_isolated(pdf_path: str, *options) -> dict:
+    """
+    process_document in a pool of its own, so that a worker killed by
+    this document (a crash or the OOM killer) fails only its record.
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1) as pool:
+        try:
+            return pool.submit(process_document, pdf_path, *options).result()
+        except concurrent.futures.BrokenExecutor:
+            return {"path": pdf_path, "error": "worker process died (crashed or killed) on this document"}
+
+
+def run_batch(pdf_paths: List[Path], results_path: Path, workers: int = 0,
+              ocr_options: Optional[dict] = None, early_exit: bool = False,
+              page_budget: Optional[int] = None, fields: Optional[List[str]] = None,
+              text_store: Optional[Path] = None) -> dict:
+    """
+    Run OCR and field extraction over many PDFs on a process pool and
+    append one JSON line per document to results_path (see
+    process_document for early_exit, page_budget, fields and text_store).
+    Documents already in the results file are skipped, so a crashed run
+    can simply be started again. When a worker dies, the documents that
+    were in flight are run again one at a time, each in a fresh process,
+    so the one that kills its worker gets an error record instead of
+    aborting every run. Returns counts of processed, failed and skipped
+    documents.
+    """
+    workers = resolve_workers(workers)
+    if fields is not None:
+        # Fail before any work is queued, not once per document
+        fields = sorted(select_fields(fields))
+    if text_store is not None:
+        # Create the tables once, before the workers race to create them
+        TextStore(Path(text_store)).close()
+        text_store = str(text_store)
+    finished = _read_finished_paths(results_path)
+    todo = [str(path) for path in pdf_paths if str(path) not in finished]
+    counts = {"processed": 0, "failed": 0, "skipped": len(pdf_paths) - len(todo)}
+    if not todo:
+        return counts
+
+    # Start on a fresh line if the previous run died mid-write
+    if results_path.is_file() and results_path.stat().st_size:
+        with results_path.open("rb") as results_file:
+            results_file.seek(-1, os.SEEK_END)
+            needs_newline = results_file.read(1) != b"\n"
+    else:
+        needs_newline = False
+
+    options = (ocr_options, early_exit, page_budget, fields, text_store, stage_totals_enabled())
+    with results_path.open("a", encoding="utf-8") as results_file:
+        if needs_newline:
+            results_file.write("\n")
+
+        def write_record(record: dict) -> None:
+            add_stage_totals(record.pop("stages", {}))
+            results_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            counts["failed" if "error" in record else "processed"] += 1
+
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        try:
+            queued = iter(todo)
+            running: Dict[concurrent.futures.Future, str] = {}
+            while True:
+                # Keep a bounded number of documents in flight
+                for pdf_path in queued:
+                    running[pool.submit(process_document, pdf_path, *options)] = pdf_path
+                    if len(running) >= workers * 2:
+                        break
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                if any(isinstance(future.exception(), concurrent.futures.BrokenExecutor) for future in done):
+                    # A worker died and took the pool, and every job still in it, along
+                    done, _ = wait(running)
+                suspects = []
+                for future in done:
+                    pdf_path = running.pop(future)
+                    if isinstance(future.exception(), concurrent.futures.BrokenExecutor):
+                        suspects.append(pdf_path)
+                    else:
+                        write_record(future.result())
+                results_file.flush()
+                if suspects:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    for pdf_path in suspects:
+                        write_record(_process_document_isolated(pdf_path, *options))
+                        results_file.flush()
+                    pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        finally:
+            pool.shutdown(cancel_futures=True)
+    return counts
 
+
+# Stored documents handed to a reextract worker at a time
+REEXTRACT_CHUNK_SIZE = 64
+# Per-process text store of the reextract pool
+_worker_text_store: Optional[TextStore] = None
+
+
+def _init_reextract_worker(db_path: str) -> None:
+    global _worker_text_store
+    _worker_text_store = TextStore(Path(db_path))
+
+
+def _reextract_chunk(documents: List[Tuple[str, str, int]], fields: Optional[List[str]] = None) -> List[dict]:
+    stored = {document: (path, page_count) for document, path, page_count in documents}
+    records = []
+    for document, pages in _worker_text_store.iter_pages(list(stored)):
+        path, page_count = stored[document]
+        records.append({
+            "path": path,
+            "document": document,
+            "fields": extract_insurance_fields("".join(format_page(page) for page in pages), fields=fields),
+            "pages_stored": len(pages),
+            "page_count": page_count,
+            "partial": len(pages) < page_count,
+        })
+    return records
+
+
+def reextract(db_path: Path, results_path: Path, workers: int = 0,
+              fields: Optional[List[str]] = None, match: str = "",
+              chunk_size: int = REEXTRACT_CHUNK_SIZE) -> dict:
+    """
+    Extract the fields of every document in a text store again from its
+    stored page texts, without touching the PDFs, and write one JSON line
+    per document to results_path, which is overwritten. Each record has
+    the path, document hash and fields, plus pages_stored, page_count
+    and a partial flag: documents stored by an early-exit batch only have
+    the pages that were read, so their fields may be incomplete. With
+    match, only documents with a page matching that FTS5 query are done.
+    Workers read their chunks of documents from the database themselves.
+    Returns counts of documents written and of partial ones.
+    """
+    workers = resolve_workers(workers)
+    if fields is not None:
+        fields = sorted(select_fields(fields))
+    store = TextStore(Path(db_path))
     try:
-        for page_index in range(len(doc)):
-            page = doc.load_page(page_index)
-            # Try direct text extraction first (faster, works for text-based PDFs)
-            direct_text = page.get_text()
-            if direct_text.strip():
-                # PDF has text layer, use it directly
-                header = f"\n\n===== PAGE {page_index + 1} =====\n\n"
-                texts.append(header + direct_text)
-            else:
-                # No text layer, use OCR
-                page_text = ocr_page(page, dpi=dpi)
-                header = f"\n\n===== PAGE {page_index + 1} =====\n\n"
-                texts.append(header + page_text)
+        documents = store.documents(match)
     finally:
-        doc.close()
-    
-    return "".join(texts)
+        store.close()
+    chunks = iter([documents[start:start + chunk_size] for start in range(0, len(documents), chunk_size)])
+    counts = {"documents": 0, "partial": 0}
+    with results_path.open("w", encoding="utf-8") as results_file, \
+            concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_reextract_worker,
+                                                   initargs=(str(db_path),)) as pool:
+        running = set()
+        while True:
+            for chunk in chunks:
+                running.add(pool.submit(_reextract_chunk, chunk, fields))
+                if len(running) >= workers * 2:
+                    break
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                for record in future.result():
+                    results_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    counts["documents"] += 1
+                    counts["partial"] += record["partial"]
+    return counts
+
 
+# Boilerplate pages recur with the same wording; their OCR texts must be at
+# least this similar (word-level difflib ratio) across sampled documents
+BOILERPLATE_MIN_SIMILARITY = 0.9
 
-def main():
+
+def _same_boilerplate(texts: List[str]) -> bool:
+    """
+    Whether OCR texts of one page from different documents are the same
+    wording: they give the same insurance fields (the page holds no
+    policy-specific values, unlike a schedule with a fixed layout) and
+    nearly the same words.
+    """
+    fields = [extract_insurance_fields(text) for text in texts]
+    if any(other != fields[0] for other in fields[1:]):
+        return False
+    words = [text.split() for text in texts]
+    return all(
+        difflib.SequenceMatcher(None, words[0], other, autojunk=False).ratio() >= BOILERPLATE_MIN_SIMILARITY
+        for other in words[1:]
+    )
+
+
+def build_boilerplate_index(pdf_paths: List[Path], min_documents: int = 3,
+                            max_distance: int = DEFAULT_MAX_DISTANCE, dpi: int = 200,
+                            cache: Optional[OCRCache] = None, samples: int = 3) -> BoilerplateIndex:
+    """
+    Find the scanned pages that recur across a sample corpus. Scans are
+    grouped by fingerprint (within max_distance bits of a group's first
+    page); a group found in at least min_documents documents is OCR'd in
+    up to samples of them, and indexed with the first text when
+    _same_boilerplate accepts the texts.
+    """
+    if min_documents < 2:
+        raise ValueError("min_documents must be at least 2: a page seen once cannot be told from a schedule")
+    _check_ocr_dependencies()
+    if not np.available:
+        raise RuntimeError("NumPy is not available. Please install it: pip install numpy")
+    groups: List[dict] = []
+    for pdf_path in pdf_paths:
+        with fitz.open(pdf_path) as doc:
+            for page in doc:
+                if classify_page(page).source != PAGE_SOURCE_OCR:
+                    continue
+                fingerprint = page_fingerprint(page)
+                value = int.from_bytes(fingerprint, "big")
+                group = next((group for group in groups
+                              if bin(group["value"] ^ value).count("1") <= max_distance), None)
+                if group is None:
+                    group = {"fingerprint": fingerprint, "value": value, "members": []}
+                    groups.append(group)
+                if all(member[0] != pdf_path for member in group["members"]):
+                    group["members"].append((pdf_path, page.number))
+
+    pages = []
+    for group in groups:
+        members = group["members"]
+        if len(members) < min_documents:
+            continue
+        texts = []
+        for pdf_path, page_index in members[:max(2, samples)]:
+            with fitz.open(pdf_path) as doc:
+                texts.append(_ocr_page(doc.load_page(page_index), dpi, cache=cache))
+        if _same_boilerplate(texts):
+            pdf_path, page_index = members[0]
+            pages.append(BoilerplatePage(group["fingerprint"], texts[0], len(members),
+                                         f"{Path(pdf_path).name}#{page_index + 1}"))
+    return BoilerplateIndex(pages, max_distance)
+
+
+def _add_ocr_arguments(parser: argparse.ArgumentParser, default_workers: int, workers_help: str) -> None:
+    parser.add_argument(
+        "--dpi",
+        type=int,
+        default=200,
+        help="Rendering DPI for OCR (higher = slower, but more accurate). Default: 200.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=default_workers,
+        help=workers_help,
+    )
+    parser.add_argument(
+        "--adaptive-dpi",
+        type=int,
+        default=0,
+        metavar="LOW_DPI",
+        help="OCR scanned pages at LOW_DPI first and re-render at --dpi only when "
+             "tesseract's mean word confidence is below --min-confidence. Default: off.",
+    )
+    parser.add_argument(
+        "--min-confidence",
+        type=float,
+        default=DEFAULT_MIN_CONFIDENCE,
+        help=f"Confidence threshold (0-100) for --adaptive-dpi. Default: {DEFAULT_MIN_CONFIDENCE:g}.",
+    )
+    parser.add_argument(
+        "--templates",
+        type=str,
+        default="",
+        help="JSON file of insurer layout templates; recognised layouts only have "
+             "their zones OCR'd. Default: full-page OCR.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(DEFAULT_CACHE_DIR),
+        help=f"Directory of the page OCR cache. Default: {DEFAULT_CACHE_DIR}.",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024),
+        help="Size cap of the OCR cache; least recently used pages are evicted. Default: 512.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always run tesseract, without reading or writing the OCR cache.",
+    )
+    parser.add_argument(
+        "--boilerplate-index",
+        type=str,
+        default="",
+        metavar="JSON_PATH",
+        help="Boilerplate page index (see the 'boilerplate' command); scans matching a known "
+             "page use its indexed text instead of OCR. Default: off.",
+    )
+    parser.add_argument(
+        "--ocr-blank-pages",
+        action="store_true",
+        help="OCR scanned pages that look blank too, instead of skipping them "
+             "(reported with source 'blank').",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=int,
+        default=0,
+        metavar="MB",
+        help="Keep memory per document flat for very large PDFs: free MuPDF's image store "
+             "after every page and limit pages OCR'd in parallel to what fits in MB. Default: off.",
+    )
+
+
+def _add_layout_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--layout",
+        action="store_true",
+        help="Also read every page's words with their boxes, and look single-line values up "
+             "right of or below their label before searching the text. OCR then runs at --dpi "
+             "and without --boilerplate-index. Needs NumPy.",
+    )
+
+
+def _ocr_options_from_args(args: argparse.Namespace) -> dict:
+    cache = None if args.no_cache else OCRCache(Path(args.cache_dir), args.cache_max_mb * 1024 * 1024)
+    return {
+        "dpi": args.dpi,
+        "cache": cache,
+        "low_dpi": args.adaptive_dpi or None,
+        "min_confidence": args.min_confidence,
+        "templates": load_templates(Path(args.templates)) if args.templates else None,
+        "max_memory": args.max_memory * 1024 * 1024 if args.max_memory else None,
+        "skip_blank": not args.ocr_blank_pages,
+        "boilerplate": load_boilerplate_index(Path(args.boilerplate_index)) if args.boilerplate_index else None,
+    }
+
+
+def _report_page_dpi(pages: Iterator[PageText]) -> Iterator[PageText]:
+    for page in pages:
+        if page.dpi is not None:
+            print(f"Page {page.page_number}: OCR at {page.dpi} dpi", file=sys.stderr)
+        yield page
+
+
+def _keep_page_text(pages: Iterator[PageText], texts: List[str]) -> Iterator[PageText]:
+    # Only the formatted text is kept, so pages (and their words) can be freed
+    for page in pages:
+        texts.append(format_page(page))
+        yield page
+
+
+def _write_page_words(pages: Iterator[PageText], words_path: Path) -> Iterator[PageText]:
+    with words_path.open("w", encoding="utf-8") as words_file:
+        for page in pages:
+            record = {"page": page.page_number, "source": page.source, "dpi": page.dpi}
+            record.update(page.words.to_dict())
+            words_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            yield page
+
+
+def _fields_from_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> Optional[List[str]]:
+    try:
+        return sorted(select_fields(args.fields.split(","))) if args.fields else None
+    except ValueError as e:
+        parser.error(str(e))
+
+
+def batch_main(argv: List[str]) -> None:
     parser = argparse.ArgumentParser(
-        description="Simple OCR utility: extract text from a PDF using Tesseract."
+        prog="ocr_pdf_extract.py batch",
+        description="OCR many PDFs and extract insurance fields into a JSON lines file.",
     )
     parser.add_argument(
-        "pdf_path",
+        "source",
         type=str,
-        help="Path to the input PDF file.",
+        help="Directory of PDFs, glob pattern (quote it), or manifest file with one path per line.",
+    )
+    parser.add_argument(
+        "--results",
+        type=str,
+        required=True,
+        help="JSON lines file to append results to; documents already in it are skipped.",
+    )
+    _add_ocr_arguments(
+        parser,
+        default_workers=0,
+        workers_help="Number of documents processed in parallel (0 = one per CPU core). Default: 0.",
+    )
+    parser.add_argument(
+        "--early-exit",
+        action="store_true",
+        help="Stop reading a document once every field is found or "
+             f"{EARLY_EXIT_PATIENCE} scanned pages in a row add none; "
+             "text-layer pages are read first, then scans front to back.",
+    )
+    parser.add_argument(
+        "--page-budget",
+        type=int,
+        default=0,
+        metavar="N",
+        help="OCR at most N pages per document (implies --early-exit). Default: no limit.",
+    )
+    parser.add_argument(
+        "--fields",
+        type=str,
+        default="",
+        metavar="KEYS",
+        help="Comma-separated schema keys to extract, e.g. POLICY_NO,TOTAL_PREMIUM; "
+             "the other keys are left empty. Default: all.",
+    )
+    parser.add_argument(
+        "--text-store",
+        type=str,
+        default="",
+        metavar="DB_PATH",
+        help="Also keep every page's text, source and DPI in this SQLite database, "
+             "so fields can be extracted again later with the 'reextract' command. With "
+             "--early-exit or --page-budget only the pages read are kept, and reextract "
+             "flags those documents as partial.",
+    )
+    _add_layout_argument(parser)
+
+    args = parser.parse_args(argv)
+    fields = _fields_from_args(parser, args)
+
+    pdf_paths = collect_batch_inputs(args.source)
+    if not pdf_paths:
+        raise SystemExit(f"No PDFs found for: {args.source}")
+
+    ocr_options = _ocr_options_from_args(args)
+    ocr_options["words"] = args.layout
+    results_path = Path(args.results)
+    counts = run_batch(pdf_paths, results_path, workers=args.workers,
+                       ocr_options=ocr_options,
+                       early_exit=args.early_exit or bool(args.page_budget),
+                       page_budget=args.page_budget or None, fields=fields,
+                       text_store=Path(args.text_store) if args.text_store else None)
+    print(
+        f"Batch done: {counts['processed']} processed, {counts['failed']} failed, "
+        f"{counts['skipped']} already in {results_path}"
+    )
+
+
+def reextract_main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="ocr_pdf_extract.py reextract",
+        description="Extract insurance fields again from the page texts kept by 'batch --text-store', "
+                    "without OCR.",
+    )
+    parser.add_argument("text_store", type=str, help="SQLite database written by 'batch --text-store'.")
+    parser.add_argument(
+        "--results",
+        type=str,
+        required=True,
+        help="JSON lines file to write the results to (overwritten).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Number of extraction processes (0 = one per CPU core). Default: 0.",
+    )
+    parser.add_argument(
+        "--fields",
+        type=str,
+        default="",
+        metavar="KEYS",
+        help="Comma-separated schema keys to extract; the other keys are left empty. Default: all.",
+    )
+    parser.add_argument(
+        "--match",
+        type=str,
+        default="",
+        metavar="QUERY",
+        help="Only documents with a page matching this SQLite FTS5 query, e.g. '\"hypothecated to\"'.",
+    )
+    args = parser.parse_args(argv)
+
+    if not Path(args.text_store).is_file():
+        raise SystemExit(f"Text store not found: {args.text_store}")
+    try:
+        counts = reextract(Path(args.text_store), Path(args.results), workers=args.workers,
+                           fields=_fields_from_args(parser, args), match=args.match)
+    except sqlite3.OperationalError as e:
+        raise SystemExit(f"Invalid query {args.match!r}: {e}")
+    print(f"Re-extracted {counts['documents']} documents into {args.results}")
+    if counts["partial"]:
+        print(f"{counts['partial']} of them were stored without all their pages (batch --early-exit "
+              f"or --page-budget) and are flagged \"partial\"; their fields may be incomplete",
+              file=sys.stderr)
+
+
+def search_main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="ocr_pdf_extract.py search",
+        description="Search the page texts kept by 'batch --text-store' with an SQLite FTS5 query.",
+    )
+    parser.add_argument("text_store", type=str, help="SQLite database written by 'batch --text-store'.")
+    parser.add_argument("query", type=str, help="FTS5 query, e.g. 'hypothecated' or '\"no claim bonus\"'.")
+    parser.add_argument("--limit", type=int, default=20, help="Matching pages to list. Default: 20.")
+    args = parser.parse_args(argv)
+
+    if not Path(args.text_store).is_file():
+        raise SystemExit(f"Text store not found: {args.text_store}")
+    store = TextStore(Path(args.text_store))
+    try:
+        total = len(store)
+        matching = store.count_documents(args.query)
+        hits = store.search(args.query, limit=args.limit)
+    except sqlite3.OperationalError as e:
+        raise SystemExit(f"Invalid query {args.query!r}: {e}")
+    finally:
+        store.close()
+    for hit in hits:
+        print(f"{hit.path} page {hit.page_number}: {hit.snippet}")
+    share = matching / total if total else 0.0
+    print(f"{matching} of {total} documents match ({share:.1%})")
+
+
+def serve_main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="ocr_pdf_extract.py serve",
+        description="Stay resident and extract insurance fields from length-prefixed PDF bytes "
+                    "or paths sent over stdin or a Unix domain socket (see extract_server).",
+    )
+    _add_ocr_arguments(
+        parser,
+        default_workers=1,
+        workers_help="Number of processes used to OCR the scanned pages of one request. Default: 1.",
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default="",
+        metavar="PATH",
+        help="Listen on this Unix domain socket instead of reading stdin and writing stdout.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=0,
+        help="Requests processed at once (0 = one per CPU core). Default: 0.",
+    )
+    parser.add_argument(
+        "--fields",
+        type=str,
+        default="",
+        metavar="KEYS",
+        help="Comma-separated schema keys to extract for requests that name none. Default: all.",
+    )
+    _add_layout_argument(parser)
+    args = parser.parse_args(argv)
+    fields = _fields_from_args(parser, args)
+
+    # Imported here: the server is only needed by this command
+    from extract_server import serve
+    ocr_options = _ocr_options_from_args(args)
+    ocr_options["workers"] = args.workers
+    ocr_options["words"] = args.layout
+    serve(resolve_workers(args.concurrency), ocr_options, fields=fields,
+          socket_path=Path(args.socket) if args.socket else None)
+
+
+def boilerplate_main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="ocr_pdf_extract.py boilerplate",
+        description="Build or refresh the boilerplate page index from a sample corpus of PDFs.",
+    )
+    parser.add_argument(
+        "source",
+        type=str,
+        help="Directory of PDFs, glob pattern (quote it), or manifest file with one path per line.",
+    )
+    parser.add_argument(
+        "--index",
+        type=str,
+        required=True,
+        help="JSON file to write the index to.",
+    )
+    parser.add_argument(
+        "--min-documents",
+        type=int,
+        default=3,
+        help="Index a page only when it occurs in at least this many documents (2 or more). Default: 3.",
+    )
+    parser.add_argument(
+        "--max-distance",
+        type=int,
+        default=DEFAULT_MAX_DISTANCE,
+        help=f"Fingerprint bits two scans of the same page may differ in. Default: {DEFAULT_MAX_DISTANCE}.",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Keep the pages of an existing index that this corpus does not cover.",
     )
     parser.add_argument(
         "--dpi",
         type=int,
         default=200,
-        help="Rendering DPI for OCR (higher = slower, but more accurate). Default: 200.",
+        help="Rendering DPI for OCR of the indexed pages. Default: 200.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(DEFAULT_CACHE_DIR),
+        help=f"Directory of the page OCR cache. Default: {DEFAULT_CACHE_DIR}.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always run tesseract, without reading or writing the OCR cache.",
+    )
+
+    args = parser.parse_args(argv)
+
+    pdf_paths = collect_batch_inputs(args.source)
+    if not pdf_paths:
+        raise SystemExit(f"No PDFs found for: {args.source}")
+
+    cache = None if args.no_cache else OCRCache(Path(args.cache_dir))
+    index = build_boilerplate_index(pdf_paths, min_documents=args.min_documents,
+                                    max_distance=args.max_distance, dpi=args.dpi, cache=cache)
+    index_path = Path(args.index)
+    kept: List[BoilerplatePage] = []
+    if args.merge and index_path.is_file():
+        previous = load_boilerplate_index(index_path)
+        kept = [page for page in previous.pages if index.match(page.fingerprint) is None]
+    found = len(index)
+    index = BoilerplateIndex(index.pages + kept, index.max_distance)
+    index.save(index_path)
+    print(f"Boilerplate index: {found} pages found in {len(pdf_paths)} documents, "
+          f"{len(kept)} kept from the previous index, saved to {index_path}")
+
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "batch":
+        return batch_main(argv[1:])
+    if argv and argv[0] == "boilerplate":
+        return boilerplate_main(argv[1:])
+    if argv and argv[0] == "reextract":
+        return reextract_main(argv[1:])
+    if argv and argv[0] == "search":
+        return search_main(argv[1:])
+    if argv and argv[0] == "serve":
+        return serve_main(argv[1:])
+
+    parser = argparse.ArgumentParser(
+        description="Simple OCR utility: extract text from a PDF using Tesseract. "
+                    "Run with 'batch' as the first argument to process many PDFs, with "
+                    "'boilerplate' to build the boilerplate page index, with 'reextract' "
+                    "or 'search' to use the page texts kept by 'batch --text-store', or with "
+                    "'serve' to stay resident and answer requests over stdin or a Unix socket."
+    )
+    parser.add_argument(
+        "-V",
+        "--version",
+        action="version",
+        version=f"ocr_pdf_extract {__version__}",
+    )
+    parser.add_argument(
+        "pdf_path",
+        type=str,
+        help="Path to the input PDF file.",
+    )
+    _add_ocr_arguments(
+        parser,
+        default_workers=1,
+        workers_help="Number of processes used to OCR scanned pages (0 = one per CPU core). Default: 1.",
     )
     parser.add_argument(
         "--output",
@@ -148,23 +1834,62 @@ def main():
         default="",
         help="Optional path to save OCR text. If omitted, prints to stdout.",
     )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="-",
+        default="",
+        metavar="JSON_PATH",
+        help="Time every stage (and the field extraction) per page. Prints a breakdown "
+             "to stderr, or writes the counters as JSON to JSON_PATH.",
+    )
+    parser.add_argument(
+        "--words",
+        type=str,
+        default="",
+        metavar="JSONL_PATH",
+        help="Also write every page's words with their boxes (PDF points), line and "
+             "block ids and confidences to JSONL_PATH, one JSON object per page.",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     pdf_path = Path(args.pdf_path)
     if not pdf_path.is_file():
         raise SystemExit(f"PDF not found: {pdf_path}")
 
-    text = ocr_pdf(pdf_path, dpi=args.dpi)
+    profile = Profile() if args.profile else None
+    pages = iter_pdf_pages(pdf_path, workers=args.workers, profile=profile,
+                           words=bool(args.words), **_ocr_options_from_args(args))
+    if args.adaptive_dpi:
+        pages = _report_page_dpi(pages)
+    if args.words:
+        pages = _write_page_words(pages, Path(args.words))
+    page_texts: List[str] = []
+    if profile is not None:
+        pages = _keep_page_text(pages, page_texts)
 
     if args.output:
         out_path = Path(args.output)
-        out_path.write_text(text, encoding="utf-8")
+        # Write each page as soon as it is done instead of holding the whole text
+        with out_path.open("w", encoding="utf-8") as out_file:
+            for page in pages:
+                out_file.write(format_page(page))
         print(f"OCR text saved to: {out_path}")
     else:
         # Print to console
-        print(text)
+        for page in pages:
+            sys.stdout.write(format_page(page))
+            sys.stdout.flush()
+        print()
+
+    if profile is not None:
+        extract_insurance_fields("".join(page_texts), profile=profile)
+        if args.profile == "-":
+            print(profile.format_report(), file=sys.stderr)
+        else:
+            Path(args.profile).write_text(profile.to_json(), encoding="utf-8")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
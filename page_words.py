@@ -0,0 +1,232 @@
+"""
+Words of a PDF page with their positions, kept as NumPy columns.
+
+PageWords holds one entry per word: its text, its box in PDF points
+(x0, y0, x1, y1, origin top-left), a block id, a page-unique line id and
+a confidence (100 for words from the text layer). It is built from
+page.get_text("words") or from tesseract's TSV output, and answers the
+geometric questions field_extractor.find_field_by_layout asks: where a
+label is, and which words lie right of it or below it.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from lazy_import import LazyModule
+
+# Imported on first use; NumPy is only needed when words are requested
+np = LazyModule("numpy")
+
+
+def __getattr__(name: str):
+    if name == "NUMPY_AVAILABLE":
+        return np.available
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+TEXT_LAYER_CONFIDENCE = 100.0
+# Separators between a label and its value that are words of their own
+_SEPARATORS = {":", "-", "=", ":-", "–"}
+# A gap wider than this many line heights ends a value (the next column starts)
+COLUMN_GAP_LINE_HEIGHTS = 2.0
+
+
+def _normalize(word: str) -> str:
+    return word.upper().rstrip(":.-=")
+
+
+class PageWords:
+    """
+    Words of one page as parallel columns: words (list of str), boxes
+    (float32, n x 4), blocks, lines (int32) and confidences (float32).
+    """
+
+    def __init__(self, words: List[str], boxes, blocks, lines, confidences):
+        if not np.available:
+            raise RuntimeError("NumPy is not available. Please install it: pip install numpy")
+        self.words = list(words)
+        self.boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        self.blocks = np.asarray(blocks, dtype=np.int32)
+        self.lines = np.asarray(lines, dtype=np.int32)
+        self.confidences = np.asarray(confidences, dtype=np.float32)
+        self._index: Optional[Dict[str, List[int]]] = None
+        self._line_layout = None
+
+    @classmethod
+    def from_text_layer(cls, page) -> "PageWords":
+        """Words of a page's text layer, from page.get_text("words")."""
+        entries = page.get_text("words")
+        line_ids: Dict[Tuple[int, int], int] = {}
+        lines = [line_ids.setdefault((entry[5], entry[6]), len(line_ids)) for entry in entries]
+        return cls(
+            [entry[4] for entry in entries],
+            [entry[:4] for entry in entries],
+            [entry[5] for entry in entries],
+            lines,
+            [TEXT_LAYER_CONFIDENCE] * len(entries),
+        )
+
+    @classmethod
+    def from_tesseract(cls, data: dict, scale: float, origin: Tuple[float, float] = (0.0, 0.0)) -> "PageWords":
+        """
+        Words from tesseract TSV columns (as parsed by
+        ocr_pdf_extract._parse_tesseract_tsv). Pixel boxes are converted to
+        PDF points with scale (72 / dpi) and shifted by the origin of the
+        rendered clip.
+        """
+        words, boxes, blocks, lines, confidences = [], [], [], [], []
+        line_ids: Dict[Tuple[str, str, str], int] = {}
+        x_origin, y_origin = origin
+        for index, word in enumerate(data.get("text", [])):
+            confidence = float(data["conf"][index])
+            if confidence < 0 or not word.strip():
+                continue
+            left, top = float(data["left"][index]), float(data["top"][index])
+            width, height = float(data["width"][index]), float(data["height"][index])
+            words.append(word)
+            boxes.append((x_origin + left * scale, y_origin + top * scale,
+                          x_origin + (left + width) * scale, y_origin + (top + height) * scale))
+            blocks.append(int(data["block_num"][index]))
+            line_key = (data["block_num"][index], data["par_num"][index], data["line_num"][index])
+            lines.append(line_ids.setdefault(line_key, len(line_ids)))
+            confidences.append(confidence)
+        return cls(words, boxes, blocks, lines, confidences)
+
+    @classmethod
+    def concat(cls, parts: Sequence["PageWords"]) -> "PageWords":
+        """Join the words of several regions of a page, keeping line ids unique."""
+        words: List[str] = []
+        line_offset = 0
+        lines = []
+        for part in parts:
+            words.extend(part.words)
+            lines.append(part.lines + line_offset)
+            if len(part):
+                line_offset += int(part.lines.max()) + 1
+        if not parts:
+            return cls([], [], [], [], [])
+        return cls(
+            words,
+            np.concatenate([part.boxes for part in parts]),
+            np.concatenate([part.blocks for part in parts]),
+            np.concatenate(lines),
+            np.concatenate([part.confidences for part in parts]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def _lines_sorted(self):
+        """
+        (order, line_ids, starts, tops, bottoms): word indices sorted by
+        line and x, and per line its first position in order and its
+        vertical extent.
+        """
+        if self._line_layout is None:
+            order = np.lexsort((self.boxes[:, 0], self.lines))
+            line_ids, starts = np.unique(self.lines[order], return_index=True)
+            tops = np.minimum.reduceat(self.boxes[order, 1], starts) if len(order) else np.empty(0)
+            bottoms = np.maximum.reduceat(self.boxes[order, 3], starts) if len(order) else np.empty(0)
+            self._line_layout = (order, line_ids, starts, tops, bottoms)
+        return self._line_layout
+
+    def _line_words(self, line_position: int):
+        order, line_ids, starts, _, _ = self._lines_sorted()
+        end = starts[line_position + 1] if line_position + 1 < len(starts) else len(order)
+        return order[starts[line_position]:end]
+
+    def _line_position(self, index: int) -> int:
+        _, line_ids, _, _, _ = self._lines_sorted()
+        return int(np.searchsorted(line_ids, self.lines[index]))
+
+    def text(self) -> str:
+        """The words joined line by line, left to right."""
+        _, line_ids, _, _, _ = self._lines_sorted()
+        return "".join(
+            " ".join(self.words[index] for index in self._line_words(position)) + "\n"
+            for position in range(len(line_ids))
+        )
+
+    def find_phrase(self, phrase: str) -> List[Tuple[int, int]]:
+        """
+        (first, last) word indices of every occurrence of phrase on a single
+        line, compared case-insensitively and ignoring trailing ':' or '.'.
+        """
+        tokens = [_normalize(token) for token in phrase.split()]
+        tokens = [token for token in tokens if token]
+        if not tokens:
+            return []
+        if self._index is None:
+            self._index = {}
+            for index, word in enumerate(self.words):
+                self._index.setdefault(_normalize(word), []).append(index)
+        matches = []
+        for first in self._index.get(tokens[0], []):
+            line = self._line_words(self._line_position(first))
+            position = int(np.nonzero(line == first)[0][0])
+            following = line[position:position + len(tokens)]
+            if len(following) == len(tokens) and all(
+                _normalize(self.words[index]) == token for index, token in zip(following, tokens)
+            ):
+                matches.append((first, int(following[-1])))
+        return matches
+
+    def value_right_of(self, last: int) -> str:
+        """
+        The words after word `last` on its line, skipping separators and
+        stopping at a column-sized gap.
+        """
+        line = self._line_words(self._line_position(last))
+        position = int(np.nonzero(line == last)[0][0])
+        values: List[str] = []
+        line_height = float(self.boxes[last, 3] - self.boxes[last, 1]) or 1.0
+        previous_x1 = float(self.boxes[last, 2])
+        for index in line[position + 1:]:
+            if self.boxes[index, 0] - previous_x1 > COLUMN_GAP_LINE_HEIGHTS * line_height:
+                break
+            word = self.words[index]
+            previous_x1 = float(self.boxes[index, 2])
+            if not values and word in _SEPARATORS:
+                continue
+            values.append(word.lstrip(":=") if not values else word)
+        return " ".join(value for value in values if value)
+
+    def value_below(self, first: int, last: int) -> str:
+        """
+        The words of the nearest line below the label that lie under it,
+        from the label's left edge up to the next word right of the label.
+        """
+        order, line_ids, starts, tops, bottoms = self._lines_sorted()
+        label_line = self._line_position(last)
+        line = self._line_words(label_line)
+        position = int(np.nonzero(line == last)[0][0])
+        x_left = float(self.boxes[first, 0])
+        x_right = float(self.boxes[line[position + 1], 0]) if position + 1 < len(line) else float("inf")
+        label_bottom = float(bottoms[label_line])
+        line_height = label_bottom - float(tops[label_line]) or 1.0
+
+        below = np.nonzero(tops >= label_bottom - line_height / 2)[0]
+        for candidate in below[np.argsort(tops[below], kind="stable")]:
+            if candidate == label_line:
+                continue
+            if tops[candidate] - label_bottom > 2 * line_height:
+                break
+            words = self._line_words(int(candidate))
+            centers = (self.boxes[words, 0] + self.boxes[words, 2]) / 2
+            under = words[(centers >= x_left - line_height) & (centers < x_right)]
+            if len(under):
+                return " ".join(self.words[index] for index in under)
+        return ""
+
+    def to_dict(self) -> dict:
+        # Round in float64: rounded float32 values print as e.g. 3.5999999046325684
+        return {
+            "words": self.words,
+            "boxes": np.round(self.boxes.astype(np.float64), 2).tolist(),
+            "blocks": self.blocks.tolist(),
+            "lines": self.lines.tolist(),
+            "confidences": np.round(self.confidences.astype(np.float64), 1).tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PageWords":
+        return cls(data["words"], data["boxes"], data["blocks"], data["lines"], data["confidences"])
@@ -0,0 +1,163 @@
+"""
+Tests for the Flask API in api/index.py, through Flask's test client.
+
+Uploads are small PDFs with a text layer, so no tesseract is needed;
+slow extractions are simulated by patching index.ocr_pdf.
+"""
+
+import io
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "api"))
+try:
+    import index  # noqa: E402
+except ImportError:  # Flask is not installed
+    index = None
+
+requires_flask = unittest.skipUnless(index is not None and index.ocr_pdf_extract.PYMUPDF_AVAILABLE,
+                                     "Flask and PyMuPDF are required")
+
+
+def _text_pdf(text: str) -> bytes:
+    fitz = index.ocr_pdf_extract.fitz
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _free_slots() -> int:
+    """How many uploads the API would still accept, without changing it."""
+    taken = 0
+    while index._slots.acquire(blocking=False):
+        taken += 1
+    for _ in range(taken):
+        index._slots.release()
+    return taken
+
+
+def _wait_for(condition, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+@requires_flask
+class ExtractEndpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = index.app.test_client()
+        self.total_slots = index.MAX_WORKERS + index.MAX_QUEUE
+        self.assertEqual(_free_slots(), self.total_slots)
+
+    def tearDown(self):
+        self.assertTrue(_wait_for(lambda: _free_slots() == self.total_slots), "a slot was not released")
+
+    def post(self, data: bytes, path: str = "/api/extract", **form):
+        form["file"] = (io.BytesIO(data), "policy.pdf")
+        return self.client.post(path, data=form, content_type="multipart/form-data")
+
+    def test_extracts_fields(self):
+        response = self.post(_text_pdf("Policy No: P/2024/0001"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["POLICY_NO"], "P/2024/0001")
+
+    def test_field_subset(self):
+        response = self.post(_text_pdf("Policy No: P/2024/0001\nCity: Pune"), fields="POLICY_NO")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["POLICY_NO"], "P/2024/0001")
+        self.assertEqual(response.get_json()["CITY_NAME"], "")
+
+    def test_missing_file_is_400(self):
+        response = self.client.post("/api/extract", data={}, content_type="multipart/form-data")
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_field_is_400(self):
+        response = self.post(_text_pdf("Policy No: 1"), fields="POLICY_NUMBER")
+        self.assertEqual(response.status_code, 400)
+
+    def test_not_a_pdf_is_415(self):
+        response = self.post(b"GIF89a not a pdf")
+        self.assertEqual(response.status_code, 415)
+
+    def test_corrupt_pdf_is_422_without_temp_path(self):
+        response = self.post(b"%PDF-1.4 garbage" * 10)
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.get_json(), {"error": index.UNREADABLE_PDF})
+
+    def test_full_queue_is_429(self):
+        for _ in range(self.total_slots):
+            index._slots.acquire()
+        try:
+            response = self.post(_text_pdf("Policy No: 1"))
+        finally:
+            for _ in range(self.total_slots):
+                index._slots.release()
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response.headers)
+
+    def test_timeout_is_504_and_keeps_the_slot(self):
+        release = threading.Event()
+
+        def slow_ocr(pdf_path, **kwargs):
+            release.wait(10)
+            return "Policy No: 1"
+
+        with mock.patch.object(index, "ocr_pdf", side_effect=slow_ocr), \
+                mock.patch.object(index, "REQUEST_TIMEOUT", 0.05):
+            response = self.post(_text_pdf("Policy No: 1"))
+            self.assertEqual(response.status_code, 504)
+            # The extraction still runs, so its slot stays taken until it ends
+            self.assertEqual(_free_slots(), self.total_slots - 1)
+            release.set()
+            self.assertTrue(_wait_for(lambda: _free_slots() == self.total_slots))
+
+
+@requires_flask
+class JobsEndpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = index.app.test_client()
+
+    def post_job(self, data: bytes) -> str:
+        response = self.client.post("/api/jobs", data={"file": (io.BytesIO(data), "policy.pdf")},
+                                    content_type="multipart/form-data")
+        self.assertEqual(response.status_code, 202)
+        return response.get_json()["job_id"]
+
+    def finished_job(self, job_id: str) -> dict:
+        job = {}
+
+        def finished() -> bool:
+            job.update(self.client.get(f"/api/jobs/{job_id}").get_json())
+            return job["status"] in ("done", "failed")
+
+        self.assertTrue(_wait_for(finished))
+        return job
+
+    def test_job_runs_to_done(self):
+        job = self.finished_job(self.post_job(_text_pdf("Policy No: P/2024/0002")))
+        self.assertEqual(job["status"], "done")
+        self.assertEqual(job["result"]["POLICY_NO"], "P/2024/0002")
+        self.assertEqual((job["pages_done"], job["pages_total"]), (1, 1))
+
+    def test_corrupt_pdf_job_fails_without_temp_path(self):
+        job = self.finished_job(self.post_job(b"%PDF-1.4 garbage" * 10))
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["error"], index.UNREADABLE_PDF)
+
+    def test_unknown_job_is_404(self):
+        self.assertEqual(self.client.get("/api/jobs/0123456789abcdef").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Tests for run_batch: resuming from the results file, and a document
+that kills its worker process. The PDFs have a text layer, so no
+tesseract is needed.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import ocr_pdf_extract  # noqa: E402
+from ocr_pdf_extract import run_batch  # noqa: E402
+
+requires_pymupdf = unittest.skipUnless(ocr_pdf_extract.fitz.available, "PyMuPDF is required")
+
+_process_document = ocr_pdf_extract.process_document
+
+
+def _crash_on_marked(pdf_path: str, *options) -> dict:
+    """process_document, except that the worker dies on crash.pdf (as on a segfault)."""
+    if pdf_path.endswith("crash.pdf"):
+        os._exit(1)
+    return _process_document(pdf_path, *options)
+
+
+def _read_records(results_path: Path) -> dict:
+    records = [json.loads(line) for line in results_path.read_text(encoding="utf-8").splitlines()]
+    return {Path(record["path"]).name: record for record in records}
+
+
+@requires_pymupdf
+class RunBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.results = self.root / "results.jsonl"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_pdf(self, name: str) -> Path:
+        fitz = ocr_pdf_extract.fitz
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), f"Policy No: {Path(name).stem.upper()}")
+        path = self.root / name
+        doc.save(str(path))
+        doc.close()
+        return path
+
+    def test_resume_skips_recorded_documents(self):
+        pdfs = [self.make_pdf(f"p{number}.pdf") for number in range(4)]
+        counts = run_batch(pdfs[:3], self.results, workers=2)
+        self.assertEqual(counts, {"processed": 3, "failed": 0, "skipped": 0})
+
+        # A run that died mid-write leaves a truncated last line behind
+        with self.results.open("a", encoding="utf-8") as results_file:
+            results_file.write('{"path": "trunc')
+        counts = run_batch(pdfs, self.results, workers=2)
+        self.assertEqual(counts, {"processed": 1, "failed": 0, "skipped": 3})
+
+        lines = self.results.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(lines[3], '{"path": "trunc')
+        records = [json.loads(line) for line in lines[:3] + lines[4:]]
+        self.assertEqual(sorted(Path(record["path"]).name for record in records),
+                         ["p0.pdf", "p1.pdf", "p2.pdf", "p3.pdf"])
+        self.assertEqual({record["fields"]["POLICY_NO"] for record in records}, {"P0", "P1", "P2", "P3"})
+
+    @mock.patch.object(ocr_pdf_extract, "process_document", _crash_on_marked)
+    def test_worker_crash_fails_only_its_document(self):
+        pdfs = [self.make_pdf(name) for name in ("a.pdf", "b.pdf", "crash.pdf", "c.pdf", "d.pdf")]
+        counts = run_batch(pdfs, self.results, workers=2)
+        self.assertEqual(counts, {"processed": 4, "failed": 1, "skipped": 0})
+
+        records = _read_records(self.results)
+        self.assertEqual(sorted(records), ["a.pdf", "b.pdf", "c.pdf", "crash.pdf", "d.pdf"])
+        self.assertIn("worker process died", records["crash.pdf"]["error"])
+        self.assertEqual(records["d.pdf"]["fields"]["POLICY_NO"], "D")
+
+        # The crash is recorded, so a resumed run does not hit it again
+        self.assertEqual(run_batch(pdfs, self.results, workers=2),
+                         {"processed": 0, "failed": 0, "skipped": 5})
+
+
+if __name__ == "__main__":
+    unittest.main()
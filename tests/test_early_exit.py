@@ -0,0 +1,73 @@
+"""
+Tests for extract_fields_early's page budget and patience.
+
+The documents are built with PyMuPDF; OCR is replaced by a stub that
+returns no field, so every scan read is one the budget must count.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import ocr_pdf_extract  # noqa: E402
+from ocr_pdf_extract import PAGE_SOURCE_DIRECT, PAGE_SOURCE_OCR, extract_fields_early  # noqa: E402
+
+requires_pymupdf = unittest.skipUnless(ocr_pdf_extract.fitz.available and ocr_pdf_extract.pytesseract.available,
+                                       "PyMuPDF and pytesseract are required")
+
+
+def _stamped_scans(page_count: int, text_pages: int = 0) -> bytes:
+    """
+    A PDF of page_count scans (a full-page image) that each carry a
+    "Page N" text stamp, after text_pages pages with a real text layer.
+    """
+    fitz = ocr_pdf_extract.fitz
+    doc = fitz.open()
+    for number in range(1, text_pages + 1):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Terms and conditions, section {number}. " * 3)
+    scan = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 100, 140), False)
+    scan.clear_with(255)
+    scan.set_rect(fitz.IRect(10, 10, 90, 30), (0,))
+    for number in range(1, page_count + 1):
+        page = doc.new_page()
+        page.insert_image(page.rect, pixmap=scan)
+        page.insert_text((280, 820), f"Page {number}", fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _ocr_without_fields(page, dpi, *args, **kwargs):
+    return f"Scanned page {page.number + 1}\n", dpi, None
+
+
+@requires_pymupdf
+@mock.patch.object(ocr_pdf_extract, "_ocr_page_with_options", side_effect=_ocr_without_fields)
+class ExtractFieldsEarlyTest(unittest.TestCase):
+
+    def test_page_budget_holds_for_stamped_scans(self, ocr):
+        fields, pages, page_count = extract_fields_early(_stamped_scans(10), page_budget=2, patience=None,
+                                                         skip_blank=False)
+        self.assertEqual(page_count, 10)
+        self.assertEqual(ocr.call_count, 2)
+        self.assertEqual([page.source for page in pages], [PAGE_SOURCE_OCR] * 2)
+
+    def test_patience_holds_for_stamped_scans(self, ocr):
+        _, pages, _ = extract_fields_early(_stamped_scans(10), patience=3, skip_blank=False)
+        self.assertEqual(ocr.call_count, 3)
+        self.assertEqual(len(pages), 3)
+
+    def test_text_pages_are_read_first_and_free(self, ocr):
+        _, pages, page_count = extract_fields_early(_stamped_scans(4, text_pages=2), page_budget=1,
+                                                    patience=None, skip_blank=False)
+        self.assertEqual(page_count, 6)
+        self.assertEqual(ocr.call_count, 1)
+        self.assertEqual([(page.page_number, page.source) for page in pages],
+                         [(1, PAGE_SOURCE_DIRECT), (2, PAGE_SOURCE_DIRECT), (3, PAGE_SOURCE_OCR)])
+
+
+if __name__ == "__main__":
+    unittest.main()
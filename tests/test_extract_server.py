@@ -0,0 +1,154 @@
+"""
+Tests for the serve frame protocol and socket handling in extract_server.
+Requests are PDFs with a text layer, so no tesseract is needed.
+"""
+
+import io
+import json
+import socket
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import ocr_pdf_extract  # noqa: E402
+from extract_server import (  # noqa: E402
+    MAX_REQUEST_BYTES, ExtractionServer, _remove_stale_socket, parse_request, read_frame, write_frame,
+)
+
+requires_pymupdf = unittest.skipUnless(ocr_pdf_extract.fitz.available, "PyMuPDF is required")
+
+
+def _frame(payload: bytes) -> bytes:
+    return struct.pack(">I", len(payload)) + payload
+
+
+def _text_pdf(text: str) -> bytes:
+    fitz = ocr_pdf_extract.fitz
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class FrameTest(unittest.TestCase):
+
+    def test_round_trip_and_end_of_input(self):
+        stream = io.BytesIO()
+        write_frame(stream, b"first")
+        write_frame(stream, b"")
+        stream.seek(0)
+        self.assertEqual(read_frame(stream), b"first")
+        self.assertEqual(read_frame(stream), b"")
+        self.assertIsNone(read_frame(stream))
+
+    def test_truncated_and_oversized_frames(self):
+        with self.assertRaises(EOFError):
+            read_frame(io.BytesIO(struct.pack(">I", 10) + b"short"))
+        with self.assertRaises(EOFError):
+            read_frame(io.BytesIO(b"\x00\x00"))
+        with self.assertRaises(ValueError):
+            read_frame(io.BytesIO(struct.pack(">I", MAX_REQUEST_BYTES + 1)))
+
+    def test_parse_request(self):
+        self.assertEqual(parse_request(b"%PDF-1.7 ..."), (b"%PDF-1.7 ...", None, None))
+        self.assertEqual(parse_request(b" /tmp/a.pdf\n"), (Path("/tmp/a.pdf"), None, None))
+        self.assertEqual(parse_request(b'{"path": "/tmp/a.pdf", "id": 7, "fields": ["POLICY_NO"]}'),
+                         (Path("/tmp/a.pdf"), 7, ["POLICY_NO"]))
+        for payload in (b"", b'{"id": 7}', b'{"path": "a.pdf", "fields": "POLICY_NO"}'):
+            with self.subTest(payload=payload), self.assertRaises(ValueError):
+                parse_request(payload)
+
+
+@requires_pymupdf
+class ServeConnectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ExtractionServer(concurrency=2)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.server.close()
+        self.directory.cleanup()
+
+    def serve(self, data: bytes) -> dict:
+        """Responses to the frames in data, by request number."""
+        output = io.BytesIO()
+        self.server.serve_connection(io.BytesIO(data), output)
+        output.seek(0)
+        responses = {}
+        while (payload := read_frame(output)) is not None:
+            response = json.loads(payload)
+            responses[response.pop("request")] = response
+        return responses
+
+    def test_requests_of_every_kind(self):
+        pdf_path = Path(self.directory.name) / "policy.pdf"
+        pdf_path.write_bytes(_text_pdf("Policy No: P/2024/0003\nCity: Pune"))
+        request = json.dumps({"path": str(pdf_path), "id": "abc", "fields": ["CITY_NAME"]})
+        responses = self.serve(
+            _frame(_text_pdf("Policy No: P/2024/0001"))
+            + _frame(str(pdf_path).encode("utf-8"))
+            + _frame(request.encode("utf-8"))
+            + _frame(b'{"id": 1}')
+            + _frame(str(Path(self.directory.name) / "missing.pdf").encode("utf-8"))
+        )
+        self.assertEqual(sorted(responses), [0, 1, 2, 3, 4])
+        self.assertEqual(responses[0]["fields"]["POLICY_NO"], "P/2024/0001")
+        self.assertEqual(responses[0]["pages"], 1)
+        self.assertEqual(set(responses[0]["seconds"]), {"queued", "pages", "fields", "total"})
+        self.assertEqual(responses[1]["fields"]["POLICY_NO"], "P/2024/0003")
+        self.assertEqual(responses[2]["id"], "abc")
+        self.assertEqual((responses[2]["fields"]["CITY_NAME"], responses[2]["fields"]["POLICY_NO"]),
+                         ("PUNE", ""))
+        self.assertIn("path", responses[3]["error"])
+        self.assertIn("error", responses[4])
+
+    def test_bad_frame_ends_the_connection(self):
+        responses = self.serve(_frame(_text_pdf("Policy No: 1")) + struct.pack(">I", MAX_REQUEST_BYTES + 1)
+                               + _frame(_text_pdf("Policy No: 2")))
+        self.assertEqual(sorted(responses), [0, 1])
+        self.assertIn("fields", responses[0])
+        self.assertIn("larger than", responses[1]["error"])
+
+
+class RemoveStaleSocketTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "serve.sock"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_missing_path_is_fine(self):
+        _remove_stale_socket(self.path)
+        self.assertFalse(self.path.exists())
+
+    def test_regular_file_is_refused(self):
+        self.path.write_text("keep me")
+        with self.assertRaises(SystemExit):
+            _remove_stale_socket(self.path)
+        self.assertEqual(self.path.read_text(), "keep me")
+
+    def test_stale_socket_is_removed(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(self.path))
+        stale.close()
+        _remove_stale_socket(self.path)
+        self.assertFalse(self.path.exists())
+
+    def test_live_socket_is_refused(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as live:
+            live.bind(str(self.path))
+            live.listen(1)
+            with self.assertRaises(SystemExit):
+                _remove_stale_socket(self.path)
+            self.assertTrue(self.path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+Regression tests for field_extractor.
+
+tests/data/field_extractor_cases.json holds fixed input texts with the
+fields the original extractor (before the single-pass label scan)
+returned for them: synthetic policy schedules, texts with case look-alike
+characters (long s, dotted capital I, Kelvin sign) and random mixes of
+labels and values. Every optimization must keep these outputs identical.
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from field_extractor import SCHEMA_FIELDS, extract_insurance_fields  # noqa: E402
+
+CASES_PATH = Path(__file__).resolve().parent / "data" / "field_extractor_cases.json"
+
+
+class ExtractInsuranceFieldsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cases = json.loads(CASES_PATH.read_text(encoding="utf-8"))
+
+    def test_matches_baseline(self):
+        for index, case in enumerate(self.cases):
+            with self.subTest(case=index):
+                self.assertEqual(extract_insurance_fields(case["text"]), case["expected"])
+
+    def test_field_subset_matches_full_extraction(self):
+        wanted = ["POLICY_NO", "CUSTOMER_NAME", "TOTAL_PREMIUM", "PINCODE"]
+        for index, case in enumerate(self.cases):
+            with self.subTest(case=index):
+                fields = extract_insurance_fields(case["text"], fields=wanted)
+                self.assertEqual(list(fields), list(SCHEMA_FIELDS))
+                self.assertEqual(fields, {key: case["expected"][key] if key in wanted else ""
+                                          for key in SCHEMA_FIELDS})
+
+    def test_unknown_field_is_rejected(self):
+        with self.assertRaises(ValueError):
+            extract_insurance_fields("Policy No: 1", fields=["POLICY_NUMBER"])
+
+
+if __name__ == "__main__":
+    unittest.main()
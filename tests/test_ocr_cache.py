@@ -0,0 +1,49 @@
+"""
+Tests for the size accounting and eviction of the on-disk OCRCache.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from ocr_pdf_extract import OCRCache  # noqa: E402
+
+
+class OCRCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = OCRCache(Path(self.directory.name), max_bytes=1000)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def keys(self, count: int):
+        return [OCRCache.key(bytes([number]), 200, "eng", "") for number in range(count)]
+
+    def test_overwriting_an_entry_does_not_grow_the_size(self):
+        first, second = self.keys(2)
+        self.cache.put(first, "a" * 300)
+        for _ in range(20):
+            self.cache.put(second, "b" * 300)
+            self.assertEqual(self.cache._size, 600)
+        self.assertEqual(self.cache._scan_size(), 600)
+        self.assertEqual(self.cache.get(first), "a" * 300)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        keys = self.keys(4)
+        for key, last_used in zip(keys, (3000, 1000, 2000)):
+            self.cache.put(key, "x" * 300)
+            os.utime(self.cache._path(key), (last_used, last_used))
+        self.cache.put(keys[3], "y" * 300)
+        self.assertEqual(self.cache._size, 900)
+        self.assertEqual(self.cache._scan_size(), 900)
+        self.assertIsNone(self.cache.get(keys[1]))
+        for key in (keys[0], keys[2], keys[3]):
+            self.assertIsNotNone(self.cache.get(key))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Tests for the layout-based field lookup over PageWords.
+
+The page is a two-column table whose values sit below their labels, the
+case a lookup over the newline-joined text cannot read.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import page_words  # noqa: E402
+from field_extractor import FIELD_KEYWORDS, extract_insurance_fields, find_field_by_layout  # noqa: E402
+
+requires_numpy = unittest.skipUnless(page_words.NUMPY_AVAILABLE, "NumPy is required")
+
+
+def _page(lines):
+    """PageWords from lines of (word, x0, x1), 12 points high and 20 apart."""
+    words, boxes, line_ids = [], [], []
+    for line_id, line in enumerate(lines):
+        top = 100 + 20 * line_id
+        for word, x0, x1 in line:
+            words.append(word)
+            boxes.append((x0, top, x1, top + 12))
+            line_ids.append(line_id)
+    return page_words.PageWords(words, boxes, [0] * len(words), line_ids, [95.0] * len(words))
+
+
+@requires_numpy
+class FindFieldByLayoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.table = _page([
+            [("Policy", 50, 85), ("No", 88, 102), ("Customer", 300, 350), ("Name", 353, 380)],
+            [("P/2024/81733", 50, 120), ("Ravi", 300, 322), ("Kumar", 325, 355)],
+            [("Engine", 50, 85), ("No:", 88, 104), ("K12M4481", 108, 160)],
+        ])
+
+    def test_value_right_of_label(self):
+        self.assertEqual(find_field_by_layout([self.table], FIELD_KEYWORDS["ENGINE_NUMBER"]), "K12M4481")
+
+    def test_value_below_label_stops_at_next_column(self):
+        self.assertEqual(find_field_by_layout([self.table], ["Policy No"]), "P/2024/81733")
+        self.assertEqual(find_field_by_layout([self.table], ["Customer Name"]), "Ravi Kumar")
+
+    def test_value_pattern_and_missing_label(self):
+        self.assertEqual(find_field_by_layout([self.table], ["Policy No"], r"\d{4}/\d+"), "2024/81733")
+        self.assertEqual(find_field_by_layout([self.table], ["Nominee"]), "")
+
+    def test_extract_insurance_fields_uses_page_words(self):
+        text = self.table.text()
+        without_layout = extract_insurance_fields(text)
+        self.assertNotEqual(without_layout["CUSTOMER_NAME"], "RAVI KUMAR")
+
+        fields = extract_insurance_fields(text, page_words=[self.table])
+        self.assertEqual(fields["POLICY_NO"], "P/2024/81733")
+        self.assertEqual(fields["CUSTOMER_NAME"], "RAVI KUMAR")
+        self.assertEqual(fields["ENGINE_NUMBER"], "K12M4481")
+
+
+if __name__ == "__main__":
+    unittest.main()
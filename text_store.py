@@ -0,0 +1,193 @@
+"""
+Store of the page texts of processed PDFs, for re-extraction without OCR.
+
+Every document is kept under the SHA-256 of its file: its path, page
+count, and per page the text, the source (direct, ocr, ...) and the DPI
+it was OCR'd at. When the keyword tables in field_extractor change, the
+fields of the whole archive can then be extracted again from the stored
+text (`ocr_pdf_extract.py reextract`) instead of OCRing every page again.
+
+The page texts are also indexed with SQLite FTS5 (when the SQLite build
+has it), so the corpus can be searched, e.g. for how many documents
+carry a label:
+
+    store.count_documents('"hypothecated to"')
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class StoredPage(NamedTuple):
+    """One page of a stored document (the fields PageText has, but words)."""
+    page_number: int
+    source: str
+    text: str
+    dpi: Optional[int] = None
+
+
+class SearchHit(NamedTuple):
+    document: str
+    path: str
+    page_number: int
+    snippet: str
+
+
+def document_hash(pdf_path: Path) -> str:
+    """SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as pdf_file:
+        for chunk in iter(lambda: pdf_file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TextStore:
+    """
+    Page texts of documents in a SQLite database. Safe to share between
+    threads; processes open the database file themselves (WAL mode lets
+    them read while another one writes).
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "document TEXT PRIMARY KEY, path TEXT NOT NULL, "
+                "page_count INTEGER NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "document TEXT NOT NULL, "
+                "page_number INTEGER NOT NULL, source TEXT NOT NULL, dpi INTEGER, text TEXT NOT NULL, "
+                "PRIMARY KEY (document, page_number))"
+            )
+            self.fts = self._create_fts_index()
+
+    def _create_fts_index(self) -> bool:
+        """
+        Create the FTS5 index over pages.text, kept in sync by triggers.
+        Returns False when this SQLite build has no FTS5.
+        """
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts "
+                "USING fts5(text, content='pages', content_rowid='rowid')"
+            )
+        except sqlite3.OperationalError:
+            return False
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS pages_fts_insert AFTER INSERT ON pages BEGIN "
+            "INSERT INTO pages_fts(rowid, text) VALUES (new.rowid, new.text); END"
+        )
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS pages_fts_delete AFTER DELETE ON pages BEGIN "
+            "INSERT INTO pages_fts(pages_fts, rowid, text) VALUES ('delete', old.rowid, old.text); END"
+        )
+        return True
+
+    def put(self, document: str, path: str, page_count: int, pages: Iterable) -> None:
+        """
+        Store (or replace) a document's pages: StoredPage or PageText
+        values. Pages that were not read (e.g. skipped by early exit) are
+        simply absent; page_count is the page count of the whole PDF.
+        """
+        rows = [(document, page.page_number, page.source, page.dpi, page.text) for page in pages]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages WHERE document = ?", (document,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (document, path, page_count, stored_at) VALUES (?, ?, ?, ?)",
+                (document, path, page_count, time.time()),
+            )
+            self._conn.executemany(
+                "INSERT INTO pages (document, page_number, source, dpi, text) VALUES (?, ?, ?, ?, ?)", rows
+            )
+
+    def __contains__(self, document: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM documents WHERE document = ?", (document,)).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def documents(self, match: str = "") -> List[Tuple[str, str, int]]:
+        """
+        (document, path, page_count) of every stored document, or with
+        match only of those with a page matching that FTS5 query, in
+        storing order.
+        """
+        if match:
+            self._require_fts()
+            query = ("SELECT document, path, page_count FROM documents WHERE document IN ("
+                     "SELECT pages.document FROM pages_fts JOIN pages ON pages.rowid = pages_fts.rowid "
+                     "WHERE pages_fts MATCH ?) ORDER BY rowid")
+            parameters: tuple = (match,)
+        else:
+            query, parameters = "SELECT document, path, page_count FROM documents ORDER BY rowid", ()
+        with self._lock:
+            return self._conn.execute(query, parameters).fetchall()
+
+    def pages(self, document: str) -> List[StoredPage]:
+        """The stored pages of a document, in page order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT page_number, source, text, dpi FROM pages WHERE document = ? ORDER BY page_number",
+                (document,),
+            ).fetchall()
+        return [StoredPage(*row) for row in rows]
+
+    def iter_pages(self, documents: List[str]) -> Iterator[Tuple[str, List[StoredPage]]]:
+        """(document, pages) for many documents, read with one query."""
+        placeholders = ", ".join("?" * len(documents))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT document, page_number, source, text, dpi FROM pages "
+                f"WHERE document IN ({placeholders}) ORDER BY document, page_number",
+                documents,
+            ).fetchall()
+        pages = {document: [] for document in documents}
+        for document, *page in rows:
+            pages[document].append(StoredPage(*page))
+        yield from pages.items()
+
+    def _require_fts(self) -> None:
+        if not self.fts:
+            raise RuntimeError("SQLite was built without FTS5, so the text store cannot be searched")
+
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """Pages matching an FTS5 query, best first, with a snippet of the match."""
+        self._require_fts()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT pages.document, documents.path, pages.page_number, "
+                "snippet(pages_fts, 0, '[', ']', '...', 12) "
+                "FROM pages_fts JOIN pages ON pages.rowid = pages_fts.rowid "
+                "JOIN documents ON documents.document = pages.document "
+                "WHERE pages_fts MATCH ? ORDER BY rank LIMIT ?",
+                (query, limit),
+            ).fetchall()
+        return [SearchHit(*row) for row in rows]
+
+    def count_documents(self, query: str) -> int:
+        """Number of documents with a page matching an FTS5 query."""
+        self._require_fts()
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(DISTINCT pages.document) FROM pages_fts "
+                "JOIN pages ON pages.rowid = pages_fts.rowid WHERE pages_fts MATCH ?",
+                (query,),
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()